@@ -0,0 +1,235 @@
+"""Benchmarks for the parts of the game whose speed decides how responsive a click feels:
+generating a board, floodfilling, checking the win condition, and painting the scene.
+
+Results are printed (or written to a file) as JSON, so that they can be compared between
+commits. To run every benchmark, run the command
+```
+python3 benchmark.py
+```
+Use --only to run the benchmarks whose name contains a given string, --repeat to change the
+number of timed runs, and --output to write the results to a file. Each benchmark runs once
+untimed before it is measured. The paint benchmarks use the Qt "offscreen" platform, and are
+skipped if PyQt6 is not installed.
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import sys
+import time
+import board as board_module
+from board import Board, SEED_BITS
+from modes import MODES
+from solver import generate_no_guess
+
+"""Global Variables:
+
+LARGE_SIZES: Custom board sizes to benchmark on top of MODES. Each tuple is of the form
+(number of tiles wide, number of tiles high, number of bombs)
+VIEWPORT: The size in pixels of the window the viewport benchmarks paint, of the form (width, height)
+ZOOMS: The scales the viewport benchmarks paint a 2000x2000 board at
+REPEAT: The default number of timed runs of each benchmark
+PERCENTILES: The percentiles of the run times to report
+SEED: The default seed of the boards, so that results are comparable between runs
+"""
+
+LARGE_SIZES = [(100, 100, 1600), (1000, 1000, 160000)]
+VIEWPORT = (1000, 800)
+ZOOMS = [0.25, 1, 2, 4]
+REPEAT = 50
+PERCENTILES = [50, 90, 99]
+SEED = 2001
+
+def percentile(sorted_times, p):
+    """Returns the P-th percentile of SORTED_TIMES, using the nearest rank method."""
+    rank = max(int(round(p / 100 * len(sorted_times))) - 1, 0)
+    return sorted_times[rank]
+
+def measure(name, setup, run, repeat):
+    """Times REPEAT calls of RUN, after one untimed call, so that one-time costs such as the
+    first import of NumPy are not counted. SETUP is called before each run, untimed, and its
+    return value is passed to RUN.
+
+    Args:
+        name -- A string; the name of the benchmark
+        setup -- A function of no arguments
+        run -- A function of one argument; the operation to time
+        repeat -- An integer; the number of timed runs
+
+    Returns:
+        A dict describing the run times, in milliseconds
+    """
+    run(setup())
+    times = []
+    for i in range(repeat):
+        state = setup()
+        start = time.perf_counter_ns()
+        run(state)
+        times.append((time.perf_counter_ns() - start) / 1e6)
+    times.sort()
+    mean = sum(times) / len(times)
+    result = {
+        "name": name,
+        "runs": repeat,
+        "ops_per_sec": 1000 / mean if mean > 0 else float("inf"),
+        "mean_ms": mean,
+        "min_ms": times[0],
+        "max_ms": times[-1],
+    }
+    for p in PERCENTILES:
+        result["p%d_ms" % p] = percentile(times, p)
+    return result
+
+def _configurations():
+    """Returns a list of (name, width, height, number of bombs) tuples for every board size
+    to benchmark."""
+    configurations = [(mode, width, height, num_bombs) for mode, (width, height, tile_size, num_bombs)
+                      in MODES.items()]
+    for width, height, num_bombs in LARGE_SIZES:
+        configurations.append(("%dx%d" % (width, height), width, height, num_bombs))
+    return configurations
+
+def _empty_board(width, height):
+    """Returns a generated board with no bombs, which is the worst case for the floodfill."""
+    board = Board(width, height, 0)
+    board._randomize_around_start(0, 0)
+    return board
+
+def _numbered_tile(board):
+    """Returns the (x, y) position of an unexposed safe tile with at least one surrounding bomb."""
+    for i in range(len(board.cells)):
+        x, y = board.coordinates(i)
+        if board.is_safe(x, y) and not board.is_exposed(x, y) and board.get_num_bombs(x, y) != 0:
+            return x, y
+
+def board_benchmarks(repeat, seed):
+    """Yields the benchmarks that do not need PyQt6, as tuples of the arguments to measure.
+    The boards are seeded from SEED, so each run of the benchmarks sees the same boards."""
+    rng = random.Random(seed)
+    for name, width, height, num_bombs in _configurations():
+        # Large boards are slow enough that fewer runs still give stable numbers
+        runs = repeat if width * height <= 10000 else max(repeat // 10, 3)
+
+        # The functions take the configuration as default arguments, so that they keep it after the
+        # loop moves on to the next one
+
+        # Placing the bombs and computing the counts (Board._randomize and Board._compute_counts)
+        yield ("generate/" + name,
+               lambda width = width, height = height, num_bombs = num_bombs:
+                   Board(width, height, num_bombs, rng.getrandbits(SEED_BITS)),
+               lambda board, width = width, height = height: board._randomize_around_start(width // 2, height // 2),
+               runs)
+
+        # Floodfilling the whole board from one corner
+        yield ("floodfill_empty/" + name, lambda width = width, height = height: _empty_board(width, height),
+               lambda board: board.reveal(0, 0), runs)
+
+        # Exposing a single numbered tile, which includes checking the win condition
+        def click_setup(width = width, height = height, num_bombs = num_bombs):
+            board = Board(width, height, num_bombs, rng.getrandbits(SEED_BITS))
+            board._randomize_around_start(width // 2, height // 2)
+            return (board, _numbered_tile(board))
+        yield ("click/" + name, click_setup, lambda state: state[0].reveal(*state[1]), runs)
+
+        # Checking the win condition after a click
+        yield ("check_win_condition/" + name, click_setup,
+               lambda state: state[0].check_win_condition(), runs)
+
+    for name in MODES:
+        width, height, tile_size, num_bombs = MODES[name]
+        yield ("generate_no_guess/" + name,
+               lambda width = width, height = height, num_bombs = num_bombs:
+                   Board(width, height, num_bombs, rng.getrandbits(SEED_BITS)),
+               lambda board, width = width, height = height: generate_no_guess(board, width // 2, height // 2),
+               repeat)
+
+def paint_benchmarks(repeat, seed):
+    """Yields benchmarks that paint every tile of a scene offscreen, for each render mode, and
+    that paint a window-sized part of a 2000x2000 board at each of ZOOMS, as tuples of the
+    arguments to measure. The scenes use the board with seed SEED, and are only built by the
+    setup of the first benchmark that uses them, so that benchmarks left out by --only cost
+    nothing. Yields nothing if PyQt6 is not installed."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtGui import QImage, QPainter
+    except ImportError:
+        return
+    import canvas
+    app = QApplication.instance() or QApplication(sys.argv)
+    for name, (width, height, tile_size, num_bombs) in list(MODES.items()) + [("100x100", (100, 100, 10, 1600))]:
+        for render_mode in (canvas.RENDER_TILES, canvas.RENDER_BOARD):
+            @functools.cache
+            def paint_setup(width = width, height = height, tile_size = tile_size, num_bombs = num_bombs,
+                            render_mode = render_mode):
+                scene = canvas.Canvas(width, height, tile_size, num_bombs, render_mode = render_mode, seed = seed)
+                scene.board.reveal(width // 2, height // 2)
+                image = QImage(width * tile_size, height * tile_size, QImage.Format.Format_ARGB32_Premultiplied)
+                return scene, image
+            def paint(state):
+                scene, image = state
+                painter = QPainter(image)
+                scene.render(painter)
+                painter.end()
+            yield ("paint/%s/%s" % (render_mode, name), paint_setup, paint, repeat)
+
+    # What the view repaints on a huge board; zoomed out boards are drawn without detail
+    @functools.cache
+    def huge_view():
+        from view import BoardView
+        scene = canvas.Canvas(2000, 2000, 4, 600000, seed = seed)
+        scene.make_move(canvas.REVEAL, 1000, 1000)
+        view = BoardView(scene)
+        view.resize(*VIEWPORT)
+        view.show_scene(scene, False)
+        return view
+    for zoom in ZOOMS:
+        def zoom_setup(zoom = zoom):
+            view = huge_view()
+            view.set_zoom(zoom)
+            view.centerOn(4000, 4000)
+            return view
+        yield ("paint_viewport/2000x2000/x%g" % zoom, zoom_setup, lambda view: view.viewport().grab(), repeat)
+
+def main(argv = None):
+    """Runs the benchmarks selected by the command line arguments ARGV, and reports the results."""
+    parser = argparse.ArgumentParser(description = "Benchmark board generation, floodfill, win checks and painting.")
+    parser.add_argument("--repeat", type = int, default = REPEAT, help = "number of timed runs of each benchmark")
+    parser.add_argument("--only", default = "", help = "only run benchmarks whose name contains this string")
+    parser.add_argument("--output", help = "write the JSON results to this file instead of printing them")
+    parser.add_argument("--seed", type = int, default = SEED, help = "seed of the benchmarked boards")
+    parser.add_argument("--no-paint", action = "store_true", help = "skip the benchmarks that need PyQt6")
+    args = parser.parse_args(argv)
+
+    results = []
+    benchmarks = [board_benchmarks(args.repeat, args.seed)]
+    if not args.no_paint:
+        benchmarks.append(paint_benchmarks(args.repeat, args.seed))
+    for group in benchmarks:
+        for name, setup, run, repeat in group:
+            if args.only not in name:
+                continue
+            result = measure(name, setup, run, repeat)
+            results.append(result)
+            # Progress goes to stderr, so that stdout only contains the JSON report
+            print(name, "%.3f ms" % result["mean_ms"], file = sys.stderr)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": board_module.USE_NUMPY,
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent = 2)
+    else:
+        print(json.dumps(report, indent = 2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,625 @@
+"""This module contains the Board class, which stores the full state of a game of
+minesweeper (the mine layout, the neighbor counts, and which tiles are exposed or
+flagged) in compact arrays. The Board does not depend on PyQt6, so games can be
+simulated, tested and batch-run without creating a QGraphicsScene. The Canvas
+object in "canvas.py" is a view over a Board.
+
+Tiles are addressed by (x, y) coordinates measured from the top left of the board.
+Internally each tile is stored at the index y * width + x of each array.
+"""
+
+import importlib.util
+import math
+import random
+import re
+import struct
+
+# NumPy is optional. When it is installed, mine placement and the neighbor counts of
+# large boards are computed with vectorized operations. Importing it takes longer than
+# starting the rest of the game, so it is only imported once such a board is generated.
+np = None
+
+"""Global Variables:
+
+DX: The x-offsets of the eight neighbors of a tile
+DY: The y-offsets of the eight neighbors of a tile
+USE_NUMPY: Whether or not to use the NumPy implementations of board generation on boards with
+at least NUMPY_MIN_TILES tiles. True whenever NumPy is installed. A seed places the same bombs
+either way.
+NUMPY_MIN_TILES: The number of tiles from which NumPy is used. Smaller boards are generated faster
+without it.
+SEED_BITS: The number of bits in a randomly chosen seed
+NO_SEED: The seed written to files for a board whose bombs were not placed by its seed, such as a
+board taken from a BoardPool. A randomly chosen seed never has this value.
+MINE: The bit of a cell that is set if the tile is a bomb
+EXPOSED: The bit of a cell that is set if the tile has been exposed
+FLAGGED: The bit of a cell that is set if the tile has been flagged
+CROSSED: The bit of a cell that is set if the tile has been crossed out
+COUNT_SHIFT: The number of surrounding bombs is stored in the bits of a cell from COUNT_SHIFT up
+COUNT_ONE: The amount to add to a cell to increase the number of surrounding bombs by one
+NONZERO: Matches a cell that is a bomb or has at least one surrounding bomb
+ZERO_RUN: Matches a run of cells that are safe and have no surrounding bombs
+"""
+
+DX = [-1, 1, -1, 0, 1, -1, 0, 1]
+DY = [0, 0, 1, 1, 1, -1, -1, -1]
+USE_NUMPY = importlib.util.find_spec("numpy") is not None
+NUMPY_MIN_TILES = 2500
+SEED_BITS = 63
+NO_SEED = (1 << 64) - 1
+MINE = 0x01
+EXPOSED = 0x02
+FLAGGED = 0x04
+CROSSED = 0x08
+COUNT_SHIFT = 4
+COUNT_ONE = 1 << COUNT_SHIFT
+
+# The cells that can be floodfilled through are the ones whose bomb and count bits are all zero
+_FLOOD_MASK = MINE | (0xFF ^ (COUNT_ONE - 1))
+_FLOODABLE = b"".join(re.escape(bytes([cell])) for cell in range(256) if cell & _FLOOD_MASK == 0)
+NONZERO = re.compile(b"[^" + _FLOODABLE + b"]")
+ZERO_RUN = re.compile(b"[" + _FLOODABLE + b"]+")
+# Finds the tiles marked with a 1 by the translation tables below
+_MARKED = re.compile(b"\x01")
+
+# Translation tables for bytes.translate, which apply an operation to every cell at once
+_MINE_BIT = bytes(cell & MINE for cell in range(256))
+_FLAG_BIT = bytes(1 if cell & FLAGGED else 0 for cell in range(256))
+_UNEXPOSED_BIT = bytes(0 if cell & EXPOSED else 1 for cell in range(256))
+_EXPOSED_BIT = bytes(1 if cell & EXPOSED else 0 for cell in range(256))
+_EXPOSE = bytes((cell | EXPOSED) & ~FLAGGED for cell in range(256))
+_KEEP_FLAGS = bytes(cell & FLAGGED for cell in range(256))
+_CLEAR_COUNT = bytes(cell & (COUNT_ONE - 1) for cell in range(256))
+_ZERO_BIT = bytes(1 if cell & _FLOOD_MASK == 0 else 0 for cell in range(256))
+_NUMBERED_BIT = bytes(1 if not cell & MINE and cell >> COUNT_SHIFT else 0 for cell in range(256))
+_UNMARKED_BOMB_BIT = bytes(1 if cell & (MINE | FLAGGED | EXPOSED) == MINE else 0 for cell in range(256))
+_WRONG_FLAG_BIT = bytes(1 if cell & (MINE | FLAGGED) == FLAGGED else 0 for cell in range(256))
+
+# _UNPACKED[b] holds the eight bits of the byte b, least significant first, one per byte
+_UNPACKED = [bytes((b >> i) & 1 for i in range(8)) for b in range(256)]
+
+def _import_numpy():
+    """Imports NumPy as np, the first time it is needed."""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+def new_seed():
+    """Returns a random seed for a Board. The seed is drawn from the operating system, so that
+    boards created in different processes get independent seeds."""
+    return random.SystemRandom().getrandbits(SEED_BITS)
+
+def pack_bits(values):
+    """Packs VALUES, a bytes-like object in which every entry is 0 or 1, into a bitset with
+    eight entries per byte. The first entry is stored in the least significant bit.
+
+    Args:
+        values -- A bytes-like object of 0s and 1s
+
+    Returns:
+        A bytes object of length ceil(len(VALUES) / 8)
+    """
+    padded = bytes(values) + bytes(-len(values) % 8)
+    # Multiplying a 64-bit word of eight 0/1 bytes by this constant gathers the lowest bit
+    # of each byte into the top byte of the product
+    return bytes(((word * 0x0102040810204080) >> 56) & 0xFF
+                 for (word,) in struct.iter_unpack("<Q", padded))
+
+def unpack_bits(packed, size):
+    """Unpacks the first SIZE entries of PACKED, a bitset produced by pack_bits.
+
+    Args:
+        packed -- A bytes-like object; the bitset
+        size -- An integer; the number of entries to unpack
+
+    Returns:
+        A bytearray of length SIZE of 0s and 1s
+    """
+    unpacked = bytearray(b"".join(map(_UNPACKED.__getitem__, packed)))
+    del unpacked[size:]
+    return unpacked
+
+class Board:
+    """A Board object that represents the state of a game of minesweeper.
+
+    width -- the number of tiles wide the board is
+    height -- the number of tiles high the board is
+    num_bombs -- the number of bombs on the board
+    seed -- the integer seed of self.rng, or None if the bombs were placed some other way, so that
+    the seed would not place them again
+    rng -- a random.Random object; the source of all of the randomness used to place the bombs
+    cells -- a bytearray with one byte per tile. The MINE, EXPOSED, FLAGGED and CROSSED bits
+    of each byte record the state of the tile, and the bits from COUNT_SHIFT up record the
+    number of bombs surrounding it.
+    num_flagged -- the number of flagged tiles on the board
+    safe_remaining -- the number of safe tiles that have not been exposed yet. The game
+    is won once this reaches zero.
+    first_move_made -- a boolean that represents whether or not the player has exposed
+    a tile yet
+    game_over -- a boolean that tracks if the game is over
+    game_won -- a boolean that tracks if the game is won
+    generated -- a boolean that tracks if the bombs have been placed yet. Bombs are only
+    placed once the player exposes their first tile, so that the first move is always safe.
+    """
+    def __init__(self, width, height, num_bombs, seed = None):
+        """Create a Board that is WIDTH tiles wide and HEIGHT tiles high, with NUM_BOMBS
+        bombs. The bombs are randomly placed when the first tile is exposed. Two boards with
+        the same SEED place their bombs in the same way for the same first move.
+
+        width -- An integer; number of tiles wide
+        height -- An integer; number of tiles high
+        num_bombs -- An integer; the number of bombs that should be randomly placed in the grid
+        seed -- An integer; the seed to place the bombs with, or None to choose one at random
+        """
+        self.width = width
+        self.height = height
+        self.num_bombs = num_bombs
+        if seed is None:
+            seed = new_seed()
+        self.seed = seed
+        self.rng = random.Random(seed)
+        size = width * height
+        self.cells = bytearray(size)
+        self.num_flagged = 0
+        self.safe_remaining = size - num_bombs
+        self.first_move_made = False
+        self.game_over = False
+        self.game_won = False
+        self.generated = False
+
+    def index(self, x, y):
+        """Returns the array index of the tile located at position (X, Y)"""
+        return y * self.width + x
+
+    def coordinates(self, index):
+        """Returns the (x, y) position of the tile stored at INDEX"""
+        return index % self.width, index // self.width
+
+    def neighbors(self, x, y):
+        """Returns a list of the (x, y) positions of the tiles surrounding position (X, Y)
+        that lie on the board."""
+        result = []
+        for i in range(len(DY)):
+            x_new = x + DX[i]
+            y_new = y + DY[i]
+            if 0 <= x_new < self.width and 0 <= y_new < self.height:
+                result.append((x_new, y_new))
+        return result
+
+    def is_safe(self, x, y):
+        """Returns a boolean that represents whether or not the tile at (X, Y) is safe"""
+        return not self.cells[y * self.width + x] & MINE
+
+    def is_exposed(self, x, y):
+        """Returns a boolean that represents whether or not the tile at (X, Y) is exposed"""
+        return bool(self.cells[y * self.width + x] & EXPOSED)
+
+    def is_flagged(self, x, y):
+        """Returns a boolean that represents whether or not the tile at (X, Y) is flagged"""
+        return bool(self.cells[y * self.width + x] & FLAGGED)
+
+    def is_crossed(self, x, y):
+        """Returns a boolean that represents whether or not the tile at (X, Y) is crossed out"""
+        return bool(self.cells[y * self.width + x] & CROSSED)
+
+    def get_num_bombs(self, x, y):
+        """Returns the number of bombs surrounding the tile at (X, Y)"""
+        return self.cells[y * self.width + x] >> COUNT_SHIFT
+
+    def mine_layout(self):
+        """Returns a bytes object with one entry per tile; 1 if the tile is a bomb, 0 otherwise"""
+        return self.cells.translate(_MINE_BIT)
+
+    def set_mine_layout(self, mines):
+        """Places the bombs on the board according to MINES, and computes the number of bombs
+        surrounding each tile. Any flags the player has already placed are kept.
+
+        Args:
+            mines -- A bytes-like object with one entry per tile; 1 if the tile is a bomb
+        """
+        # The flags and the bombs never share a bit, so they are combined all at once by
+        # treating each as one large integer
+        flags = int.from_bytes(self.cells.translate(_KEEP_FLAGS), "little")
+        self.cells[:] = (flags | int.from_bytes(mines, "little")).to_bytes(len(self.cells), "little")
+        self._compute_counts()
+        self.generated = True
+
+    def exposed_layout(self):
+        """Returns a bytes object with one entry per tile; 1 if the tile is exposed, 0 otherwise"""
+        return self.cells.translate(_EXPOSED_BIT)
+
+    def flag_layout(self):
+        """Returns a bytes object with one entry per tile; 1 if the tile is flagged, 0 otherwise"""
+        return self.cells.translate(_FLAG_BIT)
+
+    def restore_state(self, exposed, flagged):
+        """Exposes and flags the tiles of a board whose bombs have been placed, to continue a game
+        that was saved with self.exposed_layout and self.flag_layout. Nothing else about the tiles
+        is changed, so this must be called on a board that has nothing exposed or flagged yet.
+
+        Args:
+            exposed -- A bytes-like object with one entry per tile; 1 if the tile is exposed
+            flagged -- A bytes-like object with one entry per tile; 1 if the tile is flagged
+        """
+        # Multiplying a 0/1 byte by a single bit never carries into the next byte, so both bits
+        # are set on every tile at once, as in self.set_mine_layout
+        state = int.from_bytes(exposed, "little") * EXPOSED | int.from_bytes(flagged, "little") * FLAGGED
+        self.cells[:] = (int.from_bytes(self.cells, "little") | state).to_bytes(len(self.cells), "little")
+        self.num_flagged = flagged.count(1)
+        num_exposed = exposed.count(1)
+        self.safe_remaining = len(self.cells) - self.num_bombs - num_exposed
+        self.first_move_made = num_exposed != 0
+        self.check_win_condition()
+
+    def _start_region(self, x, y):
+        """Returns a sorted list of the indices of the tiles that must not contain a bomb when
+        the first move is made at (X, Y). This is the tile and its neighbors whenever there
+        is enough room for all of the bombs outside of them, and just the tile otherwise."""
+        region = [(x, y)] + self.neighbors(x, y)
+        if len(self.cells) - len(region) < self.num_bombs:
+            region = [(x, y)]
+        if len(self.cells) - len(region) < self.num_bombs:
+            region = []
+        return sorted(y_new * self.width + x_new for x_new, y_new in region)
+
+    def _randomize_around_start(self, x, y):
+        """Randomly places exactly self.num_bombs bombs on the board so that the first move,
+        made at (X, Y), does not expose a bomb and, where possible, opens up a region of tiles.
+        Then computes the number of bombs surrounding each safe tile. Any previous layout is
+        replaced, so that a board can be regenerated.
+
+        Args:
+            x -- the x-coordinate of the first move measured from the left
+            y -- the y-cooridnate of the first move measured from the top
+        """
+        self.set_mine_layout(self._randomize(self._start_region(x, y)))
+
+    def _use_numpy(self):
+        """Returns a boolean that represents whether or not the board is generated with NumPy"""
+        return USE_NUMPY and len(self.cells) >= NUMPY_MIN_TILES
+
+    def _randomize(self, excluded):
+        """Randomly chooses exactly self.num_bombs tiles for the bombs, outside of the tiles whose
+        indices are in the sorted list EXCLUDED. Every other tile is given a random 32-bit key
+        from self.rng, and the bombs go on the tiles with the smallest keys, ties going to the
+        earlier tile. The NumPy implementation makes the same choice, so a seed places the same
+        bombs whether or not NumPy is used.
+
+        Returns:
+            A bytes-like object with one entry per tile; 1 if the tile is a bomb
+        """
+        size = len(self.cells) - len(excluded)
+        keys = self.rng.randbytes(4 * size)
+        if self._use_numpy():
+            return self._randomize_numpy(excluded, keys)
+        keys = struct.unpack("<%dI" % size, keys)
+        num_bombs = self.num_bombs
+        chosen = []
+        if num_bombs:
+            # Every key below the largest chosen one is taken, and the earliest tiles with that key
+            # fill the rest. The keys are uniform, so only the ones a little above the expected
+            # threshold need to be sorted to find it, unless there are unusually few of them.
+            margin = 16 + 4 * math.isqrt(num_bombs)
+            while True:
+                limit = (num_bombs + margin) * (1 << 32) // size
+                candidates = [key for key in keys if key < limit]
+                if len(candidates) >= num_bombs:
+                    break
+                margin *= 4
+            threshold = sorted(candidates)[num_bombs - 1]
+            chosen = [i for i, key in enumerate(keys) if key < threshold]
+            chosen += [i for i, key in enumerate(keys) if key == threshold][:num_bombs - len(chosen)]
+        mines = bytearray(len(self.cells))
+        for index in chosen:
+            # The keys belong to the tiles that are not excluded, so shift past the excluded tiles
+            for skipped in excluded:
+                if skipped <= index:
+                    index += 1
+            mines[index] = 1
+        return mines
+
+    def _randomize_numpy(self, excluded, keys):
+        """Places the bombs chosen by KEYS, the random keys drawn by self._randomize for the tiles
+        outside of EXCLUDED, with vectorized operations."""
+        _import_numpy()
+        keys = np.frombuffer(keys, dtype="<u4")
+        num_bombs = self.num_bombs
+        if num_bombs == 0:
+            chosen = np.zeros(0, dtype=np.intp)
+        else:
+            # The same choice as in self._randomize
+            threshold = np.partition(keys, num_bombs - 1)[num_bombs - 1]
+            below = np.flatnonzero(keys < threshold)
+            ties = np.flatnonzero(keys == threshold)[:num_bombs - len(below)]
+            chosen = np.concatenate((below, ties))
+        for skipped in excluded:
+            chosen[chosen >= skipped] += 1
+        mines = np.zeros(len(self.cells), dtype=np.uint8)
+        mines[chosen] = 1
+        return mines.tobytes()
+
+    def _compute_counts(self):
+        """Sets the number of bombs surrounding each tile on the board."""
+        if self._use_numpy():
+            self._compute_counts_numpy()
+            return
+        cells = self.cells
+        cells[:] = cells.translate(_CLEAR_COUNT)
+        width = self.width
+        mines = cells.translate(_MINE_BIT)
+        # Rather than counting the neighbors of every tile, add 1 to each neighbor of
+        # every bomb, since there are far fewer bombs than tiles.
+        index = mines.find(1)
+        while index != -1:
+            x, y = index % width, index // width
+            for x_new, y_new in self.neighbors(x, y):
+                cells[y_new * width + x_new] += COUNT_ONE
+            index = mines.find(1, index + 1)
+
+    def _compute_counts_numpy(self):
+        """Sets the number of bombs surrounding each tile on the board by summing the eight
+        shifted copies of the zero padded mine layout."""
+        _import_numpy()
+        cells = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+        mines = cells & MINE
+        padded = np.pad(mines, 1)
+        counts = np.zeros_like(mines)
+        for i in range(len(DY)):
+            counts += padded[1 + DY[i]:1 + DY[i] + self.height, 1 + DX[i]:1 + DX[i] + self.width]
+        self.cells[:] = ((cells & (COUNT_ONE - 1)) | (counts << COUNT_SHIFT)).tobytes()
+
+    def expose(self, x, y):
+        """Exposes the tile at (X, Y), removing its flag if it has one.
+
+        Returns:
+            A boolean; whether or not the tile was newly exposed
+        """
+        index = y * self.width + x
+        cell = self.cells[index]
+        if cell & EXPOSED:
+            return False
+        if not cell & MINE:
+            self.safe_remaining -= 1
+        # If the tile is flagged, then it will be unflagged, and the number of
+        # flagged cells will be reduced by 1.
+        if cell & FLAGGED:
+            self.num_flagged -= 1
+        self.cells[index] = (cell | EXPOSED) & ~FLAGGED
+        return True
+
+    def crossout(self, x, y):
+        """Crosses out the (incorrectly flagged) tile at (X, Y) and removes its flag."""
+        index = y * self.width + x
+        cell = self.cells[index]
+        if cell & FLAGGED:
+            self.num_flagged -= 1
+        self.cells[index] = (cell | CROSSED) & ~FLAGGED
+
+    def toggle_flag(self, x, y):
+        """Flags the tile at (X, Y) if it is unflagged, and unflags it otherwise. Exposed
+        tiles cannot be flagged.
+
+        Returns:
+            A boolean; whether or not the state of the tile changed
+        """
+        index = y * self.width + x
+        if self.game_over or self.cells[index] & EXPOSED:
+            return False
+        self.cells[index] ^= FLAGGED
+        # Subtract 1 if it is unflagged, and add 1 if it is flagged
+        self.num_flagged += 1 if self.cells[index] & FLAGGED else -1
+        return True
+
+    def reveal(self, x, y):
+        """Handles the player exposing the tile at (X, Y). Flagged tiles cannot be exposed.
+        Exposing a bomb ends the game, and exposing a tile with no surrounding bombs
+        floodfills the surrounding region.
+
+        Returns:
+            A list of the indices of every tile that was exposed
+        """
+        index = y * self.width + x
+        if self.game_over or self.cells[index] & (FLAGGED | EXPOSED):
+            return []
+        # The bombs are placed the moment the user exposes their first tile
+        if not self.generated:
+            self._randomize_around_start(x, y)
+        self.first_move_made = True
+        cell = self.cells[index]
+        if cell & MINE:
+            self.expose(x, y)
+            self.game_over = True
+            return [index]
+        if cell >> COUNT_SHIFT == 0:
+            revealed = self._floodfill(x, y)
+        else:
+            self.expose(x, y)
+            revealed = [index]
+        self.check_win_condition()
+        return revealed
+
+    def chord(self, x, y):
+        """Handles the player chording the exposed tile at (X, Y): if as many of its neighbors are
+        flagged as there are bombs surrounding it, every unflagged neighbor is exposed at once.
+        Any floodfills this starts are merged into one move, and the win condition is only
+        checked once at the end. Exposing a bomb that was not flagged ends the game.
+
+        Returns:
+            A list of the indices of every tile that was exposed
+        """
+        index = y * self.width + x
+        cell = self.cells[index]
+        if self.game_over or not cell & EXPOSED or cell & MINE:
+            return []
+        neighbors = [y_new * self.width + x_new for x_new, y_new in self.neighbors(x, y)]
+        if sum(1 for n in neighbors if self.cells[n] & FLAGGED) != cell >> COUNT_SHIFT:
+            return []
+        revealed = []
+        for n in neighbors:
+            cell = self.cells[n]
+            # Tiles can already have been exposed by the floodfill of an earlier neighbor
+            if cell & (FLAGGED | EXPOSED):
+                continue
+            if cell & MINE:
+                self.expose(*self.coordinates(n))
+                self.game_over = True
+                revealed.append(n)
+            elif cell >> COUNT_SHIFT == 0:
+                revealed.extend(self._floodfill(*self.coordinates(n)))
+            else:
+                self.expose(*self.coordinates(n))
+                revealed.append(n)
+        if not self.game_over:
+            self.check_win_condition()
+        return revealed
+
+    def _floodfill(self, x, y):
+        """Exposes every possible safe tile when a tile that is surrounded by zero bombs is selected.
+        This is a scanline floodfill: each horizontal run of tiles with no surrounding bombs is
+        found and exposed at once, along with the tiles bordering it in the rows above and below.
+        Runs are marked in a visited bitmap when they are filled, so no run is filled twice.
+
+        Note that every tile touching a tile with no surrounding bombs is safe, so none of the
+        tiles visited here need to be checked for bombs.
+
+        Args:
+            x -- the x-coordinate of the tile measured from the left
+            y -- the y-cooridnate of the tile measured from the top
+
+        Returns:
+            A list of the indices of every tile that was exposed
+        """
+        assert self.is_safe(x, y) and self.get_num_bombs(x, y) == 0, "Tile cannot be floodfilled."
+        width, size = self.width, len(self.cells)
+        cells = self.cells
+        visited = bytearray(size)
+        fringe = [y * width + x]
+        revealed = []
+        while fringe:
+            seed = fringe.pop()
+            if visited[seed]:
+                continue
+            row_start = seed - seed % width
+            row_end = row_start + width
+            # Extend the run of tiles with no surrounding bombs as far left and right as possible
+            left = seed
+            while left > row_start and cells[left - 1] & _FLOOD_MASK == 0:
+                left -= 1
+            match = NONZERO.search(cells, seed, row_end)
+            right = match.start() if match else row_end
+            visited[left:right] = b"\x01" * (right - left)
+            # The run, and the tiles on either side of it, are exposed
+            span_start = max(left - 1, row_start)
+            span_end = min(right + 1, row_end)
+            self._expose_span(span_start, span_end, revealed)
+            # Every tile above and below the run is also exposed, and any runs of tiles
+            # with no surrounding bombs among them are added to the fringe
+            for offset in (-width, width):
+                start, end = span_start + offset, span_end + offset
+                if start < 0 or end > size:
+                    continue
+                self._expose_span(start, end, revealed)
+                for match in ZERO_RUN.finditer(cells, start, end):
+                    if not visited[match.start()]:
+                        fringe.append(match.start())
+        return revealed
+
+    def _expose_span(self, start, end, revealed):
+        """Exposes every tile with an index between START (inclusive) and END (exclusive), all of
+        which must be safe, and appends the indices of the newly exposed tiles to REVEALED."""
+        span = self.cells[start:end]
+        num_unexposed = span.translate(_UNEXPOSED_BIT).count(1)
+        if num_unexposed == 0:
+            return
+        revealed.extend([start + i for i, cell in enumerate(span) if not cell & EXPOSED])
+        # Any flags in the span are removed
+        self.num_flagged -= span.translate(_FLAG_BIT).count(1)
+        self.cells[start:end] = span.translate(_EXPOSE)
+        self.safe_remaining -= num_unexposed
+
+    def unmarked_bombs(self):
+        """Returns a list of the indices of all of the unexposed bombs that were not flagged
+        (i.e. the bombs unknown to the user)."""
+        return [match.start() for match in _MARKED.finditer(self.cells.translate(_UNMARKED_BOMB_BIT))]
+
+    def incorrectly_marked_safe(self):
+        """Returns a list of the indices of all of the safe tiles that were flagged."""
+        return [match.start() for match in _MARKED.finditer(self.cells.translate(_WRONG_FLAG_BIT))]
+
+    def three_bv(self):
+        """Returns the 3BV of the board (its Bechtel's Board Benchmark Value): the smallest number
+        of left clicks that exposes every safe tile. Each region of tiles with no surrounding
+        bombs takes one click, and every safe tile that no such region reaches takes one more.
+        The bombs must have been placed already.
+
+        Returns:
+            An integer; the 3BV of the board
+        """
+        # The board is scanned one row at a time. The runs of zeros in each row are joined to the
+        # runs they touch in the row above, and every run that does not join an earlier region
+        # starts a new one.
+        width, cells = self.width, self.cells
+        full_row = (1 << (8 * width)) - 1
+        parent = []
+        def find(run):
+            while parent[run] != run:
+                parent[run] = parent[parent[run]]
+                run = parent[run]
+            return run
+        regions = 0
+        previous_runs = []
+        # Each row is also turned into an integer with one byte per tile, so that the numbers
+        # that touch a zero can be found with shifts rather than by visiting their neighbors
+        numbered = []
+        near_rows = []
+        for row in range(self.height):
+            line = cells[row * width:(row + 1) * width]
+            runs = []
+            for match in ZERO_RUN.finditer(line):
+                start, end = match.span()
+                parent.append(len(parent))
+                runs.append((start, end, len(parent) - 1))
+                regions += 1
+            # Runs in adjacent rows touch if they overlap once widened by one tile
+            i = j = 0
+            while i < len(runs) and j < len(previous_runs):
+                start, end, run = runs[i]
+                previous_start, previous_end, previous_run = previous_runs[j]
+                if start <= previous_end and previous_start <= end:
+                    a, b = find(run), find(previous_run)
+                    if a != b:
+                        parent[a] = b
+                        regions -= 1
+                if end < previous_end:
+                    i += 1
+                else:
+                    j += 1
+            previous_runs = runs
+            zeros = int.from_bytes(line.translate(_ZERO_BIT), "big")
+            near_rows.append((zeros | zeros << 8 | zeros >> 8) & full_row)
+            numbered.append(int.from_bytes(line.translate(_NUMBERED_BIT), "big"))
+        # Every number that no region reaches takes a click of its own
+        isolated = 0
+        for row in range(self.height):
+            near = near_rows[row]
+            if row > 0:
+                near |= near_rows[row - 1]
+            if row < self.height - 1:
+                near |= near_rows[row + 1]
+            isolated += (numbered[row] & ~near).bit_count()
+        return regions + isolated
+
+    def check_win_condition(self):
+        """Checks if the game has been won and updates the self.game_over and self.game_won
+        attributes accordingly.
+
+        Returns:
+            A boolean; whether or not the game has been won
+        """
+        # If there is an unexposed safe tile, the game is not over
+        if self.safe_remaining != 0:
+            return False
+        self.game_over = True
+        self.game_won = True
+        return True
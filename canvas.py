@@ -1,9 +1,16 @@
 import random
-from collections import deque
-from PyQt6.QtWidgets import *
+import time
+from contextlib import nullcontext
+from PyQt6.QtWidgets import QGraphicsScene
 from PyQt6.QtGui import QColor
-from PyQt6.QtCore import *
-from tiles import *
+from PyQt6.QtCore import Qt, QObject, QRectF, QTimer
+from tiles import Tile, BoardItem, BOMB_COLORS
+from board import Board
+from solver import generate_no_guess
+from replay import REVEAL, FLAG, UNFLAG, CHORD, apply_move
+from hints import HintEngine
+from dialog import busy
+from modes import MAX_NO_GUESS_TILES, MAX_HINT_TILES, LARGE_BOARD_TILES
 
 """Global Variables:
 
@@ -12,6 +19,15 @@ UNEXPOSED_LIGHT: Light color to use before tile has been revealed
 UNEXPOSED_HIGHLIGHT: The hover color for the tiles.
 EXPOSED_DARK: Dark color to use when a tile has been revealed
 EXPOSED_LIGHT: Light color to use when a tile has been revealed
+RENDER_TILES: Render mode in which every position on the board is its own Tile item
+RENDER_BOARD: Render mode in which the whole board is painted by a single BoardItem
+MAX_TILE_ITEMS: The largest number of tiles for which RENDER_TILES is used by default
+BOMB_DELAYS: The possible delays in milliseconds between exploding two bombs at the end of a lost game
+SAFE_DELAYS: The possible delays in milliseconds between crossing out two incorrectly flagged tiles
+END_GAME_DURATION: The longest time in milliseconds the end of game sequence takes. Sequences that
+would take longer at the pace of BOMB_DELAYS and SAFE_DELAYS are sped up to fit.
+FRAME_INTERVAL: The time in milliseconds between two frames of the end of game sequence
+FRAME_BUDGET: The most time in milliseconds a frame of the end of game sequence spends changing tiles
 """
 
 UNEXPOSED_DARK = QColor("#D78521")
@@ -19,53 +35,104 @@ UNEXPOSED_LIGHT = QColor("#F2D398")
 UNEXPOSED_HIGHLIGHT = QColor("#E6B062")
 EXPOSED_DARK = QColor("#D5DBF0")
 EXPOSED_LIGHT = QColor("#E8EBF7")
+RENDER_TILES = "tiles"
+RENDER_BOARD = "board"
+MAX_TILE_ITEMS = 2500
+BOMB_DELAYS = [200, 300, 400]
+SAFE_DELAYS = [50, 100, 150]
+END_GAME_DURATION = 5000
+FRAME_INTERVAL = 16
+FRAME_BUDGET = 8
 
 class Canvas(QGraphicsScene):
-    """A Canvas object that represents the board of minesweeper. 
+    """A Canvas object that displays a board of minesweeper. The state of the game is
+    stored in a Board object, and the Canvas only translates mouse events into moves on
+    the board and repaints the tiles that changed.
     
     width -- the number of tiles wide the board should be
     height -- the number of tiles high the board should be
     num_bombs -- the number of bombs on the board
     tile_size -- the size of each tile on the board
-    grid -- a 2D array storing Tile references for each position on the grid
-    game_over -- a boolean that tracks if the game is over
-    game_won -- a boolean tha tracks if the game is won
-    safes -- a deque consisting of all incorrectly flagged tiles. Note that
-    this attribute is only ever computed when the player loses the game
-    bombs -- a deque consisting of all bomb tiles that were unmarked. Note that
-    this attribute is only ever computer when the player loses the game. 
+    no_guess -- a boolean that tracks if the board should be solvable without guessing
+    pool -- a BoardPool object to take boards that are solvable without guessing from, or None
+    render_mode -- RENDER_TILES or RENDER_BOARD; how the board is drawn
+    recorder -- a MoveLog object that every move is recorded to, or None. A game is only written
+    to it once its first move is made.
+    board -- a Board object storing the state of the game
+    seed -- the seed of self.board
+    rng -- a random.Random object seeded with self.seed, used for the colors of the bombs, the
+    timing of the end of game sequence and the seed of the hints. It is separate from
+    self.board.rng, so that neither the animation nor the hints change how the bombs are placed.
+    bomb_colors -- a dict mapping the index of each bomb exploded by the end of game sequence to
+    the index in BOMB_COLORS of the color it is drawn with
+    palette -- a tuple of two tuples of three QColors; the normal, hover and exposed colors of
+    the tiles whose column plus row is even and odd, respectively
+    hover_index -- the index of the Tile the user is hovering over, or None. Only used when
+    self.render_mode is RENDER_TILES
+    hints -- a HintEngine object that finds the safest tile to expose next. It is only created
+    when the first hint is asked for, since it is costly to set up on large boards.
+    hint_index -- the index of the tile suggested by the last hint, or None
+    grid -- a 2D array storing Tile references for each position on the grid. Only used when
+    self.render_mode is RENDER_TILES
+    board_item -- the BoardItem that draws the board. Only used when self.render_mode is
+    RENDER_BOARD
+    animator -- the EndGameAnimator playing the end of game sequence. Note that this attribute is
+    only ever set when the player loses the game, and is None until then.
     """
-    def __init__(self, width, height, tile_size, num_bombs):
+    def __init__(self, width, height, tile_size, num_bombs, no_guess = False, pool = None,
+                 render_mode = None, recorder = None, seed = None, board = None):
         """Create a Canvas object that is WIDTH tiles wide, HEIGHT tiles high, where each tile has 
-        size TILE_SIZE, and the grid has NUM_BOMB randomly placed bombs.
+        size TILE_SIZE, and the grid has NUM_BOMB randomly placed bombs. If NO_GUESS is True, the
+        bombs are placed so that the board can be solved from the first move without guessing,
+        using a ready-made board from POOL when one fits the first move. Boards with more than
+        MAX_NO_GUESS_TILES tiles take too long to generate that way, and are generated normally.
+        RENDER_MODE selects how the board is drawn; by default, boards with more than
+        MAX_TILE_ITEMS tiles are drawn as a single item. If RECORDER is given, the game is
+        recorded to it. Two canvases with the same SEED place their bombs, and play their end of
+        game sequence, in the same way. If BOARD is given, the game played on it is continued,
+        and SEED is ignored.
         
         width -- An integer; number of tiles wide
         height -- An integer; number of tiles high
         tile_size -- An integer; the size of a tile
         num_bombs -- An integer; the number of bombs that should be randomly placed in the grid
+        no_guess -- A boolean; whether or not the board should be solvable without guessing
+        pool -- A BoardPool; ready-made boards that are solvable without guessing
+        render_mode -- RENDER_TILES, RENDER_BOARD or None to choose based on the size of the board
+        recorder -- A MoveLog; the log to record the game to
+        seed -- An integer; the seed of the game, or None to choose one at random
+        board -- A Board; a game in progress to continue, such as one loaded from a snapshot
         """
-        # Reset the class attributes of Tile each time a new Canvas object is initialized.
-        # Each time a new Canvas a object is initialized, a new game has been started so these
-        # variables must be reset for the current game.
-        Tile.num_flagged_cells = 0
-        Tile.first_move_made = False
-
         self.width = width 
         self.height = height 
         self.num_bombs = num_bombs
         self.tile_size = tile_size
-        # We will update self.grid to contain the Tile references when we call the self._randomize() method
-        self.grid = [ [None] * width for i in range(height) ]
-        self.game_over = False
-        self.game_won = False
+        self.no_guess = no_guess
+        self.pool = pool
+        if render_mode is None:
+            render_mode = RENDER_TILES if width * height <= MAX_TILE_ITEMS else RENDER_BOARD
+        self.render_mode = render_mode
+        self.recorder = recorder
+        self.board = Board(width, height, num_bombs, seed) if board is None else board
+        self.seed = self.board.seed
+        self.rng = random.Random(self.seed)
+        # The game is only recorded once the first move is made (see self._apply_move)
+        self._recording = False
+        self.bomb_colors = {}
+        self.palette = ((UNEXPOSED_DARK, UNEXPOSED_HIGHLIGHT, EXPOSED_DARK),
+                        (UNEXPOSED_LIGHT, UNEXPOSED_HIGHLIGHT, EXPOSED_LIGHT))
+        self.hover_index = None
+        self.hints = None
+        self.hint_index = None
+        self.grid = None
+        self.board_item = None
         # Initialize the scene to be width * tile_size pixels wide and height * tile_size pixels tall
         super().__init__(0, 0, width * tile_size, height * tile_size)
-        # Randomize the tiles, and set the count values for each of the safe tiles
-        self._randomize()
-        self._compute_counts()
-        # To be used for self._end_game_sequence()
-        self.safes = deque()
-        self.bombs = deque()
+        if render_mode == RENDER_TILES:
+            self._create_tiles()
+        else:
+            self._create_board_item()
+        self.animator = None
 
     def game_finished(self):
         """Returns a boolean on whether or not the game is over
@@ -73,7 +140,7 @@ class Canvas(QGraphicsScene):
         Returns:
             A boolean representing whether or not the game is over
         """
-        return self.game_over
+        return self.board.game_over
     
     def game_is_won(self):
         """Returns a boolean on whether or not the game has been won
@@ -81,189 +148,383 @@ class Canvas(QGraphicsScene):
         Returns:
             A boolean representing whether or not the game is won
         """
-        return self.game_won
+        return self.board.game_won
 
-    def _compute_count_at(self, x, y):
-        """Sets the number of bombs surrounding the tile located at position (X,Y)
-        
-        Args:
-            x -- the x-coordinate of the tile measured from the left
-            y -- the y-cooridnate of the tile measured from the top
+    def first_move_made(self):
+        """Returns a boolean on whether or not the player has exposed a tile yet
 
-        Raises:
-            IndexError, AssertionError
+        Returns:
+            A boolean representing whether or not the first move has been made
         """
-        assert self.grid[y][x].is_safe(), "Current tile is not safe." 
-
-        dy = [0, 0, 1, 1, 1, -1, -1, -1]
-        dx = [-1, 1, -1, 0, 1, -1, 0, 1]
-        count = 0
-        for i in range(len(dy)):
-            y_new = y + dy[i] 
-            x_new = x + dx[i]
-            if 0 <= x_new and 0 <= y_new and x_new < self.width and y_new < self.height \
-                and not self.grid[y_new][x_new].is_safe():
-                count += 1
-        self.grid[y][x].set_num_bombs(count)
-
-    def _compute_counts(self):
-        """Sets the number of bombs surrounding each SafeTile on the board."""
-        for i in range(self.width):
-            for j in range(self.height):
-                if self.grid[j][i].is_safe():
-                    self._compute_count_at(i, j)
+        return self.board.first_move_made
+
+    def num_flagged_cells(self):
+        """Returns the number of flagged tiles on the board
+
+        Returns:
+            An integer; the number of flagged tiles
+        """
+        return self.board.num_flagged
     
     def _randomize_around_start(self, x, y):
-        # TODO: The implementation of this function should essentially guarantee that on the first 
-        # move of the game, the user does not pick a bomb. To ensure that the game is actually solvable,
-        # it should also ensure that the generated floodfill region is concave, so that some tiles
-        # can be immediately flagged as bombs. The arguments X, and Y should represent the location of 
-        # the user's first move (here the first move must be a move where the user exposes a tile).  
-        pass
-
-    def _randomize(self):
-        """Randomly assigns each grid position to a BombTile or a SafeTile while ensuring that
-        there are exactly self.num_bombs number of BombTiles."""
-        # 1 represents a BombTile, and 0 represents a SafeTile
-        indicator = [1] * self.num_bombs + [0] * (self.width * self.height - self.num_bombs)
-        random.shuffle(indicator)
-        index = 0
+        """Places the bombs on the board so that the first move, made at (X, Y), is guaranteed
+        not to be a bomb. If self.no_guess is True, the board can also be solved from there
+        without guessing. The tiles themselves do not need to change, since they read their
+        state from self.board.
+
+        Args:
+            x -- the x-coordinate of the first move measured from the left
+            y -- the y-cooridnate of the first move measured from the top
+        """
+        if self.no_guess and self.width * self.height <= MAX_NO_GUESS_TILES:
+            # Only generate a board if none of the ready-made ones fit the first move
+            if self.pool is None or not self.pool.take(self.board, x, y):
+                generate_no_guess(self.board, x, y)
+        else:
+            self.board._randomize_around_start(x, y)
+
+    def _create_tiles(self):
+        """Creates a Tile for each position on self.board, and adds it to the scene. The bombs
+        have not been placed yet at this point, so the tiles only differ by color, which they
+        read from self.palette."""
+        self.grid = [ [None] * self.width for i in range(self.height) ]
         for i in range(self.width):
             for j in range(self.height):
-                # The modulo 2 is here to make a chess-board like pattern
-                if (i + j) % 2 == 0:
-                    if indicator[index] == 0:
-                        tile = SafeTile(UNEXPOSED_DARK, UNEXPOSED_HIGHLIGHT, EXPOSED_DARK, self.tile_size)
-                    else:
-                        tile = BombTile(UNEXPOSED_DARK, UNEXPOSED_HIGHLIGHT, self.tile_size)
-                else:
-                    if indicator[index] == 0:
-                        tile = SafeTile(UNEXPOSED_LIGHT, UNEXPOSED_HIGHLIGHT, EXPOSED_LIGHT, self.tile_size)
-                    else:
-                        tile = BombTile(UNEXPOSED_LIGHT, UNEXPOSED_HIGHLIGHT, self.tile_size)
+                tile = Tile(self, self.board.index(i, j))
                 # Add tiles to the QGraphicsScene
                 tile.setPos(i * self.tile_size, j * self.tile_size)
                 self.addItem(tile)
                 self.grid[j][i] = tile
-                index += 1
+
+    def _create_board_item(self):
+        """Creates a single BoardItem that draws every tile of self.board, and adds it to the scene."""
+        even_colors, odd_colors = self.palette
+        self.board_item = BoardItem(self.board, self.tile_size, even_colors, odd_colors,
+                                    self.bomb_colors)
+        self.addItem(self.board_item)
+
+    def _repaint(self, indices):
+        """Repaints the tiles at each of the board indices in INDICES. Rather than updating
+        every tile separately, the rectangle bounding all of the tiles is invalidated once,
+        so that a large floodfill is redrawn in a single frame."""
+        if len(indices) == 0:
+            return
+        width = self.width
+        rows = [index // width for index in indices]
+        columns = [index % width for index in indices]
+        left, top = min(columns), min(rows)
+        right, bottom = max(columns) + 1, max(rows) + 1
+        self.update(QRectF(left * self.tile_size, top * self.tile_size,
+                           (right - left) * self.tile_size, (bottom - top) * self.tile_size))
     
-    def _floodfill(self, x, y):
-        """Exposes every possible safe tile when a tile that is surrounded by zero bombs is selected.
-        
-        Args:
-            x -- the x-coordinate of the tile measured from the left
-            y -- the y-cooridnate of the tile measured from the top
+    def show_hint(self):
+        """Highlights the tile that is least likely to be a bomb, which is a tile that is certainly
+        safe whenever there is one. Boards with more than MAX_HINT_TILES tiles get no hints.
+
+        Returns:
+            A tuple of the form (index of the tile, chance that it is a bomb), or None if there
+            is no hint to give
         """
-        assert self.grid[y][x].is_safe() and self.grid[y][x].get_num_bombs() == 0, "Tile cannot be floodfilled."
-        # Just a standard DFS implementation 
-        fringe = deque()
-        fringe.append((x, y))
-        visited = set()
-        while not len(fringe) == 0:
-            xtop, ytop = fringe.pop()
-            if (xtop, ytop) in visited:
-                continue
-            self.grid[ytop][xtop].force_expose()
-            visited.add((xtop, ytop))
-            if self.grid[ytop][xtop].get_num_bombs() == 0:
-                # Add any neighbors to the stack
-                dy = [0, 0, 1, 1, 1, -1, -1, -1]
-                dx = [-1, 1, -1, 0, 1, -1, 0, 1]
-                for i in range(len(dy)):
-                    y_new = ytop + dy[i] 
-                    x_new = xtop + dx[i]
-                    if 0 <= x_new and 0 <= y_new and x_new < self.width and y_new < self.height \
-                        and self.grid[y_new][x_new].is_safe():
-                        fringe.append((x_new, y_new))
-        
-    def _get_unmarked_bombs(self):
-        """Populates self.bombs with all of the unmarked bombs (i.e. the bombs unknown to the user).
-        To be used when the game is lost, and all the bombs need to be exposed."""
-        for i in range(self.width):
-            for j in range(self.height):
-                if not self.grid[j][i].is_safe() and not self.grid[j][i].flagged():
-                    self.bombs.append(self.grid[j][i])
-        random.shuffle(self.bombs)
-    
-    def _get_incorrectly_marked_safe(self):
-        """Populates self.safes with all of the incorrectly flagged tiles (i.e. the safe tiles that 
-        were flagged). To be used when the game is lost, and all the incorrectly flagged tiles 
-        need to be exposed."""
-        for i in range(self.width):
-            for j in range(self.height):
-                if self.grid[j][i].is_safe() and self.grid[j][i].flagged():
-                    self.safes.append(self.grid[j][i])
-        random.shuffle(self.safes)
-    
-    def _end_game_sequence(self):
-        """Force exposes all tiles in self.bombs and self.safes, with bombs being exposed every
-        200, 300, or 400 milliseconds and safe tiles being crossed out every 50, 100, or 150 milliseconds.
-        The QTimer is used to animate this process."""
-        if len(self.bombs) != 0:
-            self.bombs.pop().force_expose()
-            QTimer.singleShot(random.choice([200, 300, 400]), self._end_game_sequence)
-        elif len(self.safes) != 0:
-            self.safes.pop().crossout()
-            QTimer.singleShot(random.choice([50, 100, 150]), self._end_game_sequence)
-                        
+        if self.width * self.height > MAX_HINT_TILES:
+            return None
+        if self.hints is None:
+            with self._busy("Preparing hints..."):
+                self.hints = HintEngine(self.board, self.rng.getrandbits(64))
+        hint = self.hints.hint()
+        self._set_hint_index(None if hint is None else hint[0])
+        return hint
+
+    def _set_hint_index(self, index):
+        """Moves the hint highlight to the tile at INDEX, or removes it if INDEX is None."""
+        if index == self.hint_index:
+            return
+        if self.hint_index is not None:
+            self._repaint([self.hint_index])
+        self.hint_index = index
+        if self.board_item is not None:
+            self.board_item.hint_index = index
+        if index is not None:
+            self._repaint([index])
+
+    def _busy(self, text):
+        """Returns a context manager that shows a progress indicator with TEXT over the view of a
+        board with at least LARGE_BOARD_TILES tiles, and does nothing otherwise."""
+        if self.width * self.height < LARGE_BOARD_TILES or not self.views():
+            return nullcontext()
+        return busy(self.views()[0].window(), text)
+
     def _disable_mouse_events(self):
         """Disable all tiles from accepting mouse events."""
+        if self.render_mode == RENDER_BOARD:
+            self.board_item.setAcceptHoverEvents(False)
+            self.board_item.hoverLeaveEvent(None)
+            return
         for i in range(self.width):
             for j in range(self.height):
                 self.grid[j][i].setAcceptHoverEvents(False)
                 self.grid[j][i].setActive(False)
                 self.grid[j][i].setAcceptedMouseButtons(Qt.MouseButton.NoButton)
-    
-    def _check_win_condition(self):
-        """Checks if the game has been won and updates the self.game_over and self.game_won
-        attributes accordingly. Disables mouse events if the game has been won."""
-        for i in range(self.width):
-            for j in range(self.height):
-                # If there is an unexposed safe tile, the game is not over
-                if self.grid[j][i].is_safe() and not self.grid[j][i].is_exposed():
-                    return 
-        self.game_over = True
-        self.game_won = True
+
+    def _lose_game(self):
+        """Starts the end of game sequence after the user has exposed a bomb."""
+        # Disable mouse events before starting to explode the bombs and cross out
+        # incorrectly flagged tiles, since there have been bugs where the user can
+        # still click on tiles during the end of game sequence
         self._disable_mouse_events()
+        # Explode the bombs and cross out the tiles in a random order. The animator picks each
+        # tile, and the color of each bomb, as it gets to it, so that losing a large board does
+        # not have to shuffle every bomb first.
+        with self._busy("Finding the bombs..."):
+            bombs = self.board.unmarked_bombs()
+            safes = self.board.incorrectly_marked_safe()
+        self.animator = EndGameAnimator(self, bombs, safes)
+        self.animator.start()
+
+    def stop_animation(self):
+        """Stops the end of game sequence, if it is playing, leaving the board as it is. Called
+        before the canvas is replaced by a new game."""
+        if self.animator is not None:
+            self.animator.stop()
+
+    def make_move(self, action, x, y):
+        """Makes the move of type ACTION at (X, Y), records it, and repaints the tiles that changed.
+        This is shared by the mouse handler and CanvasReplayer.
+
+        Args:
+            action -- REVEAL, FLAG, UNFLAG or CHORD
+            x -- the x-coordinate of the tile measured from the left
+            y -- the y-cooridnate of the tile measured from the top
+        """
+        if self.board.game_over:
+            return
+        # The bombs are only placed once the user makes their first move
+        if action == REVEAL and not self.board.generated and not self.board.is_flagged(x, y):
+            # Placing the bombs and floodfilling the opening takes a while on large boards
+            with self._busy("Setting up the board..."):
+                self._randomize_around_start(x, y)
+                if self.recorder is not None and self._recording:
+                    self.recorder.layout(self.board)
+                self._apply_move(action, x, y)
+            return
+        self._apply_move(action, x, y)
+
+    def _apply_move(self, action, x, y):
+        """Makes the move of type ACTION at (X, Y) on a board whose bombs have been placed, and
+        updates the hints, the tiles and the state of the game. See self.make_move."""
+        if self.recorder is not None:
+            # A game that is resumed is recorded from the position it was resumed in
+            if not self._recording:
+                self.recorder.new_game(self.board)
+                self._recording = True
+            self.recorder.move(action, x, y)
+        # Any hint is out of date once a move has been made
+        self._set_hint_index(None)
+        changed = apply_move(self.board, action, x, y)
+        if (action == REVEAL or action == CHORD) and self.hints is not None:
+            self.hints.update(changed)
+        self._repaint(changed)
+        if self.board.game_over and self.recorder is not None:
+            self.recorder.flush()
+        # If the user presses a bomb, the game is lost
+        if self.board.game_over and not self.board.game_won:
+            self._lose_game()
+        # If the game has been won, the tiles no longer need to respond to the mouse
+        elif self.board.game_won:
+            self._disable_mouse_events()
 
     def mousePressEvent(self, event):
-        """Handler for mouse press events. Mouse events are also handled here for floodfilling
-        and ending the game after it has been won or lost. 
+        """Handler for mouse press events. Left clicks expose tiles and right clicks flag
+        them. Middle clicks, or pressing the left and right buttons together, chord an exposed
+        tile. Mouse events are also handled here for ending the game after it has been
+        won or lost, and any click after a lost game skips the end of game sequence. 
 
         Args:
             event -- A QGraphicsSceneMouseEvent to handle
         """
-        if self.game_over:
+        if self.board.game_over:
+            # Clicking during the end of game sequence skips to the end of it
+            if self.animator is not None:
+                self.animator.finish()
             return 
-        if event.button() == Qt.MouseButton.LeftButton:
-            point = event.buttonDownScenePos(Qt.MouseButton.LeftButton)
-            x = int(point.x() // self.tile_size)
-            y = int(point.y() // self.tile_size)
-            # First, process the event at the Tile level
-            self.grid[y][x].mousePressEvent(event)
-            # If the user presses a bomb that is not flagged, the game is over
-            if not self.grid[y][x].is_safe() and not self.grid[y][x].flagged():
-                # Disable mouse events before starting to explode the bombs and cross out
-                # incorrectly flagged tiles, since there have been bugs where the user can
-                # still click on tiles during self._end_game_sequence()
-                self._disable_mouse_events()
-                # Populate self.bombs and self.safes
-                self._get_unmarked_bombs()
-                self._get_incorrectly_marked_safe()
-                # Animate the explosions and crossouts
-                self._end_game_sequence()
-                self.game_over = True
-                return 
-            # If the user clicks on a safe tile with no bombs, floodfill it 
-            elif self.grid[y][x].is_safe() and self.grid[y][x].get_num_bombs() == 0 \
-                 and not self.grid[y][x].flagged():
-                self._floodfill(x, y)
-        # If you right click, then the Tile.mousePressEvent handles it perfectly.
+        point = event.buttonDownScenePos(event.button())
+        x = int(point.x() // self.tile_size)
+        y = int(point.y() // self.tile_size)
+        # A board smaller than the view leaves a margin around it, which has no tiles
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        both_buttons = Qt.MouseButton.LeftButton | Qt.MouseButton.RightButton
+        if event.button() == Qt.MouseButton.MiddleButton or event.buttons() & both_buttons == both_buttons:
+            self.make_move(CHORD, x, y)
+        elif event.button() == Qt.MouseButton.LeftButton:
+            self.make_move(REVEAL, x, y)
         elif event.button() == Qt.MouseButton.RightButton:
-            point = event.buttonDownScenePos(Qt.MouseButton.RightButton)
-            x = int(point.x() // self.tile_size)
-            y = int(point.y() // self.tile_size)
-            self.grid[y][x].mousePressEvent(event)
-        # Check if the game has been won after each mouse click
-        self._check_win_condition()
-    
\ No newline at end of file
+            self.make_move(UNFLAG if self.board.is_flagged(x, y) else FLAG, x, y)
+
+class EndGameAnimator(QObject):
+    """An EndGameAnimator object plays the end of game sequence of a lost game: every unmarked
+    bomb explodes, and then every incorrectly flagged tile is crossed out, one at a time. A single
+    timer drives the sequence, and each frame changes every tile that is due by then, within
+    FRAME_BUDGET milliseconds, and repaints them together. The tiles follow each other at the pace
+    of BOMB_DELAYS and SAFE_DELAYS, unless the sequence would then take longer than its duration,
+    in which case they are spread evenly over the duration.
+
+    canvas -- the Canvas of the lost game
+    bombs -- a list of the indices of the bombs that have not exploded yet, in no particular order
+    safes -- a list of the indices of the incorrectly flagged tiles that have not been crossed out
+    yet, in no particular order
+    duration -- the longest time in milliseconds the sequence takes
+    step -- the time in milliseconds between two tiles when the sequence is sped up, or None to
+    use BOMB_DELAYS and SAFE_DELAYS
+    timer -- the QTimer that calls self._frame once per frame
+    """
+    def __init__(self, canvas, bombs, safes, duration = END_GAME_DURATION):
+        """Create an EndGameAnimator that explodes the BOMBS and crosses out the SAFES of CANVAS,
+        in a random order, in at most DURATION milliseconds.
+
+        canvas -- A Canvas; the lost game
+        bombs -- A list of integers; the indices of the unmarked bombs. It is emptied as the
+        bombs explode.
+        safes -- A list of integers; the indices of the incorrectly flagged tiles. It is emptied
+        as the tiles are crossed out.
+        duration -- An integer; the longest time in milliseconds the sequence takes
+        """
+        super().__init__(canvas)
+        self.canvas = canvas
+        self.bombs = bombs
+        self.safes = safes
+        self.duration = duration
+        average = len(bombs) * sum(BOMB_DELAYS) / len(BOMB_DELAYS) + len(safes) * sum(SAFE_DELAYS) / len(SAFE_DELAYS)
+        self.step = None
+        if average > duration:
+            self.step = duration / max(len(bombs) + len(safes), 1)
+        self.timer = QTimer(self)
+        self.timer.setInterval(FRAME_INTERVAL)
+        self.timer.timeout.connect(self._frame)
+        self._start = None
+        self._next_due = 0
+
+    def start(self):
+        """Starts the sequence. The first bomb explodes straight away."""
+        self._start = time.perf_counter()
+        self._next_due = 0
+        self._frame()
+        if self.is_running():
+            self.timer.start()
+
+    def is_running(self):
+        """Returns a boolean on whether or not there are still tiles left to change."""
+        return len(self.bombs) != 0 or len(self.safes) != 0
+
+    def stop(self):
+        """Stops the sequence, leaving the remaining tiles as they are."""
+        self.timer.stop()
+        self.bombs.clear()
+        self.safes.clear()
+
+    def finish(self):
+        """Skips to the end of the sequence, changing every remaining tile at once."""
+        self.timer.stop()
+        canvas = self.canvas
+        board = canvas.board
+        with canvas._busy("Exploding the bombs..."):
+            # The tiles all change at once, so they are taken in the order they are stored in
+            colors = canvas.rng.choices(range(len(BOMB_COLORS)), k = len(self.bombs))
+            canvas.bomb_colors.update(zip(self.bombs, colors))
+            for index in self.bombs:
+                board.expose(*board.coordinates(index))
+            for index in self.safes:
+                board.crossout(*board.coordinates(index))
+            changed = self.bombs + self.safes
+            self.bombs.clear()
+            self.safes.clear()
+            canvas._repaint(changed)
+
+    def _frame(self):
+        """Changes the tiles that are due by now, spending at most FRAME_BUDGET milliseconds."""
+        elapsed = (time.perf_counter() - self._start) * 1000
+        self._change(elapsed, time.perf_counter() + FRAME_BUDGET / 1000)
+        if not self.is_running():
+            self.timer.stop()
+
+    def _change(self, elapsed, deadline):
+        """Explodes bombs, and then crosses out tiles, until the next one is due after ELAPSED
+        milliseconds into the sequence or time.perf_counter() passes DEADLINE, and repaints them.
+
+        Args:
+            elapsed -- A float; the time in milliseconds since the sequence started
+            deadline -- A float; the time.perf_counter() to stop at, or None to not stop early
+        """
+        board, rng, bomb_colors = self.canvas.board, self.canvas.rng, self.canvas.bomb_colors
+        changed = []
+        while self._next_due <= elapsed and self.is_running():
+            if len(self.bombs) != 0:
+                index = _pop_random(self.bombs, rng)
+                board.expose(*board.coordinates(index))
+                bomb_colors[index] = rng.randrange(len(BOMB_COLORS))
+                delays = BOMB_DELAYS
+            else:
+                index = _pop_random(self.safes, rng)
+                board.crossout(*board.coordinates(index))
+                delays = SAFE_DELAYS
+            changed.append(index)
+            self._next_due += self.step if self.step is not None else rng.choice(delays)
+            # Checking the clock is slower than changing a tile, so only check it now and then
+            if deadline is not None and len(changed) % 64 == 0 and time.perf_counter() > deadline:
+                break
+        self.canvas._repaint(changed)
+
+def _pop_random(items, rng):
+    """Removes a random item from the list ITEMS and returns it, using the random.Random RNG.
+    Taking every item this way visits them in a random order, as shuffling ITEMS would, but the
+    work is only done for the items that are taken."""
+    i = rng.randrange(len(items))
+    items[i], items[-1] = items[-1], items[i]
+    return items.pop()
+
+class CanvasReplayer:
+    """A CanvasReplayer object plays a recorded game back on a Canvas, with the moves spaced
+    out as they were recorded.
+
+    canvas -- the Canvas to play the game on. It should be showing a new game of the same size,
+    or the position the game was recorded from (see starting_board in "replay.py").
+    game -- the GameLog to play back
+    speed -- how many times faster than it was recorded the game is played back
+    position -- the index of the next move to play
+    """
+    def __init__(self, canvas, game, speed = 1.0):
+        """Create a CanvasReplayer which plays GAME back on CANVAS at SPEED times the speed it was
+        recorded at.
+
+        canvas -- A Canvas; a new game of the same size as GAME
+        game -- A GameLog; the recorded game
+        speed -- A float; the playback speed
+        """
+        self.canvas = canvas
+        self.game = game
+        self.speed = speed
+        self.position = 0
+        self._stopped = False
+
+    def start(self):
+        """Places the recorded bombs on the canvas, unless they already have been, and starts
+        playing the moves."""
+        if self.game.mines is not None and not self.canvas.board.generated:
+            self.canvas.board.set_mine_layout(self.game.mines)
+        self._stopped = False
+        self._play_next()
+
+    def stop(self):
+        """Stops playing the moves. The canvas is left as it is."""
+        self._stopped = True
+
+    def _play_next(self):
+        """Plays the next move, and schedules the one after it."""
+        moves = self.game.moves
+        if self._stopped or self.position >= len(moves):
+            return
+        action, x, y, elapsed = moves[self.position]
+        self.canvas.make_move(action, x, y)
+        self.position += 1
+        if self.position < len(moves):
+            delay = (moves[self.position][3] - elapsed) / self.speed
+            QTimer.singleShot(int(delay), self._play_next)
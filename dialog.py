@@ -1,12 +1,16 @@
+from contextlib import contextmanager
+from PyQt6.QtCore import Qt, QEventLoop
 from PyQt6.QtGui import QPixmap, QFont
-from PyQt6.QtWidgets import QDialog, QLabel, QVBoxLayout, QHBoxLayout, QWidget, QApplication, QPushButton
+from PyQt6.QtWidgets import QDialog, QLabel, QVBoxLayout, QHBoxLayout, QWidget, QApplication, QPushButton, \
+    QSpinBox, QFormLayout, QDialogButtonBox, QProgressDialog
+from modes import MIN_SIZE, MAX_SIZE, max_bombs
 
 """Global Variables:
 
-WORST_TIME: In "main.py", the worst time achievable by the player is 999.
+WORST_TIME: In "main.py", the worst time achievable by the player is 999 seconds.
 However, before the player has set a high score, their time is saved in 
-cache/high_scores.txt as WORST_TIME for each difficulty mode. When displaying
-the dialog, if the user's best time is WORST_TIME, then instead of displaying 
+cache/high_scores.txt as WORST_TIME seconds for each difficulty mode. When displaying
+the dialog, if the user's best time is WORST_TIME seconds, then instead of displaying 
 the time, three dashes are displayed instead (this is equivalent to saying
 that their best score is N/A).  
 
@@ -16,6 +20,20 @@ RETRY_STRING: A unicode string encoding the "refresh" symbol
 WORST_TIME = 1000
 RETRY_STRING = u"\u21BA"
 
+def format_time(milliseconds, num_digits = 3):
+    """Formats a time for display in seconds, padded to NUM_DIGITS digits, followed by the
+    milliseconds. For example, 7250 milliseconds is displayed as '007.250'.
+
+    Args:
+        milliseconds -- An integer; the time to format
+        num_digits -- An integer; the number of digits to display for the whole seconds
+
+    Returns:
+        A string; the formatted time
+    """
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return "{:0{}d}.{:03d}".format(seconds, num_digits, milliseconds)
+
 class WinDialog(QDialog):
     """A WinDialog object displays the user's time taken for the current game
     as well as their best time in that category next to a timer icon and a trophy
@@ -27,19 +45,19 @@ class WinDialog(QDialog):
         TROPHY_ICON, respectively, which are scaled to ICON_SIZE. The user's times are formatted
         according to TEXT_SIZE and NUM_DIGITS
 
-        cur_time -- An integer; the amount of time the user took for the current game
-        best_time -- An integer; the user's best time for the current game mode
+        cur_time -- An integer; the amount of time in milliseconds the user took for the current game
+        best_time -- An integer; the user's best time in milliseconds for the current game mode
         time_icon -- A string; the filepath to the icon to use for displaying the user's
                     current time
         trophy_icon -- A string; the filepath to the icon to use for displaying the user's
                     best time
         icon_size -- An integer; the size of the icon
         text_size -- An integer; the size of the text
-        num_digits -- An integer; the number of digits to display for cur_time and best_time
+        num_digits -- An integer; the number of digits to display for the whole seconds of 
+                    cur_time and best_time
         """
         super().__init__()
         self.setWindowTitle("Minesweeper")
-        format_string = "{:0" + str(num_digits) + "d}"
 
         hourglass = QLabel()
         trophy = QLabel()
@@ -51,16 +69,16 @@ class WinDialog(QDialog):
         trophy.setPixmap(QPixmap(trophy_icon).scaled(icon_size, icon_size))
 
         if isinstance(cur_time, int):
-            current_time_label.setText(format_string.format(cur_time))
+            current_time_label.setText(format_time(cur_time, num_digits))
         else:
             current_time_label.setText(cur_time)
 
         # If the user's best_time is WORST_TIME, they haven't played that gamemode
         # yet, so don't display best_time.
-        if best_time == WORST_TIME:
+        if best_time >= WORST_TIME * 1000:
             best_time_label.setText('___')
         else:
-            best_time_label.setText(format_string.format(best_time))
+            best_time_label.setText(format_time(best_time, num_digits))
 
         # Set each of the labels to have the same font
         font = QFont()
@@ -121,14 +139,15 @@ class LoseDialog(WinDialog):
         TROPHY_ICON which are scaled to ICON_SIZE. The user's best time is formatted
         according to TEXT_SIZE and NUM_DIGITS
 
-        best_time -- An integer; the user's best time for the current game mode
+        best_time -- An integer; the user's best time in milliseconds for the current game mode
         time_icon -- A string; the filepath to the icon to use for displaying the user's
                     current time
         trophy_icon -- A string; the filepath to the icon to use for displaying the user's
                     best time
         icon_size -- An integer; the size of the icon
         text_size -- An integer; the size of the text
-        num_digits -- An integer; the number of digits to display for cur_time and best_time
+        num_digits -- An integer; the number of digits to display for the whole seconds of 
+                    best_time
         """
         super().__init__("___", best_time, time_icon, trophy_icon, \
             icon_size, text_size, num_digits)
@@ -144,3 +163,85 @@ class LoseDialog(WinDialog):
         button = QPushButton()
         button.setText(RETRY_STRING + " Try again")
         return button
+
+class CustomDialog(QDialog):
+    """A CustomDialog object lets the user choose the size of a custom board and the number
+    of bombs on it. The number of bombs is limited to what fits on the chosen size.
+
+    width_box -- A QSpinBox object, which contains the number of tiles wide
+    height_box -- A QSpinBox object, which contains the number of tiles high
+    bombs_box -- A QSpinBox object, which contains the number of bombs
+    """
+    def __init__(self, width, height, num_bombs, parent = None, text_size = 13):
+        """Create a CustomDialog that starts with a WIDTH by HEIGHT board with NUM_BOMBS bombs,
+        whose text is formatted according to TEXT_SIZE.
+
+        width -- An integer; the initial number of tiles wide
+        height -- An integer; the initial number of tiles high
+        num_bombs -- An integer; the initial number of bombs
+        parent -- A QWidget; the window the dialog belongs to
+        text_size -- An integer; the size of the text
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Custom board")
+        font = QFont()
+        font.setPointSize(text_size)
+        self.setFont(font)
+
+        self.width_box = QSpinBox()
+        self.width_box.setRange(MIN_SIZE, MAX_SIZE)
+        self.width_box.setValue(width)
+        self.height_box = QSpinBox()
+        self.height_box.setRange(MIN_SIZE, MAX_SIZE)
+        self.height_box.setValue(height)
+        self.bombs_box = QSpinBox()
+        self._update_max_bombs()
+        self.bombs_box.setValue(num_bombs)
+        # Changing the size of the board changes how many bombs fit on it
+        self.width_box.valueChanged.connect(self._update_max_bombs)
+        self.height_box.valueChanged.connect(self._update_max_bombs)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QFormLayout()
+        layout.addRow("Width", self.width_box)
+        layout.addRow("Height", self.height_box)
+        layout.addRow("Bombs", self.bombs_box)
+        layout.addRow(buttons)
+        self.setLayout(layout)
+
+    def _update_max_bombs(self):
+        """Limits the number of bombs to the most that fit on the chosen size of board."""
+        self.bombs_box.setRange(1, max_bombs(self.width_box.value(), self.height_box.value()))
+
+    def values(self):
+        """Returns the board chosen by the user.
+
+        Returns:
+            A tuple of the form (number of tiles wide, number of tiles high, number of bombs)
+        """
+        return (self.width_box.value(), self.height_box.value(), self.bombs_box.value())
+
+@contextmanager
+def busy(parent, text):
+    """Shows a progress indicator with TEXT over PARENT while the body of the with statement
+    runs. The indicator does not know how far along the work is, so it only shows that the
+    game is busy. User input is not processed while it is shown, so that clicks made while
+    waiting are not handled in the middle of the work.
+
+    Args:
+        parent -- A QWidget; the window that is busy
+        text -- A string; what the game is busy doing
+    """
+    dialog = QProgressDialog(text, None, 0, 0, parent)
+    dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    dialog.setMinimumDuration(0)
+    dialog.show()
+    # Paint the indicator before the work blocks the event loop
+    QApplication.processEvents(QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
+    try:
+        yield dialog
+    finally:
+        dialog.close()
@@ -0,0 +1,239 @@
+"""A command-line tool that estimates how difficult board configurations are, by having the
+solver in "solver.py" play many games of each across a pool of processes. When the solver is
+stuck, it guesses the tile least likely to be a bomb, so a game is lost whenever a guess is wrong.
+
+For every configuration, it reports the win rate, the number of guesses needed, the 3BV (the
+smallest number of clicks that solves the board) and the time taken to solve each board. Games
+are split into chunks that are played independently, so the work scales with the number of
+processes, and a JSON line with the results so far is printed every time a chunk finishes.
+For example, to play 10000 games of each mode in "modes.py" and of a 16x16 board with 10%, 15%
+and 20% of its tiles being bombs, run the command
+```
+python3 estimate.py --games 10000 --modes Easy,Medium,Hard --sizes 16x16 --densities 0.1,0.15,0.2
+```
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from board import Board, SEED_BITS
+from modes import MODES, MIN_SIZE, MAX_SIZE
+from solver import Solver, generate_no_guess
+
+"""Global Variables:
+
+GAMES: The default number of games to play of each configuration
+CHUNK_SIZE: The default number of games in each unit of work sent to a process
+SEED: The default seed that the seeds of the games are derived from
+"""
+
+GAMES = 1000
+CHUNK_SIZE = 500
+SEED = 2001
+
+class Summary:
+    """A Summary object accumulates the results of the games played on one configuration. Only
+    counts and histograms are kept, so summaries of chunks are small and cheap to merge.
+
+    games -- the number of games played
+    wins -- the number of games won
+    wins_without_guessing -- the number of games won without any guesses
+    guesses -- a Counter mapping a number of guesses to the number of games that needed it
+    three_bv -- a Counter mapping a 3BV to the number of boards that had it
+    solve_ns -- the total time taken to solve the boards, in nanoseconds
+    max_solve_ns -- the longest time taken to solve a board, in nanoseconds
+    """
+    def __init__(self):
+        """Create an empty Summary."""
+        self.games = 0
+        self.wins = 0
+        self.wins_without_guessing = 0
+        self.guesses = Counter()
+        self.three_bv = Counter()
+        self.solve_ns = 0
+        self.max_solve_ns = 0
+
+    def add_game(self, won, guesses, three_bv, solve_ns):
+        """Adds the result of one game.
+
+        Args:
+            won -- A boolean; whether or not the game was won
+            guesses -- An integer; the number of guesses made
+            three_bv -- An integer; the 3BV of the board
+            solve_ns -- An integer; the time taken to play the game, in nanoseconds
+        """
+        self.games += 1
+        self.wins += won
+        self.wins_without_guessing += won and guesses == 0
+        self.guesses[guesses] += 1
+        self.three_bv[three_bv] += 1
+        self.solve_ns += solve_ns
+        self.max_solve_ns = max(self.max_solve_ns, solve_ns)
+
+    def merge(self, other):
+        """Adds every game of the Summary OTHER to this one."""
+        self.games += other.games
+        self.wins += other.wins
+        self.wins_without_guessing += other.wins_without_guessing
+        self.guesses.update(other.guesses)
+        self.three_bv.update(other.three_bv)
+        self.solve_ns += other.solve_ns
+        self.max_solve_ns = max(self.max_solve_ns, other.max_solve_ns)
+
+    def to_dict(self):
+        """Returns the statistics of the games so far as a dict that can be written as JSON."""
+        games = max(self.games, 1)
+        return {
+            "games": self.games,
+            "win_rate": self.wins / games,
+            "win_rate_without_guessing": self.wins_without_guessing / games,
+            "mean_guesses": sum(n * count for n, count in self.guesses.items()) / games,
+            "guesses": percentiles(self.guesses),
+            "three_bv": percentiles(self.three_bv),
+            "mean_three_bv": sum(n * count for n, count in self.three_bv.items()) / games,
+            "mean_solve_ms": self.solve_ns / games / 1e6,
+            "max_solve_ms": self.max_solve_ns / 1e6,
+        }
+
+def percentiles(histogram):
+    """Returns a dict of the minimum, maximum and 10th, 50th and 90th percentiles of the values
+    counted in HISTOGRAM, a Counter mapping each value to the number of times it occurred."""
+    values = sorted(histogram)
+    if not values:
+        return {}
+    total = sum(histogram.values())
+    result = {"min": values[0], "max": values[-1]}
+    for p in (10, 50, 90):
+        # The smallest value with at least p percent of the counts at or below it
+        target = p / 100 * total
+        seen = 0
+        for value in values:
+            seen += histogram[value]
+            if seen >= target:
+                result["p%d" % p] = value
+                break
+    return result
+
+def play_game(width, height, num_bombs, seed, no_guess = False):
+    """Generates a board and has the solver play it, guessing whenever it is stuck. The first
+    move is made at a random tile, and is always safe.
+
+    Args:
+        width -- An integer; number of tiles wide
+        height -- An integer; number of tiles high
+        num_bombs -- An integer; the number of bombs
+        seed -- An integer; the seed of the board
+        no_guess -- A boolean; whether or not to generate a board that can be solved without guessing
+
+    Returns:
+        A tuple of the form (whether the game was won, the number of guesses, the 3BV of the
+        board, the time taken to play the game in nanoseconds)
+    """
+    board = Board(width, height, num_bombs, seed)
+    x, y = board.rng.randrange(width), board.rng.randrange(height)
+    if no_guess:
+        generate_no_guess(board, x, y)
+    else:
+        board._randomize_around_start(x, y)
+    start = time.perf_counter_ns()
+    solver = Solver(board)
+    guesses = 0
+    won = solver.solve(board.index(x, y))
+    while not won:
+        guess = solver.guess()
+        guesses += 1
+        if not board.is_safe(*board.coordinates(guess)):
+            break
+        solver.safe_queue.append(guess)
+        won = solver.solve()
+    elapsed = time.perf_counter_ns() - start
+    return won, guesses, board.three_bv(), elapsed
+
+def play_chunk(width, height, num_bombs, first_seed, count, no_guess):
+    """Plays COUNT games of the same configuration, with the seeds FIRST_SEED, FIRST_SEED + 1, and
+    so on. This is the unit of work run by each process.
+
+    Returns:
+        A Summary of the games
+    """
+    summary = Summary()
+    for seed in range(first_seed, first_seed + count):
+        summary.add_game(*play_game(width, height, num_bombs, seed, no_guess))
+    return summary
+
+def _configurations(parser, args):
+    """Returns a list of (name, width, height, number of bombs) tuples for every configuration
+    selected by the command line arguments ARGS, reporting any error with PARSER."""
+    configurations = []
+    for mode in filter(None, args.modes.split(",")):
+        if mode not in MODES:
+            parser.error("unknown mode %r; choose from %s" % (mode, ", ".join(MODES)))
+        width, height, tile_size, num_bombs = MODES[mode]
+        configurations.append((mode, width, height, num_bombs))
+    try:
+        densities = [float(density) for density in args.densities.split(",")]
+    except ValueError as e:
+        parser.error("--densities must be comma separated numbers: %s" % e)
+    if not all(0 <= density <= 1 for density in densities):
+        parser.error("--densities must be between 0 and 1")
+    for size in filter(None, args.sizes.split(",")):
+        try:
+            width, height = map(int, size.split("x"))
+        except ValueError:
+            parser.error("board sizes must be of the form WIDTHxHEIGHT, not %r" % size)
+        # The first move and its neighbors are kept free of bombs, so a board needs more tiles
+        if not (MIN_SIZE <= width <= MAX_SIZE and MIN_SIZE <= height <= MAX_SIZE) or width * height <= 9:
+            parser.error("board size %s must be between %d and %d tiles wide and high, with more than 9 tiles"
+                         % (size, MIN_SIZE, MAX_SIZE))
+        for density in densities:
+            num_bombs = min(round(width * height * density), width * height - 9)
+            configurations.append(("%dx%d/%g" % (width, height, density), width, height, num_bombs))
+    return configurations
+
+def main(argv = None):
+    """Plays the games selected by the command line arguments ARGV, and streams the results as
+    JSON lines to stdout."""
+    parser = argparse.ArgumentParser(description = "Estimate the difficulty of board configurations.")
+    parser.add_argument("--games", type = int, default = GAMES, help = "number of games per configuration")
+    parser.add_argument("--modes", default = "", help = "comma separated modes from modes.py")
+    parser.add_argument("--sizes", default = "", help = "comma separated board sizes, such as 16x16,30x16")
+    parser.add_argument("--densities", default = "0.15", help = "comma separated fractions of tiles that are bombs")
+    parser.add_argument("--no-guess", action = "store_true", help = "play boards that can be solved without guessing")
+    parser.add_argument("--workers", type = int, default = os.cpu_count(), help = "number of processes")
+    parser.add_argument("--chunk", type = int, default = CHUNK_SIZE, help = "number of games in each unit of work")
+    parser.add_argument("--seed", type = int, default = SEED, help = "seed that the seeds of the games are derived from")
+    args = parser.parse_args(argv)
+    configurations = _configurations(parser, args)
+    if not configurations:
+        parser.error("select at least one configuration with --modes or --sizes")
+
+    rng = random.Random(args.seed)
+    summaries = {name: Summary() for name, width, height, num_bombs in configurations}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as executor:
+        futures = {}
+        for name, width, height, num_bombs in configurations:
+            for offset in range(0, args.games, args.chunk):
+                # Each chunk gets its own block of consecutive seeds
+                first_seed = rng.getrandbits(SEED_BITS - 1)
+                count = min(args.chunk, args.games - offset)
+                future = executor.submit(play_chunk, width, height, num_bombs, first_seed, count, args.no_guess)
+                futures[future] = (name, width, height, num_bombs)
+        for future in as_completed(futures):
+            name, width, height, num_bombs = futures[future]
+            summary = summaries[name]
+            summary.merge(future.result())
+            line = {"config": name, "width": width, "height": height, "num_bombs": num_bombs,
+                    "no_guess": args.no_guess, "done": summary.games == args.games,
+                    "elapsed_s": time.perf_counter() - start}
+            line.update(summary.to_dict())
+            print(json.dumps(line))
+            sys.stdout.flush()
+
+if __name__ == '__main__':
+    main()
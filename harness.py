@@ -0,0 +1,350 @@
+"""A command-line tool that plays automated players against each other on the same boards, across
+a pool of processes, and reports how well and how fast each of them plays.
+
+A player is loaded from a plugin, named as "module:callable". The callable is called with the
+width, height and number of bombs of the board at the start of every game, and returns the player
+for that game: a callable that is given the tiles that changed with the last move, as a list of
+[x, y, symbol] lists (see SYMBOLS in "server.py"), and returns its next move as a tuple of the form
+(action, x, y), where the action is "reveal", "flag" or "chord", or None if it has no move left to
+make, which stops the game as stalled. The harness makes the first move, which is always safe, so
+the first call is given the tiles it exposed. Moves are made on a Session from "server.py", so
+players play by exactly the same rules as in the game, or over the server.
+
+The boards of each chunk of games are generated once, by a process of the pool, and sent to every
+player as one bytes object: for each game, a BOARD_RECORD followed by its bombs packed with
+pack_bits. For example, to play the player below against another one on 1000 "Hard" boards, run
+```
+python3 harness.py --player harness:BasicPlayer --player my_bot:Player --games 1000 --mode Hard
+```
+and a JSON line with the results of a player so far is printed every time one of its chunks
+finishes.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import struct
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from board import Board, pack_bits, unpack_bits
+from estimate import percentiles
+from modes import MODES, CUSTOM, custom_mode
+from server import Session
+from solver import generate_no_guess, neighbor_table
+
+"""Global Variables:
+
+GAMES: The default number of games to play with each player
+CHUNK_SIZE: The default number of games in each unit of work sent to a process
+SEED: The default seed of the first game; the other games use the seeds that follow it
+MAX_IDLE_MOVES: The number of moves in a row that change nothing after which a game is stopped
+BOARD_RECORD: The layout of the start of each board sent to a process; the seed of the board and
+the index of the tile the first move is made on
+"""
+
+GAMES = 1000
+CHUNK_SIZE = 100
+SEED = 2001
+MAX_IDLE_MOVES = 100
+BOARD_RECORD = struct.Struct("<QI")
+
+# The players loaded in this process, by the name of their plugin
+_players = {}
+
+class Report:
+    """A Report object accumulates the results of the games played by one player on one
+    configuration. Only counts and histograms are kept, so reports of chunks are small and cheap
+    to merge.
+
+    games -- the number of games played
+    wins -- the number of games won
+    stalled -- the number of games stopped after MAX_IDLE_MOVES moves in a row changed nothing, or
+    because the player had no move left to make
+    errors -- the number of games stopped because the player raised an exception or made a move
+    that could not be carried out
+    moves -- a Counter mapping a number of moves to the number of games that took it
+    latency_us -- a Counter mapping the time in microseconds a player took to choose a move to the
+    number of moves that took it
+    solve_ms -- a Counter mapping the time in milliseconds taken to win a game to the number of
+    games won in it
+    solve_ns -- the total time taken to win the games that were won, in nanoseconds
+    """
+    def __init__(self):
+        """Create an empty Report."""
+        self.games = 0
+        self.wins = 0
+        self.stalled = 0
+        self.errors = 0
+        self.moves = Counter()
+        self.latency_us = Counter()
+        self.solve_ms = Counter()
+        self.solve_ns = 0
+
+    def add_game(self, result, moves, latencies, solve_ns):
+        """Adds the result of one game.
+
+        Args:
+            result -- A string; "won", "lost", "stalled" or "error"
+            moves -- An integer; the number of moves the player made
+            latencies -- A list of the times in nanoseconds the player took to choose each move
+            solve_ns -- An integer; the time taken to play the game, in nanoseconds
+        """
+        self.games += 1
+        self.wins += result == "won"
+        self.stalled += result == "stalled"
+        self.errors += result == "error"
+        self.moves[moves] += 1
+        self.latency_us.update(latency // 1000 for latency in latencies)
+        if result == "won":
+            self.solve_ms[solve_ns // 1000000] += 1
+            self.solve_ns += solve_ns
+
+    def merge(self, other):
+        """Adds every game of the Report OTHER to this one."""
+        self.games += other.games
+        self.wins += other.wins
+        self.stalled += other.stalled
+        self.errors += other.errors
+        self.moves.update(other.moves)
+        self.latency_us.update(other.latency_us)
+        self.solve_ms.update(other.solve_ms)
+        self.solve_ns += other.solve_ns
+
+    def to_dict(self):
+        """Returns the statistics of the games so far as a dict that can be written as JSON."""
+        games = max(self.games, 1)
+        num_moves = sum(self.latency_us.values())
+        return {
+            "games": self.games,
+            "win_rate": self.wins / games,
+            "stalled": self.stalled,
+            "errors": self.errors,
+            "mean_moves": sum(n * count for n, count in self.moves.items()) / games,
+            "moves": percentiles(self.moves),
+            "mean_latency_us": sum(n * count for n, count in self.latency_us.items()) / max(num_moves, 1),
+            "latency_us": percentiles(self.latency_us),
+            "mean_solve_ms": self.solve_ns / max(self.wins, 1) / 1e6,
+            "solve_ms": percentiles(self.solve_ms),
+        }
+
+class BasicPlayer:
+    """A BasicPlayer object is a simple player that only sees the tiles it is shown. It flags the
+    unexposed neighbors of a number when they must all be bombs, chords a number once as many of
+    its neighbors are flagged as it has bombs around it, and otherwise exposes a random unexposed
+    tile. It serves as an example of a plugin, and as a baseline for other players.
+
+    width -- the number of tiles wide the board is
+    symbols -- a bytearray with the symbol of each tile, as it was last shown to the player
+    neighbors -- the neighbor table of the board
+    todo -- a set of the indices of the numbers that may still lead to a move
+    rng -- a random.Random object used to choose the tiles to guess
+    """
+    def __init__(self, width, height, num_bombs):
+        """Create a BasicPlayer for a WIDTH by HEIGHT board with NUM_BOMBS bombs."""
+        self.width = width
+        self.symbols = bytearray(b"#" * (width * height))
+        self.neighbors = neighbor_table(width, height)
+        self.todo = set()
+        self.rng = random.Random(num_bombs)
+
+    def __call__(self, changed):
+        """Returns the next move, given the tiles CHANGED by the last one, or None if every
+        unexposed tile is flagged."""
+        symbols, neighbors, width = self.symbols, self.neighbors, self.width
+        for x, y, symbol in changed:
+            index = y * width + x
+            symbols[index] = ord(symbol)
+            if symbol.isdigit():
+                self.todo.add(index)
+            # A flag changes what the numbers around it allow
+            self.todo.update(n for n in neighbors[index] if chr(symbols[n]).isdigit())
+        while self.todo:
+            index = self.todo.pop()
+            hidden = [n for n in neighbors[index] if symbols[n] == ord("#")]
+            if not hidden:
+                continue
+            flags = sum(symbols[n] == ord("F") for n in neighbors[index])
+            count = symbols[index] - ord("0")
+            if flags == count:
+                return ("chord", index % width, index // width)
+            if flags + len(hidden) == count:
+                # The other hidden neighbors are flagged by the moves that follow
+                self.todo.add(index)
+                return ("flag", hidden[0] % width, hidden[0] // width)
+        hidden = [i for i, symbol in enumerate(symbols) if symbol == ord("#")]
+        # Every tile left may have been flagged, which leaves nothing to guess
+        if not hidden:
+            return None
+        guess = self.rng.choice(hidden)
+        return ("reveal", guess % width, guess // width)
+
+def load_player(name):
+    """Returns the callable named by NAME, of the form "module:callable", importing its module the
+    first time it is needed in this process.
+
+    Raises:
+        ValueError: NAME is not of the form "module:callable"
+        ImportError: the module cannot be imported
+        AttributeError: the module has no such callable
+    """
+    if name not in _players:
+        module, separator, attribute = name.partition(":")
+        if not separator or not module or not attribute:
+            raise ValueError("A player must be named as module:callable, not %r." % (name,))
+        player = importlib.import_module(module)
+        for part in attribute.split("."):
+            player = getattr(player, part)
+        _players[name] = player
+    return _players[name]
+
+def generate_chunk(width, height, num_bombs, first_seed, count, no_guess):
+    """Generates the boards with the seeds FIRST_SEED, FIRST_SEED + 1, and so on up to COUNT
+    boards, each safe around a first move chosen by its seed. This is the first unit of work run
+    by the processes, and its result is sent to every player.
+
+    Returns:
+        A bytes object; a BOARD_RECORD and the packed bombs of each board
+    """
+    records = []
+    for seed in range(first_seed, first_seed + count):
+        board = Board(width, height, num_bombs, seed)
+        x, y = board.rng.randrange(width), board.rng.randrange(height)
+        if no_guess:
+            generate_no_guess(board, x, y)
+        else:
+            board._randomize_around_start(x, y)
+        records.append(BOARD_RECORD.pack(seed, board.index(x, y)))
+        records.append(pack_bits(board.mine_layout()))
+    return b"".join(records)
+
+def play_game(player, board, start):
+    """Has the player returned by the plugin PLAYER play a game on BOARD, whose bombs have been
+    placed, after the first move is made at START.
+
+    Args:
+        player -- A callable; the plugin of the player
+        board -- A Board; the board to play on
+        start -- An integer; the index of the first move
+
+    Returns:
+        A tuple of the form (the result of the game, the number of moves, a list of the times in
+        nanoseconds the player took to choose each move, the time taken to play the game in
+        nanoseconds). The result is "won", "lost", "stalled" or "error".
+    """
+    session = Session(board)
+    try:
+        play = player(board.width, board.height, board.num_bombs)
+    except Exception:
+        return "error", 0, [], 0
+    latencies = []
+    idle = 0
+    result = None
+    start_time = time.perf_counter_ns()
+    response = session.reveal(*board.coordinates(start))
+    while response["status"] == "playing":
+        move_time = time.perf_counter_ns()
+        try:
+            move = play(response["changed"])
+            if move is None:
+                result = "stalled"
+                break
+            action, x, y = move
+        except Exception:
+            result = "error"
+            break
+        latencies.append(time.perf_counter_ns() - move_time)
+        response = session.handle({"action": action, "x": x, "y": y})
+        if not response["ok"]:
+            result = "error"
+            break
+        # Moves that change nothing, such as chording a number that is not ready, are allowed,
+        # but a player that keeps making them will never finish
+        idle = 0 if response["changed"] else idle + 1
+        if idle == MAX_IDLE_MOVES:
+            result = "stalled"
+            break
+    elapsed = time.perf_counter_ns() - start_time
+    return result or response["status"], len(latencies), latencies, elapsed
+
+def play_chunk(name, width, height, num_bombs, boards):
+    """Has the player of the plugin NAME play every board in BOARDS, as made by generate_chunk.
+    This is the second unit of work run by the processes.
+
+    Returns:
+        A Report of the games
+    """
+    player = load_player(name)
+    report = Report()
+    size = width * height
+    record_size = BOARD_RECORD.size + (size + 7) // 8
+    for offset in range(0, len(boards), record_size):
+        seed, start = BOARD_RECORD.unpack_from(boards, offset)
+        board = Board(width, height, num_bombs, seed)
+        board.set_mine_layout(unpack_bits(boards[offset + BOARD_RECORD.size:offset + record_size], size))
+        report.add_game(*play_game(player, board, start))
+    return report
+
+def _configuration(parser, args):
+    """Returns the (name, width, height, number of bombs) tuple of the configuration selected by
+    the command line arguments ARGS, reporting any error with PARSER."""
+    if args.custom is None:
+        width, height, tile_size, num_bombs = MODES[args.mode]
+        return args.mode, width, height, num_bombs
+    try:
+        width, height, num_bombs = map(int, args.custom.split("x"))
+        width, height, tile_size, num_bombs = custom_mode(width, height, num_bombs, 0, 0)
+    except ValueError as e:
+        parser.error("--custom must be of the form WIDTHxHEIGHTxBOMBS on a valid board: %s" % e)
+    return "%s %dx%d %d" % (CUSTOM, width, height, num_bombs), width, height, num_bombs
+
+def main(argv = None):
+    """Plays the games selected by the command line arguments ARGV, and streams the results of
+    each player as JSON lines to stdout."""
+    parser = argparse.ArgumentParser(description = "Play automated minesweeper players against each other.")
+    parser.add_argument("--player", action = "append", help = "a player to evaluate, as module:callable; "
+                        "can be given several times (default: harness:BasicPlayer)")
+    parser.add_argument("--games", type = int, default = GAMES, help = "number of games per player")
+    parser.add_argument("--mode", choices = list(MODES), default = "Medium", help = "the board to play on")
+    parser.add_argument("--custom", help = "a custom board to play on instead, such as 30x16x99")
+    parser.add_argument("--no-guess", action = "store_true", help = "play boards that can be solved without guessing")
+    parser.add_argument("--workers", type = int, default = os.cpu_count(), help = "number of processes")
+    parser.add_argument("--chunk", type = int, default = CHUNK_SIZE, help = "number of games in each unit of work")
+    parser.add_argument("--seed", type = int, default = SEED, help = "seed of the first game")
+    args = parser.parse_args(argv)
+    players = args.player or ["harness:BasicPlayer"]
+    # Fail before starting any process if a player cannot be loaded
+    for name in players:
+        try:
+            load_player(name)
+        except (ValueError, ImportError, AttributeError) as e:
+            parser.error("cannot load player %s: %s" % (name, e))
+    config, width, height, num_bombs = _configuration(parser, args)
+
+    reports = {name: Report() for name in players}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as executor:
+        boards = [executor.submit(generate_chunk, width, height, num_bombs, args.seed + offset,
+                                  min(args.chunk, args.games - offset), args.no_guess)
+                  for offset in range(0, args.games, args.chunk)]
+        # Each chunk of boards is played by every player as soon as it has been generated
+        futures = {}
+        for future in as_completed(boards):
+            for name in players:
+                futures[executor.submit(play_chunk, name, width, height, num_bombs, future.result())] = name
+        for future in as_completed(futures):
+            name = futures[future]
+            report = reports[name]
+            report.merge(future.result())
+            line = {"player": name, "config": config, "width": width, "height": height,
+                    "num_bombs": num_bombs, "no_guess": args.no_guess, "done": report.games == args.games,
+                    "elapsed_s": time.perf_counter() - start}
+            line.update(report.to_dict())
+            print(json.dumps(line))
+            sys.stdout.flush()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,395 @@
+"""This module contains the HintEngine class, which finds the safest tile for the player to
+expose next, using only what the player can see: the numbers on the exposed tiles.
+
+The unexposed tiles that border an exposed number make up the frontier. The frontier splits
+into independent components, where two tiles are in the same component if they share a number.
+Within a component, tiles that border exactly the same numbers are interchangeable, so the
+enumeration only decides how many bombs each such group of tiles holds. The layouts of each
+component are combined with the total number of bombs to find the chance that each tile is a
+bomb. Components with too many layouts to enumerate are sampled instead, which gives
+approximate chances.
+
+The frontier is updated from the tiles each move exposes, rather than rescanning the board, and
+the enumeration of a component is cached until a move changes it. Tiles that have been proven
+to be bombs or safe are taken out of the frontier, since later moves cannot change them, which
+keeps the components small as the game goes on.
+"""
+
+import functools
+import math
+import random
+from board import EXPOSED, FLAGGED, COUNT_SHIFT
+from solver import neighbor_table
+
+"""Global Variables:
+
+NODE_LIMIT: The number of steps the exact enumeration of a component takes before it gives up
+and samples the component instead
+SAMPLES: The number of layouts sampled for a component that is too large to enumerate
+SAMPLE_NODES: The number of steps a single sample takes before it gives up
+"""
+
+NODE_LIMIT = 5000
+SAMPLES = 100
+SAMPLE_NODES = 50
+
+class Component:
+    """A Component object stores the layouts of the bombs in one component of the frontier.
+
+    cells -- a list of the indices of the tiles in the component
+    groups -- a list of lists of positions in self.cells; the tiles in each group border exactly
+    the same numbers
+    layouts -- a dict mapping a number of bombs to the number of layouts of the component
+    with that many bombs
+    mine_counts -- a dict mapping a number of bombs to a list with one entry per group; the
+    total number of bombs in the group over all of those layouts
+    exact -- a boolean that is True if every layout was enumerated, and False if they were sampled
+    """
+    __slots__ = ("cells", "groups", "layouts", "mine_counts", "exact")
+
+    def __init__(self, cells, groups):
+        """Create an empty Component of the tiles at the indices in the list CELLS, split into GROUPS."""
+        self.cells = cells
+        self.groups = groups
+        self.layouts = {}
+        self.mine_counts = {}
+        self.exact = True
+
+    def add_layouts(self, bombs, weight):
+        """Adds WEIGHT layouts of the bombs, in which the i-th group holds BOMBS[i] bombs."""
+        k = sum(bombs)
+        if k not in self.layouts:
+            self.layouts[k] = 0
+            self.mine_counts[k] = [0] * len(self.groups)
+        self.layouts[k] += weight
+        counts = self.mine_counts[k]
+        for i, value in enumerate(bombs):
+            counts[i] += value * weight
+
+    def clear(self):
+        """Removes every layout."""
+        self.layouts = {}
+        self.mine_counts = {}
+
+class HintEngine:
+    """A HintEngine object keeps track of the frontier of a Board as it is played, and works out
+    the chance that each unexposed tile is a bomb.
+
+    board -- the Board being played
+    neighbors -- the neighbor table of the board
+    frontier -- a set of the indices of the unexposed tiles that border an exposed tile
+    constraints -- a set of the indices of the exposed tiles that border an unexposed tile
+    num_exposed -- the number of exposed tiles
+    known_mines -- a set of the indices of the tiles on the frontier that are certainly bombs
+    known_safe -- a set of the indices of the tiles on the frontier that are certainly safe, but
+    have not been exposed yet
+    rng -- a random.Random object used to sample the layouts of components that are too large to
+    enumerate. It is separate from board.rng, so that asking for hints never changes the board.
+    """
+    def __init__(self, board, seed = None):
+        """Create a HintEngine for BOARD.
+
+        board -- A Board; the board to give hints for
+        seed -- An integer; the seed of self.rng, or None to choose one at random
+        """
+        self.board = board
+        self.rng = random.Random(seed)
+        self.neighbors = neighbor_table(board.width, board.height)
+        self.frontier = set()
+        self.constraints = set()
+        self.num_exposed = 0
+        self.known_mines = set()
+        self.known_safe = set()
+        # The components enumerated by the last call to self.probabilities
+        self._components = {}
+        exposed = [i for i in range(len(board.cells)) if board.cells[i] & EXPOSED]
+        if exposed:
+            self.update(exposed)
+
+    def update(self, revealed):
+        """Updates the frontier after the tiles at the indices in REVEALED have been exposed.
+
+        Args:
+            revealed -- A list of integers; the indices of the newly exposed tiles
+        """
+        cells, neighbors = self.board.cells, self.neighbors
+        frontier, constraints = self.frontier, self.constraints
+        self.num_exposed += len(revealed)
+        for index in revealed:
+            frontier.discard(index)
+            self.known_safe.discard(index)
+            if cells[index] >> COUNT_SHIFT:
+                constraints.add(index)
+        changed = set()
+        for index in revealed:
+            if index in constraints:
+                changed.add(index)
+            for n in neighbors[index]:
+                if not cells[n] & EXPOSED:
+                    frontier.add(n)
+                elif n in constraints:
+                    if all(cells[m] & EXPOSED for m in neighbors[n]):
+                        # Every tile around this number has been exposed
+                        constraints.discard(n)
+                    else:
+                        changed.add(n)
+        self._propagate(changed)
+
+    def _propagate(self, changed):
+        """Applies the single point rules to the numbers at the indices in the set CHANGED, and to
+        any numbers they affect in turn: if a number needs no more bombs, its unknown neighbors
+        are safe, and if it needs as many bombs as it has unknown neighbors, they are all bombs.
+        This is cheap, and keeps the components that have to be enumerated small."""
+        cells, neighbors = self.board.cells, self.neighbors
+        known_mines, known_safe, constraints = self.known_mines, self.known_safe, self.constraints
+        while changed:
+            n = changed.pop()
+            unknown = []
+            need = cells[n] >> COUNT_SHIFT
+            for m in neighbors[n]:
+                if m in known_mines:
+                    need -= 1
+                elif not cells[m] & EXPOSED and m not in known_safe:
+                    unknown.append(m)
+            if not unknown or 0 < need < len(unknown):
+                continue
+            known = known_safe if need == 0 else known_mines
+            known.update(unknown)
+            # The numbers around the newly known tiles might now be able to make deductions
+            for m in unknown:
+                changed.update(c for c in neighbors[m] if c in constraints)
+
+    def probabilities(self):
+        """Returns the chance that each unexposed tile is a bomb.
+
+        Returns:
+            A tuple of the form (a dict mapping the index of each tile on the frontier to its
+            chance of being a bomb, the chance that any other unexposed tile is a bomb)
+        """
+        board = self.board
+        components = self._find_components()
+        unknown = len(board.cells) - self.num_exposed
+        interior = unknown - len(self.frontier)
+        bombs = board.num_bombs - len(self.known_mines)
+
+        # totals[j][K] is the number of layouts of every component other than j with K bombs
+        distributions = [component.layouts for component in components]
+        totals = []
+        for j in range(len(components)):
+            total = {0: 1}
+            for other in distributions[:j] + distributions[j + 1:]:
+                total = _convolve(total, other)
+            totals.append(total)
+        everything = _convolve(totals[0], distributions[0]) if components else {0: 1}
+
+        # Every layout of the frontier with K bombs can be completed in comb(interior, bombs - K) ways.
+        # Each of these is worked out only once, since on large boards they take a while.
+        @functools.cache
+        def completions(k):
+            return math.comb(interior, bombs - k) if 0 <= bombs - k <= interior else 0
+        weight = sum(count * completions(k) for k, count in everything.items())
+        if weight == 0:
+            return {}, 0.0
+
+        chances = dict.fromkeys(self.known_mines, 1.0)
+        chances.update(dict.fromkeys(self.known_safe, 0.0))
+        exact = all(component.exact for component in components)
+        for j, component in enumerate(components):
+            mine_weight = [0] * len(component.groups)
+            for k, layouts in component.layouts.items():
+                # The number of ways to complete a layout of this component with k bombs
+                ways = sum(count * completions(k + other) for other, count in totals[j].items())
+                if ways:
+                    for i, count in enumerate(component.mine_counts[k]):
+                        mine_weight[i] += count * ways
+            for i, group in enumerate(component.groups):
+                # The bombs of a group are equally likely to be on any of its tiles. The weights
+                # can be far too large for a float, so they are divided in a single step, which
+                # Python does exactly for integers of any size.
+                chance = mine_weight[i] / (len(group) * weight)
+                for position in group:
+                    chances[component.cells[position]] = chance
+                # Remember the tiles that are certainly bombs or safe. The weights are integers,
+                # so this is only done when they come from an exact enumeration.
+                if exact and mine_weight[i] in (0, len(group) * weight):
+                    known = self.known_safe if mine_weight[i] == 0 else self.known_mines
+                    known.update(component.cells[position] for position in group)
+        interior_bombs = sum(count * completions(k) * (bombs - k) for k, count in everything.items())
+        interior_chance = interior_bombs / (weight * interior) if interior else 1.0
+        return chances, interior_chance
+
+    def hint(self):
+        """Finds the unflagged tile that is least likely to be a bomb. Tiles on the frontier are
+        preferred over other tiles that are just as likely, since exposing them gives the
+        player more information.
+
+        Returns:
+            A tuple of the form (index of the tile, chance that it is a bomb), or None if the
+            first move has not been made or there is nothing left to expose
+        """
+        board = self.board
+        if self.num_exposed == 0 or board.game_over:
+            return None
+        cells = board.cells
+        chances, interior_chance = self.probabilities()
+        best, best_chance = None, 2.0
+        for index in sorted(chances):
+            if chances[index] < best_chance and not cells[index] & FLAGGED:
+                best, best_chance = index, chances[index]
+        if interior_chance < best_chance:
+            frontier = self.frontier
+            for index in range(len(cells)):
+                if not cells[index] & (EXPOSED | FLAGGED) and index not in frontier:
+                    return index, interior_chance
+        if best is None:
+            return None
+        return best, best_chance
+
+    def _find_components(self):
+        """Splits the frontier into components, and enumerates the layouts of each one. Components
+        that have not changed since the last call are reused.
+
+        Returns:
+            A list of Components
+        """
+        cells, neighbors = self.board.cells, self.neighbors
+        frontier, constraints = self.frontier, self.constraints
+        known_mines = self.known_mines
+        # Tiles that are already known are left out, as if they had been exposed
+        seen = known_mines | self.known_safe
+        components = {}
+        for start in frontier:
+            if start in seen:
+                continue
+            # Breadth first search alternating between tiles and the numbers that border them.
+            # The tiles are kept in the order they are found, which keeps the numbers that
+            # share tiles close together and makes the enumeration prune early.
+            seen.add(start)
+            order = [start]
+            numbers = set()
+            for index in order:
+                for n in neighbors[index]:
+                    if n in constraints and n not in numbers:
+                        numbers.add(n)
+                        for m in neighbors[n]:
+                            if m not in seen and not cells[m] & EXPOSED:
+                                seen.add(m)
+                                order.append(m)
+            # The number of bombs each number still needs, once the known bombs are removed
+            needs = tuple(sorted((n, (cells[n] >> COUNT_SHIFT) - sum(1 for m in neighbors[n] if m in known_mines))
+                                 for n in numbers))
+            key = (frozenset(order), needs)
+            component = self._components.get(key)
+            if component is None:
+                component = self._enumerate(order, dict(needs))
+            components[key] = component
+        self._components = components
+        return list(components.values())
+
+    def _enumerate(self, order, needs):
+        """Returns a Component with the layouts of bombs on the tiles at the indices in the list ORDER
+        that agree with NEEDS, a dict mapping the index of each exposed tile that borders them
+        to the number of bombs it needs among them. The layouts are
+        enumerated by backtracking over the groups of the component, unless that takes more than
+        NODE_LIMIT steps, in which case they are sampled."""
+        cells, neighbors = self.board.cells, self.neighbors
+        numbers = list(needs)
+        number_ids = {n: i for i, n in enumerate(numbers)}
+        # Group the tiles that border exactly the same numbers
+        group_ids = {}
+        groups = []
+        group_numbers = []
+        for position, index in enumerate(order):
+            key = tuple(number_ids[n] for n in neighbors[index] if n in number_ids)
+            if key not in group_ids:
+                group_ids[key] = len(groups)
+                groups.append([])
+                group_numbers.append(key)
+            groups[group_ids[key]].append(position)
+        component = Component(order, groups)
+        sizes = [len(group) for group in groups]
+        # For each number, how many more bombs and unassigned tiles it needs
+        need = [needs[n] for n in numbers]
+        remaining = [0] * len(numbers)
+        for i, key in enumerate(group_numbers):
+            for c in key:
+                remaining[c] += sizes[i]
+        bombs = [0] * len(groups)
+
+        def assign(i, value):
+            """Puts VALUE bombs in the i-th group, and returns whether every number can still be
+            satisfied."""
+            bombs[i] = value
+            possible = True
+            for c in group_numbers[i]:
+                need[c] -= value
+                remaining[c] -= sizes[i]
+                if need[c] < 0 or need[c] > remaining[c]:
+                    possible = False
+            return possible
+
+        def unassign(i):
+            """Undoes the assignment of the i-th group."""
+            for c in group_numbers[i]:
+                need[c] += bombs[i]
+                remaining[c] += sizes[i]
+
+        nodes = [0]
+        def search(i, weight):
+            """Enumerates every layout of the groups from the i-th on, given that the earlier
+            groups can be laid out in WEIGHT ways. Returns False if it ran out of steps."""
+            if i == len(groups):
+                component.add_layouts(bombs, weight)
+                return True
+            nodes[0] += 1
+            if nodes[0] > NODE_LIMIT:
+                return False
+            for value in range(sizes[i] + 1):
+                finished = True
+                if assign(i, value):
+                    finished = search(i + 1, weight * math.comb(sizes[i], value))
+                unassign(i)
+                if not finished:
+                    return False
+            return True
+
+        if search(0, 1):
+            return component
+
+        # Too many layouts to enumerate: find random layouts by backtracking in a random order.
+        # The layouts found so far are kept in case no sample succeeds.
+        partial = (component.layouts, component.mine_counts)
+        component.clear()
+        component.exact = False
+        rng = self.rng
+        for sample in range(SAMPLES):
+            nodes[0] = 0
+            def sample_search(i, weight):
+                """Finds one random layout of the groups from the i-th on, and adds it."""
+                if i == len(groups):
+                    component.add_layouts(bombs, weight)
+                    return True
+                nodes[0] += 1
+                if nodes[0] > SAMPLE_NODES:
+                    return False
+                values = list(range(sizes[i] + 1))
+                rng.shuffle(values)
+                for value in values:
+                    found = assign(i, value) and sample_search(i + 1, weight * math.comb(sizes[i], value))
+                    unassign(i)
+                    if found:
+                        return True
+                return False
+            sample_search(0, 1)
+        if not component.layouts:
+            component.layouts, component.mine_counts = partial
+        return component
+
+def _convolve(a, b):
+    """Returns the distribution of the total number of bombs of two independent parts of the
+    board, given A and B, dicts mapping a number of bombs to a number of layouts."""
+    result = {}
+    for k, count in a.items():
+        for l, other in b.items():
+            result[k + l] = result.get(k + l, 0) + count * other
+    return result
@@ -1,76 +1,153 @@
+import time
+# Taken before anything else is imported, so that --startup-time includes the imports
+START_TIME = time.perf_counter()
+import argparse
+import os
 import sys
-from canvas import *
-from tiles import *
-from utils import *
-from dialog import *
-from stopwatch import *
-from PyQt6.QtGui import QFont
+import traceback
+from PyQt6.QtWidgets import QApplication, QMainWindow, QDialog, QGraphicsScene, QLabel, QWidget, \
+    QComboBox, QCheckBox, QHBoxLayout, QVBoxLayout, QGridLayout
+from PyQt6.QtGui import QFont, QPixmap
+from PyQt6.QtCore import Qt, QEvent, QTimer
+from board import NO_SEED, new_seed
+from canvas import Canvas
+from dialog import WinDialog, LoseDialog, CustomDialog
+from stopwatch import StopWatch, REFRESH_INTERVAL
+from pool import BoardPool
+from replay import MoveLog
+from scores import ScoreStore
+from snapshot import Snapshot, save_snapshot, load_snapshot
+from modes import MODES, CUSTOM, custom_mode, score_key
+from view import BoardView
 
 """Global Variables:
 
-MODES: Contains three different difficulties "Easy", "Medium" and "Hard". Each tuple is of the form
-(number of tiles wide, number of tiles high, tile size, number of bombs)
 ICON_SIZE: Controls the size of all images displayed in the UI
 TEXT_SIZE: Controls the size of the font of text in the UI
 SCORES_FILE_PATH: The filepath to the high_scores.txt file
 FLAG_FILE_PATH: The filepath to the flag icon (to be used for displaying the number of flagged tiles)
 TROPHY_FILE_PATH: The filepath to the trophy icon (to be used to display user's best score)
-HIGH_SCORES: The current user's high scores, that were stored in SCORES_FILE_PATH
+POOL_FILE_PATH: The filepath to save the boards that are solvable without guessing to, so that they
+are ready the next time the game is started
+GAMES_FILE_PATH: The filepath to record every move of every game to (see "replay.py")
+HISTORY_FILE_PATH: The filepath to record every won game to (see "scores.py")
+SNAPSHOT_FILE_PATH: The filepath to save the game in progress to when the window is closed, so that
+it can be resumed the next time the game is started (see "snapshot.py")
 MAX_TIME: The timeout for the timer. This is the worst possible time a player can take. 
+DEFAULT_MODE: The difficulty of the first game, unless another one is chosen on the command line or
+a game is resumed
+CUSTOM_BOARD: The custom board offered the first time the user selects CUSTOM, of the form
+(number of tiles wide, number of tiles high, number of bombs)
+DEFAULT_VIEW_SIZE: The size in pixels the tiles of a custom first game are fitted to, since the
+window has not been shown yet when it is set up. This is the size of the "Medium" board.
 """
 
-MODES = {
-    "Easy": (10, 8, 50, 10),
-    "Medium" : (18, 14, 46, 40),
-    "Hard" : (24, 20, 32, 99),
-}
 ICON_SIZE = 30
 TEXT_SIZE = 15
 SCORES_FILE_PATH = "cache/high_scores.txt"
 FLAG_FILE_PATH = "images/flag.png"
 TIME_FILE_PATH = "images/hourglass.png"
 TROPHY_FILE_PATH = "images/trophy.png"
-HIGH_SCORES = read_high_scores(SCORES_FILE_PATH)
+POOL_FILE_PATH = "cache/board_pool.bin"
+GAMES_FILE_PATH = "cache/games.log"
+HISTORY_FILE_PATH = "cache/scores.log"
+SNAPSHOT_FILE_PATH = "cache/snapshot.bin"
 MAX_TIME = 999
+DEFAULT_MODE = "Medium"
+CUSTOM_BOARD = (30, 16, 99)
+DEFAULT_VIEW_SIZE = (18 * 46, 14 * 46)
 
 class MainWindow(QMainWindow):
     """A MainWindow object that contains the minesweeper game along with
     a timer, difficulty-setter, and a win/lose dialog box. 
     
-    mode -- the difficulty; "Easy", "Medium" or "Hard".
+    mode -- the difficulty; "Easy", "Medium", "Hard" or CUSTOM.
+    custom -- the last custom board chosen by the user, of the form (number of tiles wide,
+    number of tiles high, number of bombs)
     dialog_displayed -- a boolean that checks if the dialog box is displayed or not. 
     This was used to fix a bug, where when the dialog box was displayed, the user could click
     on the minesweeper game to make the dialog box redraw itself. 
     total_bombs -- the total number of bombs in the game
-    scene -- A canvas object containing the minesweeper game
-    view -- A QGraphicsView object, which renders self.scene
-    scores -- the user's highest scores stored as a dictionary, with times for each category
+    scene -- A canvas object containing the minesweeper game. None until the window has been
+    painted for the first time, since the first game is only set up then.
+    view -- A BoardView object, which renders self.scene
+    scores -- A ScoreStore object, which keeps the user's best time for each category and the
+    history of their won games
     watch -- A stopwatch object to track how much time the user has elapsed since the start
     timer_active -- A boolean which checks if self.watch is currently running
     flag_count -- A QLabel object, which displays the number of currently flagged cells
     difficulty_box -- A QComboBox object, which contains the different difficulty modes for 
     the user to select from
+    no_guess_box -- A QCheckBox object, which the user checks to play boards that can be 
+    solved without guessing
+    pool -- A BoardPool object, which generates boards that can be solved without guessing
+    in the background for each of the difficulties. None until the first game is set up.
+    move_log -- A MoveLog object, which records every game to GAMES_FILE_PATH
+    seed_label -- A QLabel object, which displays the seed of the current game so that it can
+    be copied and played again. No seed is shown for a board taken from self.pool, since its
+    seed did not place its bombs.
+    startup_time -- the time.perf_counter() at which the application started. If it is not None,
+    the time taken to first paint the window and the board is printed, and the window is closed.
     """
-    def __init__(self, mode):
-        """Create a MainWindow object with difficulty MODE
+    def __init__(self, mode = None, seed = None, refresh_interval = REFRESH_INTERVAL, startup_time = None,
+                 custom = None, no_guess = False):
+        """Create a MainWindow object whose first game is played in MODE, with SEED if it is given;
+        later games get random seeds. If neither MODE nor SEED is given, the game that was in
+        progress when the window was last closed is resumed, if there is one, and otherwise the
+        first game is played in DEFAULT_MODE. The time shown by the watch is refreshed every
+        REFRESH_INTERVAL milliseconds. The board of the first game is only set up once the window
+        has been painted, so that the window appears as soon as possible.
         
-        mode -- the desired difficulty; "Easy", "Medium" or "Hard". 
+        mode -- the desired difficulty; "Easy", "Medium", "Hard", CUSTOM or None
+        seed -- An integer; the seed of the first game, or None to choose one at random
+        refresh_interval -- An integer; the time in milliseconds between refreshes of the watch
+        startup_time -- A float; the time.perf_counter() at which the application started, to
+        measure the time taken to first paint the board from, or None
+        custom -- A tuple of the form (number of tiles wide, number of tiles high, number of bombs);
+        the board of a CUSTOM first game, or None for CUSTOM_BOARD
+        no_guess -- A boolean; whether or not the first game can be solved without guessing, if it
+        is not resumed
         """
         super().__init__()
         self.setWindowTitle("Minesweeper")
-        self.mode = mode
         self.dialog_displayed = False
-        width, height, tile_size, self.total_bombs = MODES[mode]
-        self.scene = Canvas(width, height, tile_size, self.total_bombs)
-        self.view = QGraphicsView(self.scene)
-        self.scores = read_high_scores(SCORES_FILE_PATH)
-
-        # Vectorizes graphics
-        self.view.setRenderHint(QPainter.RenderHint.Antialiasing)        
-        self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.custom = CUSTOM_BOARD if custom is None else custom
+        snapshot = load_snapshot(SNAPSHOT_FILE_PATH) if seed is None and mode is None else None
+        if snapshot is not None and snapshot.mode not in MODES and snapshot.mode != CUSTOM:
+            snapshot = None
+        board = None
+        if snapshot is not None:
+            mode, board = snapshot.mode, snapshot.board
+            if mode == CUSTOM:
+                self.custom = (board.width, board.height, board.num_bombs)
+                width, height, tile_size, self.total_bombs = custom_mode(*self.custom, *DEFAULT_VIEW_SIZE)
+            else:
+                width, height, tile_size, self.total_bombs = MODES[mode]
+        else:
+            mode = DEFAULT_MODE if mode is None else mode
+            if mode == CUSTOM:
+                width, height, tile_size, self.total_bombs = custom_mode(*self.custom, *DEFAULT_VIEW_SIZE)
+            else:
+                width, height, tile_size, self.total_bombs = MODES[mode]
+        self.mode = mode
+        self.startup_time = startup_time
+        self.scene = None
+        self.pool = None
+        self.move_log = MoveLog(open(GAMES_FILE_PATH, "ab"))
+        no_guess = snapshot.no_guess if snapshot is not None else no_guess
+        # The seed is chosen now, rather than by the Canvas, so that it can be shown straight away
+        first_seed = board.seed if board is not None else new_seed() if seed is None else seed
+        # The arguments of the first game, which is set up once the window has been painted (see
+        # self.eventFilter). Until then, an empty scene the size of the board sizes the view.
+        self._first_game = (width, height, tile_size, no_guess, seed, first_seed, board)
+        self.view = BoardView(QGraphicsScene(0, 0, width * tile_size, height * tile_size, self))
+        self.view.viewport().installEventFilter(self)
+        self.scores = ScoreStore(SCORES_FILE_PATH, HISTORY_FILE_PATH)
 
-        self.watch = StopWatch(MAX_TIME, TIME_FILE_PATH, ICON_SIZE, TEXT_SIZE)
+        self.watch = StopWatch(MAX_TIME, TIME_FILE_PATH, ICON_SIZE, TEXT_SIZE, refresh_interval)
+        if snapshot is not None:
+            # The watch starts again with the next click
+            self.watch.set_time_ms(snapshot.elapsed_ms)
         # Don't start the timer immediately
         self.timer_active = False 
 
@@ -81,7 +158,7 @@ class MainWindow(QMainWindow):
         font = QFont()
         font.setPointSize(TEXT_SIZE)
         self.flag_count = QLabel()
-        self.flag_count.setText("0/" + str(self.total_bombs))
+        self.flag_count.setText(str(board.num_flagged if board is not None else 0) + "/" + str(self.total_bombs))
         self.flag_count.setFont(font)
 
         # The flag_widget consists of the flag icon next to the flag count
@@ -97,13 +174,28 @@ class MainWindow(QMainWindow):
         font.setPointSize(TEXT_SIZE - 2)
         self.difficulty_box.setFont(font)
         self.difficulty_box.setMaximumWidth(120)
-        self.difficulty_box.addItems(MODES.keys())
-        self.difficulty_box.setCurrentIndex(list(MODES.keys()).index(mode))
-        self.difficulty_box.currentTextChanged.connect(self.difficulty_setter)
+        self.difficulty_box.addItems(list(MODES.keys()) + [CUSTOM])
+        self.difficulty_box.setCurrentText(mode)
+        # Activated rather than changed, so that choosing CUSTOM again asks for another custom board
+        self.difficulty_box.textActivated.connect(self.difficulty_setter)
+
+        # The seed can be selected and copied, to play the same board again with --seed
+        self.seed_label = QLabel()
+        self.seed_label.setFont(font)
+        self.seed_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self._show_seed(first_seed)
+
+        # Starts a new game whenever the user switches between regular and no guessing boards
+        self.no_guess_box = QCheckBox("No guessing")
+        self.no_guess_box.setFont(font)
+        self.no_guess_box.setChecked(no_guess)
+        self.no_guess_box.toggled.connect(self.reset_game)
 
         # Sets the layout of all the widgets 
         button_layout = QGridLayout()
         button_layout.setSpacing(0)
+        button_layout.addWidget(self.seed_label, 0, 2, Qt.AlignmentFlag.AlignLeft)
+        button_layout.addWidget(self.no_guess_box, 0, 3, Qt.AlignmentFlag.AlignRight)
         button_layout.addWidget(self.difficulty_box, 0, 4, Qt.AlignmentFlag.AlignRight)
         button_layout.addWidget(self.watch, 0, 5, Qt.AlignmentFlag.AlignCenter)
         button_layout.addWidget(flag_widget, 0, 6, Qt.AlignmentFlag.AlignLeft)
@@ -115,10 +207,64 @@ class MainWindow(QMainWindow):
         interface = QWidget()
         interface.setLayout(full_layout)
         self.setCentralWidget(interface)
+
+    def eventFilter(self, watched, event):
+        """Sets up the first game once the view has been painted for the first time, and reports
+        the startup time once the board of the first game has been painted, if self.startup_time
+        is set. Events are never filtered out.
+
+        Args:
+            watched -- A QObject; the object EVENT was sent to
+            event -- A QEvent to handle
+        """
+        if event.type() == QEvent.Type.Paint and watched is self.view.viewport():
+            if self._first_game is not None:
+                first_game, self._first_game = self._first_game, None
+                self._window_painted = time.perf_counter()
+                # Waits for the window to finish painting before the board is set up
+                QTimer.singleShot(0, lambda: self._start_first_game(*first_game))
+            elif self.scene is not None:
+                self.view.viewport().removeEventFilter(self)
+                if self.startup_time is not None:
+                    QTimer.singleShot(0, self._report_startup_time)
+        return super().eventFilter(watched, event)
+
+    def _start_first_game(self, width, height, tile_size, no_guess, seed, first_seed, board):
+        """Sets up the first game, with the arguments chosen in self.__init__, and starts filling
+        self.pool with boards. The game is not set up if a new one was started in the meantime.
+
+        Args:
+            width -- An integer; number of tiles wide
+            height -- An integer; number of tiles high
+            tile_size -- An integer; the size of a tile
+            no_guess -- A boolean; whether or not the board should be solvable without guessing
+            seed -- An integer; the seed given on the command line, or None
+            first_seed -- An integer; the seed of the game, or None if the seed of the resumed board
+            did not place its bombs
+            board -- A Board; the game resumed from the snapshot, or None
+        """
+        self.pool = BoardPool(MODES.values(), path = POOL_FILE_PATH)
+        self.pool.start()
+        if board is not None:
+            # The snapshot is only resumed once; closing the window saves the game again
+            os.remove(SNAPSHOT_FILE_PATH)
+        if self.scene is not None:
+            return
+        # A ready-made board would not match the seed, so seeded games never use the pool
+        self.scene = Canvas(width, height, tile_size, self.total_bombs, no_guess,
+                            pool = self.pool if seed is None else None, recorder = self.move_log,
+                            seed = first_seed, board = board)
+        self.view.show_scene(self.scene, self.mode != CUSTOM)
+
+    def _report_startup_time(self):
+        """Prints the time taken to first paint the window and the board, and closes the window."""
+        print("Window painted after %.0f ms, board painted after %.0f ms"
+              % ((self._window_painted - self.startup_time) * 1000, (time.perf_counter() - self.startup_time) * 1000))
+        self.close()
     
     def flag_count_update(self):
         """Updates the text for the number of flagged cells"""
-        self.flag_count.setText(str(Tile.num_flagged_cells) + "/" + str(self.total_bombs))
+        self.flag_count.setText(str(self.scene.num_flagged_cells()) + "/" + str(self.total_bombs))
         self.flag_count.update()
     
     def _customize_win_dialog(self):
@@ -128,18 +274,17 @@ class MainWindow(QMainWindow):
         Returns:
             A WinDialog object containing their current and best times
         """
-        cur_time = self.watch.get_time()
-        best_time = HIGH_SCORES[self.mode]
+        cur_time = self.watch.get_time_ms()
+        best_time = self.scores.best(self._score_key())
         # If their cur_time is greater than their best_time, their best_time is still best_time
         if cur_time >= best_time:
             return WinDialog(cur_time, best_time, TIME_FILE_PATH, TROPHY_FILE_PATH)
         return WinDialog(cur_time, cur_time, TIME_FILE_PATH, TROPHY_FILE_PATH)
     
     def _save_best_time(self):
-        """Updates the HIGH_SCORES dictionary and saves the dictionary to SCORES_FILE_PATH"""
-        cur_time = self.watch.get_time()
-        HIGH_SCORES[self.mode] = min(cur_time, HIGH_SCORES[self.mode])
-        write_high_scores(HIGH_SCORES, SCORES_FILE_PATH)
+        """Records the won game in self.scores, which saves the time if it is a new best"""
+        board = self.scene.board
+        self.scores.record(self._score_key(), self.watch.get_time_ms(), board.seed, board.three_bv())
         
     def mousePressEvent(self, event):
         """Handler for mouse press events. Mouse events are handled here in order to reset the timer
@@ -148,16 +293,22 @@ class MainWindow(QMainWindow):
         Args:
             event -- A QGraphicsSceneMouseEvent to handle
         """
+        # The board is not set up until the window has been painted
+        if self.scene is None:
+            return
         # Every time the user clicks something, update the flag count
         self.flag_count_update()
         # Start the timer if the first move has been made, and the timer
         # has not already been started
-        if not self.timer_active and Tile.first_move_made:
+        if not self.timer_active and self.scene.first_move_made():
             self.watch.start()
             self.timer_active = True
+            # The first move may have taken the board from the pool, which replaces its seed
+            self._show_seed(self.scene.board.seed)
         # Display dialog if the game is over and dialog has not been displayed yet
         if self.scene.game_finished() and not self.dialog_displayed:
-            # Stop watch and disable the difficulty chooser once game ends
+            # Stop watch and disable the difficulty chooser once game ends. The time is read
+            # from the clock, so it is exact to the millisecond however often the watch is shown.
             self.watch.stop()
             self.difficulty_box.setEnabled(False)
     
@@ -166,7 +317,7 @@ class MainWindow(QMainWindow):
                 self.dialog = self._customize_win_dialog()
                 self._save_best_time()
             else:
-                self.dialog = LoseDialog(HIGH_SCORES[self.mode], TIME_FILE_PATH, TROPHY_FILE_PATH)
+                self.dialog = LoseDialog(self.scores.best(self._score_key()), TIME_FILE_PATH, TROPHY_FILE_PATH)
             # If the user wants to try again, reset the game and allow them to try again.
             # Otherwise, allow them to view the endgame_sequence, and they can choose another
             # difficulty from the difficulty chooser. 
@@ -175,38 +326,148 @@ class MainWindow(QMainWindow):
             self.dialog.accepted.connect(self.reset_game)
             self.dialog.rejected.connect(self.allow_endgame_sequence)
     
+    def keyPressEvent(self, event):
+        """Handler for key press events. Pressing H highlights the tile that is least likely to
+        be a bomb. If the hint cannot be worked out, it is reported on stderr and no hint is
+        shown, since an exception raised here would abort the application.
+
+        Args:
+            event -- A QKeyEvent to handle
+        """
+        if event.key() == Qt.Key.Key_H and self.scene is not None:
+            try:
+                self.scene.show_hint()
+            except Exception:
+                traceback.print_exc()
+        else:
+            super().keyPressEvent(event)
+
+    def _show_seed(self, seed):
+        """Shows SEED, the seed of the current game, or that it has none if SEED is None."""
+        self.seed_label.setText("Seed: " + ("none" if seed is None else str(seed)))
+
+    def _score_key(self):
+        """Returns the name the best time of the current game is saved under in self.scores."""
+        return score_key(self.mode, self.scene.width, self.scene.height, self.total_bombs)
+
+    def _mode_config(self, mode):
+        """Returns the board of MODE, as a tuple of the form (number of tiles wide, number of
+        tiles high, tile size, number of bombs). The tiles of a custom board are sized to fit
+        the view, if they can.
+
+        Args:
+            mode -- the difficulty; "Easy", "Medium", "Hard" or CUSTOM
+        """
+        if mode == CUSTOM:
+            viewport = self.view.viewport()
+            return custom_mode(*self.custom, viewport.width(), viewport.height())
+        return MODES[mode]
+
     def difficulty_setter(self, new_mode):
         """Switches the difficulty of the game by setting it to NEW_MODE and starts
-        a new blank game in that new mode.
+        a new blank game in that new mode. Selecting CUSTOM asks the user for the size
+        of the board and the number of bombs first, even if the current game is already
+        custom, and keeps the current game if they cancel. Selecting the current mode
+        otherwise keeps the current game.
         
         Args:
             new_mode -- the new difficulty that the user selects
         """
+        if new_mode == CUSTOM:
+            dialog = CustomDialog(*self.custom, parent = self)
+            if dialog.exec() != QDialog.DialogCode.Accepted:
+                # Show the current mode again, without starting a new game. Setting the text
+                # from here does not activate the box.
+                self.difficulty_box.setCurrentText(self.mode)
+                return
+            self.custom = dialog.values()
+        elif new_mode == self.mode:
+            return
+        self._new_game(new_mode)
+
+    def _new_game(self, mode):
+        """Starts a new blank game in MODE.
+
+        Args:
+            mode -- the difficulty; "Easy", "Medium", "Hard" or CUSTOM
+        """
         self.timer_active = False 
         self.dialog_displayed = False
         self.watch.reset()
-        width, height, tile_size, self.total_bombs = MODES[new_mode]
-        # Re-initializing the canvas automatically resets the Tile.first_move_made
-        # and the Tile.num_flagged_cells attributes 
-        self.scene = Canvas(width, height, tile_size, self.total_bombs)
-        self.mode = new_mode
+        # The end of game sequence of the last game must not keep changing its board
+        if self.scene is not None:
+            self.scene.stop_animation()
+        width, height, tile_size, self.total_bombs = self._mode_config(mode)
+        # Re-initializing the canvas creates a new board, which resets the first move
+        # and the number of flagged cells
+        self.scene = Canvas(width, height, tile_size, self.total_bombs, self.no_guess_box.isChecked(),
+                            self.pool, recorder = self.move_log)
+        self.mode = mode
         # Re-enable the difficulty box
         self.difficulty_box.setEnabled(True)
         # Resets the flag count display to 0
         self.flag_count_update()
-        self.view.setScene(self.scene)
-        self.view.fitInView(self.scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        self._show_seed(self.scene.seed)
+        # Custom boards keep their own tile size, so that large boards can be zoomed and scrolled
+        self.view.show_scene(self.scene, mode != CUSTOM)
     
     def reset_game(self):
         """Resets the current game in the same difficulty setting"""
-        self.difficulty_setter(self.mode)
+        self._new_game(self.mode)
     
+    def closeEvent(self, event):
+        """Saves the game in progress to SNAPSHOT_FILE_PATH, stops generating boards and saves the
+        ready-made ones, and closes the move log when the window is closed.
+
+        Args:
+            event -- A QCloseEvent to handle
+        """
+        # A window closed before its first game was set up leaves any snapshot to be resumed again
+        if self.scene is not None:
+            board = self.scene.board
+            if board.first_move_made and not board.game_over:
+                save_snapshot(Snapshot(self.mode, self.scene.no_guess, self.watch.get_time_ms(), board),
+                              SNAPSHOT_FILE_PATH)
+        if self.pool is not None:
+            self.pool.stop()
+        self.move_log.close()
+        super().closeEvent(event)
+
     def allow_endgame_sequence(self):
         """Re-enables the difficulty-chooser after the dialog box is closed out"""
         self.difficulty_box.setEnabled(True)
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    window = MainWindow('Medium')
+    parser = argparse.ArgumentParser(description = "Play minesweeper.")
+    parser.add_argument("--seed", type = int, help = "the seed of the first game, to replay a board")
+    parser.add_argument("--mode", choices = list(MODES), help = "the difficulty of the first game "
+                        "(default: resume the last game, or %s)" % DEFAULT_MODE)
+    parser.add_argument("--custom", help = "play a custom board first instead, such as 30x16x99")
+    parser.add_argument("--no-guess", action = "store_true",
+                        help = "make the first board solvable without guessing")
+    parser.add_argument("--refresh-interval", type = int, default = REFRESH_INTERVAL,
+                        help = "the time in milliseconds between refreshes of the timer")
+    parser.add_argument("--startup-time", action = "store_true",
+                        help = "print the time taken to first paint the window and the board, then quit")
+    # Any other arguments are left for Qt
+    args, qt_args = parser.parse_known_args()
+    if args.seed is not None and not 0 <= args.seed < NO_SEED:
+        parser.error("--seed must be between 0 and %d" % (NO_SEED - 1))
+    mode, custom = args.mode, None
+    if args.custom is not None:
+        try:
+            custom = tuple(map(int, args.custom.split("x")))
+            if len(custom) != 3:
+                raise ValueError("expected three numbers")
+            custom_mode(*custom, 0, 0)
+        except ValueError as e:
+            parser.error("--custom must be of the form WIDTHxHEIGHTxBOMBS on a valid board: %s" % e)
+        mode = CUSTOM
+    elif mode is None and args.no_guess:
+        # A new game is asked for, rather than the last one
+        mode = DEFAULT_MODE
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = MainWindow(mode, args.seed, args.refresh_interval, START_TIME if args.startup_time else None,
+                        custom, args.no_guess)
     window.show()
     app.exec()
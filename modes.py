@@ -0,0 +1,82 @@
+"""This module contains the difficulty modes of the game, and the limits of custom games. It does
+not depend on PyQt6, so that the benchmarks and other tools that run games without a display can
+use the same boards as "main.py".
+"""
+
+"""Global Variables:
+
+MODES: Contains three different difficulties "Easy", "Medium" and "Hard". Each tuple is of the form
+(number of tiles wide, number of tiles high, tile size, number of bombs)
+CUSTOM: The name of the mode in which the player chooses the size of the board and the number of bombs
+MIN_SIZE: The smallest number of tiles wide or high a custom board can be
+MAX_SIZE: The largest number of tiles wide or high a custom board can be
+MIN_TILE_SIZE: The smallest size in pixels of a tile of a custom board
+MAX_TILE_SIZE: The largest size in pixels of a tile of a custom board
+MAX_NO_GUESS_TILES: The largest number of tiles on a board that can be generated so that it can
+be solved without guessing. Larger boards are generated normally.
+MAX_HINT_TILES: The largest number of tiles on a board that hints are given for
+LARGE_BOARD_TILES: The number of tiles from which setting up a board shows a progress indicator
+"""
+
+MODES = {
+    "Easy": (10, 8, 50, 10),
+    "Medium" : (18, 14, 46, 40),
+    "Hard" : (24, 20, 32, 99),
+}
+CUSTOM = "Custom"
+MIN_SIZE = 2
+MAX_SIZE = 2000
+MIN_TILE_SIZE = 4
+MAX_TILE_SIZE = 50
+MAX_NO_GUESS_TILES = 40000
+MAX_HINT_TILES = 250000
+LARGE_BOARD_TILES = 250000
+
+def max_bombs(width, height):
+    """Returns the largest number of bombs a WIDTH by HEIGHT board can have. The first move is
+    always safe, so at least one tile must be left without a bomb."""
+    return width * height - 1
+
+def custom_mode(width, height, num_bombs, view_width, view_height):
+    """Returns a mode tuple, of the same form as the values of MODES, for a custom board that is WIDTH
+    tiles wide and HEIGHT tiles high with NUM_BOMBS bombs. The tile size is the largest that fits
+    the board in a view that is VIEW_WIDTH by VIEW_HEIGHT pixels, between MIN_TILE_SIZE and
+    MAX_TILE_SIZE. Boards that do not fit at MIN_TILE_SIZE have to be scrolled.
+
+    Args:
+        width -- An integer; number of tiles wide
+        height -- An integer; number of tiles high
+        num_bombs -- An integer; the number of bombs
+        view_width -- An integer; the width in pixels of the view the board is shown in
+        view_height -- An integer; the height in pixels of the view the board is shown in
+
+    Returns:
+        A tuple of the form (number of tiles wide, number of tiles high, tile size, number of bombs)
+
+    Raises:
+        ValueError: the board is too small or too large, or has too many bombs
+    """
+    if not (MIN_SIZE <= width <= MAX_SIZE and MIN_SIZE <= height <= MAX_SIZE):
+        raise ValueError("A custom board must be between %d and %d tiles wide and high." % (MIN_SIZE, MAX_SIZE))
+    if not 1 <= num_bombs <= max_bombs(width, height):
+        raise ValueError("A %dx%d board can have between 1 and %d bombs." % (width, height, max_bombs(width, height)))
+    tile_size = min(view_width // width, view_height // height)
+    tile_size = max(MIN_TILE_SIZE, min(tile_size, MAX_TILE_SIZE))
+    return (width, height, tile_size, num_bombs)
+
+def score_key(mode, width, height, num_bombs):
+    """Returns the name the best time of a game is saved under. Each of MODES has its own best
+    time, and so does each configuration of a custom board.
+
+    Args:
+        mode -- A string; the name of the mode, one of MODES or CUSTOM
+        width -- An integer; number of tiles wide
+        height -- An integer; number of tiles high
+        num_bombs -- An integer; the number of bombs
+
+    Returns:
+        A string
+    """
+    if mode in MODES:
+        return mode
+    return "%s %dx%d %d" % (mode, width, height, num_bombs)
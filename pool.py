@@ -0,0 +1,216 @@
+"""This module contains the BoardPool class, which keeps a supply of ready-made boards that
+can be solved without guessing, so that a new no guessing game does not have to wait for
+the generator in "solver.py".
+
+A board that can be solved without guessing is only guaranteed to be solvable from the tile
+it was generated around. A pooled board can still be used for a different first move, as long
+as that move lands on a tile with no surrounding bombs in the region the original first move
+opens up: exposing it opens exactly the same region. Each pooled board can also be flipped
+horizontally and vertically, which gives four chances to match the player's first move.
+"""
+
+import os
+import random
+import struct
+import threading
+from collections import deque
+from board import Board, COUNT_SHIFT, SEED_BITS, pack_bits, unpack_bits
+from solver import generate_no_guess
+
+"""Global Variables:
+
+POOL_SIZE: The default number of boards to keep for each board configuration
+LOW_WATER: The default number of boards left in a pool below which it is refilled
+FILE_HEADER: The first bytes of a file written by BoardPool.save
+RECORD: The layout of the fixed size part of each board in a file written by BoardPool.save;
+the width, height, number of bombs and index of the first move
+"""
+
+POOL_SIZE = 8
+LOW_WATER = 4
+FILE_HEADER = b"MSPOOL1\n"
+RECORD = struct.Struct("<HHII")
+
+class PooledBoard:
+    """A PooledBoard object stores a board that can be solved without guessing.
+
+    start -- the index of the tile the board was generated around
+    mines -- a bytes object with one entry per tile; 1 if the tile is a bomb, 0 otherwise
+    opening -- a frozenset of the indices of the tiles with no surrounding bombs that
+    are exposed by the first move
+    """
+    __slots__ = ("start", "mines", "opening")
+
+    def __init__(self, board, start):
+        """Create a PooledBoard from BOARD, whose bombs have been placed so that it can be
+        solved starting from the tile at index START.
+
+        board -- A Board; the generated board
+        start -- An integer; the index of the first move
+        """
+        self.start = start
+        self.mines = board.mine_layout()
+        # Expose the first move on a copy of the board to find the region it opens up
+        copy = Board(board.width, board.height, board.num_bombs)
+        copy.cells[:] = board.cells
+        copy.generated = True
+        self.opening = frozenset(i for i in copy.reveal(*board.coordinates(start))
+                                 if copy.cells[i] >> COUNT_SHIFT == 0)
+
+class BoardPool:
+    """A BoardPool object keeps a number of boards that can be solved without guessing ready for
+    each board configuration, and refills them in a background thread.
+
+    capacity -- the number of boards to keep for each configuration
+    low_water -- the number of boards left below which a configuration is refilled
+    path -- the file to save the boards to and load them from, or None
+    rng -- a random.Random object; the source of the seeds and first moves of the boards generated
+    boards -- a dict mapping each configuration, a tuple of the form
+    (number of tiles wide, number of tiles high, number of bombs), to a deque of PooledBoards
+    """
+    def __init__(self, modes, capacity = POOL_SIZE, low_water = LOW_WATER, path = None, seed = None):
+        """Create a BoardPool holding CAPACITY boards for each of MODES, which are refilled when
+        fewer than LOW_WATER are left. If PATH is given, the boards saved there are loaded. The
+        boards are generated from SEED, so two pools with the same seed generate the same boards.
+
+        modes -- An iterable of tuples of the form (number of tiles wide, number of tiles high,
+        tile size, number of bombs), as in the MODES dictionary of "modes.py"
+        capacity -- An integer; the number of boards to keep for each mode
+        low_water -- An integer; the number of boards left below which a mode is refilled
+        path -- A string; the filepath to save the boards to, or None to not save them
+        seed -- An integer; the seed to generate the boards with, or None to choose one at random
+        """
+        self.capacity = capacity
+        self.low_water = low_water
+        self.path = path
+        self.rng = random.Random(seed)
+        self.boards = {}
+        for width, height, tile_size, num_bombs in modes:
+            self.boards[(width, height, num_bombs)] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        if path is not None:
+            self._load()
+
+    def start(self):
+        """Starts filling the pool in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target = self._run, daemon = True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops the background thread, and saves the boards if the pool has a path."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.path is not None:
+            self.save()
+
+    def size(self, width, height, num_bombs):
+        """Returns the number of boards ready for the given configuration"""
+        return len(self.boards.get((width, height, num_bombs), ()))
+
+    def take(self, board, x, y):
+        """Places the bombs of BOARD using a pooled board, if there is one in which the first move
+        at (X, Y) opens the same region as the move it was generated around. The seed of BOARD is
+        then set to None, since it no longer places its bombs.
+
+        Args:
+            board -- A Board; a board whose bombs have not been placed yet
+            x -- the x-coordinate of the first move measured from the left
+            y -- the y-cooridnate of the first move measured from the top
+
+        Returns:
+            A boolean; whether or not a pooled board was used
+        """
+        width, height = board.width, board.height
+        pool = self.boards.get((width, height, board.num_bombs))
+        if pool is None:
+            return False
+        with self._lock:
+            for pooled in pool:
+                for flip_x, flip_y in ((False, False), (True, False), (False, True), (True, True)):
+                    column = width - 1 - x if flip_x else x
+                    row = height - 1 - y if flip_y else y
+                    if row * width + column in pooled.opening:
+                        pool.remove(pooled)
+                        break
+                else:
+                    continue
+                break
+            else:
+                return False
+        board.set_mine_layout(_flip(pooled.mines, width, height, flip_x, flip_y))
+        # The seed of the board did not place these bombs, so it must not be shown or saved
+        board.seed = None
+        # Let the background thread know that the pool might need to be refilled
+        self._wakeup.set()
+        return True
+
+    def save(self):
+        """Writes every board in the pool to self.path. The file is replaced atomically, so that
+        it is never left half written."""
+        with self._lock:
+            records = [(key, pooled) for key, pool in self.boards.items() for pooled in pool]
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(FILE_HEADER)
+            for (width, height, num_bombs), pooled in records:
+                f.write(RECORD.pack(width, height, num_bombs, pooled.start))
+                f.write(pack_bits(pooled.mines))
+        os.replace(temporary, self.path)
+
+    def _load(self):
+        """Reads the boards saved in self.path. Boards whose configuration is not in the pool are
+        skipped, and a file that cannot be read is ignored."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        if not data.startswith(FILE_HEADER):
+            return
+        offset = len(FILE_HEADER)
+        while offset + RECORD.size <= len(data):
+            width, height, num_bombs, start = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            size = width * height
+            packed = data[offset:offset + (size + 7) // 8]
+            offset += len(packed)
+            pool = self.boards.get((width, height, num_bombs))
+            if pool is None or len(packed) != (size + 7) // 8 or len(pool) >= self.capacity:
+                continue
+            board = Board(width, height, num_bombs)
+            board.set_mine_layout(unpack_bits(packed, size))
+            pool.append(PooledBoard(board, start))
+
+    def _run(self):
+        """Generates boards for the configurations that are running low, and otherwise waits
+        until a board is taken from the pool."""
+        while not self._stopping:
+            self._wakeup.clear()
+            for (width, height, num_bombs), pool in self.boards.items():
+                if len(pool) >= self.low_water:
+                    continue
+                while len(pool) < self.capacity and not self._stopping:
+                    board = Board(width, height, num_bombs, self.rng.getrandbits(SEED_BITS))
+                    x, y = self.rng.randrange(width), self.rng.randrange(height)
+                    if generate_no_guess(board, x, y):
+                        pooled = PooledBoard(board, board.index(x, y))
+                        with self._lock:
+                            pool.append(pooled)
+            self._wakeup.wait()
+
+def _flip(mines, width, height, flip_x, flip_y):
+    """Returns a copy of MINES, the bombs of a WIDTH by HEIGHT board, which is mirrored
+    horizontally if FLIP_X is True and vertically if FLIP_Y is True."""
+    rows = [mines[row * width:(row + 1) * width] for row in range(height)]
+    if flip_x:
+        rows = [row[::-1] for row in rows]
+    if flip_y:
+        rows.reverse()
+    return b"".join(rows)
@@ -0,0 +1,264 @@
+"""This module records games of minesweeper as a compact, append-only binary log of moves, and
+replays them, either headlessly on a Board or visually on a Canvas (see CanvasReplayer in
+"canvas.py").
+
+A log file starts with FILE_HEADER, followed by a stream of records. Each record starts with
+a one byte type:
+    GAME -- starts a new game; the width, height, number of bombs and seed of the board, or
+    NO_SEED if the seed did not place its bombs
+    LAYOUT -- the bombs of the current game, packed with pack_bits, written once they are placed
+    STATE -- the exposed and the flagged tiles of a game that was resumed, as two bitsets packed
+    with pack_bits, so that it is replayed from the position it was resumed in
+    REVEAL, FLAG, UNFLAG, CHORD -- a move at (x, y), made a number of milliseconds after
+    the game started
+A game is only written once its first move is made, so games that are never played take no
+space. Since every game carries its own GAME record, games are simply appended to the end of
+the file, and a log can be read while it is still being written. A record that was cut off by
+a crash is ignored.
+
+To replay every game in a log as fast as possible, run the command
+```
+python3 replay.py cache/games.log
+```
+and use --show to watch the last game at the speed set by --speed.
+"""
+
+import argparse
+import struct
+import sys
+import time
+from board import Board, NO_SEED, pack_bits, unpack_bits
+
+"""Global Variables:
+
+FILE_HEADER: The first bytes of a log file
+GAME: The record type that starts a new game
+LAYOUT: The record type that stores the bombs of the current game
+REVEAL: The record type of a left click, which exposes a tile
+FLAG: The record type of a right click that flags a tile
+UNFLAG: The record type of a right click that removes a flag
+CHORD: The record type of a chord, which exposes the neighbors of a number
+STATE: The record type that stores the exposed and flagged tiles of a resumed game
+GAME_RECORD: The layout of a GAME record; the width, height, number of bombs and seed
+MOVE_RECORD: The layout of a move record; the x and y coordinates, and the time in milliseconds
+"""
+
+FILE_HEADER = b"MSLOG01\n"
+GAME = 0
+LAYOUT = 1
+REVEAL = 2
+FLAG = 3
+UNFLAG = 4
+CHORD = 5
+STATE = 6
+GAME_RECORD = struct.Struct("<HHIQ")
+MOVE_RECORD = struct.Struct("<HHI")
+
+class MoveLog:
+    """A MoveLog object appends the games played on a Canvas to a binary stream. Writes go
+    through the buffer of the stream, so recording a move costs a struct.pack and a copy;
+    the stream is only flushed at the end of each game.
+
+    stream -- the binary file-like object the records are written to
+    start_time -- the time.perf_counter_ns() at which the current game started, or None
+    """
+    def __init__(self, stream):
+        """Create a MoveLog that writes to STREAM, which should be opened for appending.
+
+        stream -- A binary file-like object
+        """
+        self.stream = stream
+        self.start_time = None
+        if stream.tell() == 0:
+            stream.write(FILE_HEADER)
+
+    def new_game(self, board):
+        """Starts recording a game played on BOARD. If its bombs have been placed, they are
+        recorded, along with the tiles that have been exposed or flagged in a game that is being
+        resumed, so that the game is replayed from the same position."""
+        self.start_time = time.perf_counter_ns()
+        seed = NO_SEED if board.seed is None else board.seed
+        self.stream.write(bytes([GAME]) + GAME_RECORD.pack(board.width, board.height, board.num_bombs, seed))
+        if board.generated:
+            self.layout(board)
+        exposed, flagged = board.exposed_layout(), board.flag_layout()
+        if 1 in exposed or 1 in flagged:
+            self.stream.write(bytes([STATE]) + pack_bits(exposed) + pack_bits(flagged))
+
+    def layout(self, board):
+        """Records the bombs of BOARD, which have just been placed."""
+        self.stream.write(bytes([LAYOUT]) + pack_bits(board.mine_layout()))
+
+    def move(self, action, x, y):
+        """Records a move of type ACTION (REVEAL, FLAG, UNFLAG or CHORD) made at (X, Y)."""
+        elapsed = (time.perf_counter_ns() - self.start_time) // 1000000
+        self.stream.write(bytes([action]) + MOVE_RECORD.pack(x, y, elapsed))
+
+    def flush(self):
+        """Writes any buffered records to the stream. Called at the end of every game."""
+        self.stream.flush()
+
+    def close(self):
+        """Flushes and closes the stream."""
+        self.stream.close()
+
+class GameLog:
+    """A GameLog object stores one recorded game.
+
+    width -- the number of tiles wide the board is
+    height -- the number of tiles high the board is
+    num_bombs -- the number of bombs on the board
+    seed -- the seed of the board the game was played on, or None if the seed did not place its
+    bombs
+    mines -- a bytearray with one entry per tile; 1 if the tile is a bomb, 0 otherwise. None if
+    the bombs were never placed.
+    exposed -- a bytearray with one entry per tile; 1 if the tile was exposed when the game was
+    resumed, 0 otherwise. None if the game was not resumed.
+    flagged -- a bytearray with one entry per tile; 1 if the tile was flagged when the game was
+    resumed, 0 otherwise. None if the game was not resumed.
+    moves -- a list of tuples of the form (action, x, y, time in milliseconds)
+    """
+    __slots__ = ("width", "height", "num_bombs", "seed", "mines", "exposed", "flagged", "moves")
+
+    def __init__(self, width, height, num_bombs, seed):
+        """Create an empty GameLog for a WIDTH by HEIGHT board with NUM_BOMBS bombs, placed
+        with SEED."""
+        self.width = width
+        self.height = height
+        self.num_bombs = num_bombs
+        self.seed = seed
+        self.mines = None
+        self.exposed = None
+        self.flagged = None
+        self.moves = []
+
+def read_games(stream):
+    """Reads the games recorded in STREAM one at a time, so that large logs do not need to
+    fit in memory.
+
+    Args:
+        stream -- A binary file-like object, positioned at the start of a log
+
+    Yields:
+        A GameLog for each game in the log
+    """
+    if stream.read(len(FILE_HEADER)) != FILE_HEADER:
+        return
+    game = None
+    while True:
+        kind = stream.read(1)
+        if not kind:
+            break
+        kind = kind[0]
+        if kind == GAME:
+            data = stream.read(GAME_RECORD.size)
+            if len(data) != GAME_RECORD.size:
+                break
+            if game is not None:
+                yield game
+            width, height, num_bombs, seed = GAME_RECORD.unpack(data)
+            game = GameLog(width, height, num_bombs, None if seed == NO_SEED else seed)
+        elif kind == LAYOUT:
+            if game is None:
+                break
+            size = game.width * game.height
+            packed = stream.read((size + 7) // 8)
+            if len(packed) != (size + 7) // 8:
+                break
+            game.mines = unpack_bits(packed, size)
+        elif kind == STATE:
+            if game is None:
+                break
+            size = game.width * game.height
+            packed = stream.read(2 * ((size + 7) // 8))
+            if len(packed) != 2 * ((size + 7) // 8):
+                break
+            game.exposed = unpack_bits(packed[:len(packed) // 2], size)
+            game.flagged = unpack_bits(packed[len(packed) // 2:], size)
+        elif REVEAL <= kind <= CHORD:
+            data = stream.read(MOVE_RECORD.size)
+            if game is None or len(data) != MOVE_RECORD.size:
+                break
+            game.moves.append((kind,) + MOVE_RECORD.unpack(data))
+        else:
+            # Anything else means the log is corrupt from here on
+            break
+    if game is not None:
+        yield game
+
+def apply_move(board, action, x, y):
+    """Makes the move of type ACTION at (X, Y) on BOARD.
+
+    Returns:
+        A list of the indices of every tile that changed
+    """
+    if action == REVEAL:
+        return board.reveal(x, y)
+    if action == CHORD:
+        return board.chord(x, y)
+    # Flags and unflags are both toggles, but are recorded separately so that a log can be
+    # read without replaying it
+    if board.toggle_flag(x, y):
+        return [board.index(x, y)]
+    return []
+
+def starting_board(game):
+    """Returns a new Board in the position GAME was recorded from; with its bombs placed if they
+    were recorded, and the tiles that were exposed or flagged if the game was resumed.
+
+    Args:
+        game -- A GameLog; the recorded game
+    """
+    board = Board(game.width, game.height, game.num_bombs, game.seed)
+    if game.mines is not None:
+        board.set_mine_layout(game.mines)
+        if game.exposed is not None:
+            board.restore_state(game.exposed, game.flagged)
+    return board
+
+def replay(game):
+    """Replays GAME on a new Board, as fast as possible.
+
+    Args:
+        game -- A GameLog; the recorded game
+
+    Returns:
+        A Board in the state the game ended in
+    """
+    board = starting_board(game)
+    for action, x, y, elapsed in game.moves:
+        apply_move(board, action, x, y)
+    return board
+
+def main(argv = None):
+    """Replays the log named in the command line arguments ARGV, and reports how the games ended."""
+    parser = argparse.ArgumentParser(description = "Replay a log of recorded minesweeper games.")
+    parser.add_argument("log", help = "the log file to replay")
+    parser.add_argument("--show", action = "store_true", help = "watch the last game being replayed")
+    parser.add_argument("--speed", type = float, default = 1.0, help = "playback speed of --show")
+    args = parser.parse_args(argv)
+
+    with open(args.log, "rb") as f:
+        games = list(read_games(f))
+    start = time.perf_counter()
+    boards = [replay(game) for game in games]
+    elapsed = time.perf_counter() - start
+    won = sum(board.game_won for board in boards)
+    lost = sum(board.game_over and not board.game_won for board in boards)
+    print("%d games (%d won, %d lost, %d unfinished) replayed in %.3f s"
+          % (len(boards), won, lost, len(boards) - won - lost, elapsed))
+    if args.show and games:
+        from PyQt6.QtWidgets import QApplication, QGraphicsView
+        from canvas import Canvas, CanvasReplayer
+        app = QApplication(sys.argv)
+        game = games[-1]
+        scene = Canvas(game.width, game.height, max(600 // max(game.width, game.height), 4), game.num_bombs,
+                       seed = game.seed, board = starting_board(game))
+        view = QGraphicsView(scene)
+        view.show()
+        replayer = CanvasReplayer(scene, game, args.speed)
+        replayer.start()
+        app.exec()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""This module contains the ScoreStore class, which keeps the user's best time in each mode and
+the history of every game they have won.
+
+The best times are kept in "cache/high_scores.txt" (see "utils.py"), which is small and read once
+at startup. The history is an append-only binary log that starts with FILE_HEADER, followed by
+one fixed size record per won game: the time in milliseconds, the seed of the board (NO_SEED if its
+bombs were not placed by a seed), its 3BV, the date as seconds since the epoch, and the name of the mode (see score_key in "modes.py"). A record
+that was cut off by a crash is ignored when reading, and removed before the next record is
+appended, which is easy to detect because every record has the same size. The history is only
+read the first time it is queried, so a long history does not slow down starting the game.
+
+To list the best games and the percentiles of the times in each mode, run the command
+```
+python3 scores.py --top 10
+```
+"""
+
+import argparse
+import bisect
+import os
+import struct
+import time
+from board import NO_SEED
+from utils import read_high_scores, write_high_scores, WORST_TIME
+
+"""Global Variables:
+
+FILE_HEADER: The first bytes of a history file
+SCORE_RECORD: The layout of a record; the time in milliseconds, seed, 3BV, date and the name of
+the mode, padded with zero bytes
+PERCENTILES: The percentiles of the times listed by the command line tool
+"""
+
+FILE_HEADER = b"MSSCORE1\n"
+SCORE_RECORD = struct.Struct("<IQIq32s")
+PERCENTILES = [10, 50, 90]
+
+class Score:
+    """A Score object stores one won game.
+
+    time_ms -- the time taken to win the game, in milliseconds
+    mode -- the name the game is saved under; see score_key in "modes.py"
+    seed -- the seed of the board, or None if the seed did not place its bombs
+    three_bv -- the 3BV of the board, the smallest number of clicks that solves it
+    date -- the time the game was won, in seconds since the epoch
+    """
+    __slots__ = ("time_ms", "mode", "seed", "three_bv", "date")
+
+    def __init__(self, time_ms, mode, seed, three_bv, date):
+        """Create a Score of a game of MODE won in TIME_MS milliseconds at DATE, on the board with
+        SEED and 3BV THREE_BV."""
+        self.time_ms = time_ms
+        self.mode = mode
+        self.seed = seed
+        self.three_bv = three_bv
+        self.date = date
+
+    def __lt__(self, other):
+        """Orders scores from fastest to slowest, and games with the same time by date."""
+        return (self.time_ms, self.date) < (other.time_ms, other.date)
+
+class ScoreStore:
+    """A ScoreStore object keeps the best time in each mode, and appends every won game to a
+    history that can be queried by mode.
+
+    scores_path -- the filepath of the best times
+    history_path -- the filepath of the history of won games
+    best_times -- a dict mapping the name of each mode to the best time in it, in milliseconds
+    """
+    def __init__(self, scores_path, history_path):
+        """Create a ScoreStore which reads the best times from SCORES_PATH, and the history from
+        HISTORY_PATH once it is first needed. Either file may be missing.
+
+        scores_path -- A string; the filepath of the best times
+        history_path -- A string; the filepath of the history of won games
+        """
+        self.scores_path = scores_path
+        self.history_path = history_path
+        try:
+            self.best_times = read_high_scores(scores_path)
+        except (OSError, ValueError, IndexError):
+            self.best_times = {}
+        # Maps the name of each mode to a list of its Scores, sorted from fastest to slowest.
+        # None until the history is first queried.
+        self._index = None
+
+    def best(self, mode):
+        """Returns the best time in milliseconds in MODE, or WORST_TIME seconds if no game of it
+        has been won."""
+        return self.best_times.get(mode, WORST_TIME * 1000)
+
+    def record(self, mode, time_ms, seed, three_bv):
+        """Adds a game of MODE won in TIME_MS milliseconds on the board with SEED and 3BV THREE_BV
+        to the history, and saves it as the best time if it is one.
+
+        Args:
+            mode -- A string; the name the game is saved under
+            time_ms -- An integer; the time taken to win the game, in milliseconds
+            seed -- An integer; the seed of the board, or None if the seed did not place its bombs
+            three_bv -- An integer; the 3BV of the board
+
+        Returns:
+            A boolean; whether or not the game set a new best time
+        """
+        score = Score(time_ms, mode, seed, three_bv, int(time.time()))
+        with open(self.history_path, "ab") as f:
+            size = f.tell()
+            if size < len(FILE_HEADER):
+                f.truncate(0)
+                f.write(FILE_HEADER)
+            elif (size - len(FILE_HEADER)) % SCORE_RECORD.size != 0:
+                # Remove the part of a record left by a crash
+                f.truncate(size - (size - len(FILE_HEADER)) % SCORE_RECORD.size)
+            f.write(SCORE_RECORD.pack(time_ms, NO_SEED if seed is None else seed, three_bv, score.date,
+                                      mode.encode()))
+        if self._index is not None:
+            bisect.insort(self._index.setdefault(mode, []), score)
+        if time_ms >= self.best(mode):
+            return False
+        self.best_times[mode] = time_ms
+        write_high_scores(self.best_times, self.scores_path)
+        return True
+
+    def history(self, mode):
+        """Returns a list of the Scores of every won game of MODE, from fastest to slowest."""
+        if self._index is None:
+            self._index = self._load()
+        return self._index.get(mode, [])
+
+    def modes(self):
+        """Returns a list of the names of every mode with a won game in the history."""
+        if self._index is None:
+            self._index = self._load()
+        return list(self._index)
+
+    def top(self, mode, n):
+        """Returns a list of the N fastest Scores of MODE."""
+        return self.history(mode)[:n]
+
+    def percentile(self, mode, p):
+        """Returns the time in milliseconds that P percent of the won games of MODE were at least
+        as fast as, using the nearest rank method, or None if no game of MODE has been won."""
+        scores = self.history(mode)
+        if not scores:
+            return None
+        rank = max(int(round(p / 100 * len(scores))) - 1, 0)
+        return scores[min(rank, len(scores) - 1)].time_ms
+
+    def percent_faster(self, mode, time_ms):
+        """Returns the percentage of the won games of MODE that were slower than TIME_MS
+        milliseconds, or None if no game of MODE has been won."""
+        scores = self.history(mode)
+        if not scores:
+            return None
+        # Scores order by date after time, so this finds the first score slower than TIME_MS
+        slower = len(scores) - bisect.bisect_right(scores, Score(time_ms, mode, 0, 0, float("inf")))
+        return 100 * slower / len(scores)
+
+    def _load(self):
+        """Reads every record of the history, and returns them indexed by mode. A missing or
+        corrupt file is treated as an empty history, and a record that was cut off is ignored."""
+        index = {}
+        try:
+            with open(self.history_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return index
+        if not data.startswith(FILE_HEADER):
+            return index
+        end = len(data) - (len(data) - len(FILE_HEADER)) % SCORE_RECORD.size
+        records = memoryview(data)[len(FILE_HEADER):end]
+        for time_ms, seed, three_bv, date, name in SCORE_RECORD.iter_unpack(records):
+            mode = name.rstrip(b"\0").decode(errors = "replace")
+            if seed == NO_SEED:
+                seed = None
+            index.setdefault(mode, []).append(Score(time_ms, mode, seed, three_bv, date))
+        for scores in index.values():
+            scores.sort()
+        return index
+
+def main(argv = None):
+    """Prints the best games and the percentiles of the times of every mode in the history named
+    in the command line arguments ARGV."""
+    parser = argparse.ArgumentParser(description = "List the best minesweeper games.")
+    parser.add_argument("--history", default = "cache/scores.log", help = "the history file to read")
+    parser.add_argument("--top", type = int, default = 5, help = "number of games to list for each mode")
+    args = parser.parse_args(argv)
+
+    store = ScoreStore(os.devnull, args.history)
+    for mode in sorted(store.modes()):
+        scores = store.history(mode)
+        percentiles = ", ".join("p%d %.3f s" % (p, store.percentile(mode, p) / 1000) for p in PERCENTILES)
+        print("%s: %d games, %s" % (mode, len(scores), percentiles))
+        for score in store.top(mode, args.top):
+            seed = "-" if score.seed is None else score.seed
+            print("    %8.3f s  3BV %-5d seed %-20s %s" % (score.time_ms / 1000, score.three_bv, seed,
+                                                          time.strftime("%Y-%m-%d %H:%M", time.localtime(score.date))))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,417 @@
+"""This module plays games of minesweeper without a display, so that scripts, bots and tests can
+drive them with the same rules as the game in "main.py". A Session plays one game at a time on a
+Board, placing the bombs and making moves exactly as a Canvas does, and can be used directly from
+Python, or through a protocol of JSON lines.
+
+Each request is a JSON object on its own line, with an "action" and the arguments it needs:
+    {"action": "new-game", "mode": "Hard", "seed": 123, "no_guess": false}
+    {"action": "new-game", "mode": "Custom", "width": 100, "height": 50, "bombs": 800}
+    {"action": "reveal", "x": 3, "y": 4}
+    {"action": "flag", "x": 3, "y": 5}
+    {"action": "chord", "x": 3, "y": 4}
+    {"action": "state"}
+and each gets one JSON object back on its own line, with "ok" set to false and an "error" if the
+request could not be carried out. An "id" given with a request is returned with its response.
+Moves respond with the tiles that changed, and "new-game" and "state" with the whole board, one
+string per row, using the symbols described in SYMBOLS.
+
+To play over standard input and output, run the command
+```
+python3 -m server
+```
+and add --port or --unix to accept connections on a local socket instead, with one Session for
+every connection, all served by one process. Requests that may take a while, such as a move on a
+large board, are handled in a thread, so that they do not hold up the other connections.
+"""
+
+import argparse
+import asyncio
+import json
+import operator
+import sys
+from board import Board, MINE, EXPOSED, FLAGGED, COUNT_SHIFT
+from modes import MODES, CUSTOM, MAX_NO_GUESS_TILES, custom_mode
+from replay import REVEAL, FLAG, UNFLAG, CHORD, apply_move
+from solver import generate_no_guess
+
+"""Global Variables:
+
+HOST: The address the server listens on with --port. Only local connections are accepted.
+THREAD_TILES: The number of tiles from which the requests on a board are handled in a thread by the
+socket server. Requests on smaller boards take well under a millisecond, which is less than
+handing them to a thread costs.
+MAX_REQUEST_BYTES: The longest request line, in bytes, that the socket server reads. Longer lines are
+skipped, and answered with an error.
+SYMBOLS: How each tile is shown; "#" for an unexposed tile, "F" for a flag, "0" to "8" for an
+exposed tile with that many surrounding bombs, and "*" for an exposed bomb. Once a game is lost,
+every bomb is shown as "*", unless it was flagged, and every incorrectly flagged tile as "X".
+"""
+
+HOST = "127.0.0.1"
+THREAD_TILES = 2500
+MAX_REQUEST_BYTES = 1 << 16
+SYMBOLS = "#F012345678*X"
+
+def _symbol_table(lost):
+    """Returns a translation table from each possible byte of Board.cells to the SYMBOLS character
+    the tile is shown as. LOST is True if the table is for a lost game, which shows its bombs."""
+    table = bytearray()
+    for cell in range(256):
+        if cell & EXPOSED:
+            symbol = "*" if cell & MINE else str(min(cell >> COUNT_SHIFT, 8))
+        elif cell & FLAGGED:
+            symbol = "X" if lost and not cell & MINE else "F"
+        else:
+            symbol = "*" if lost and cell & MINE else "#"
+        table.append(ord(symbol))
+    return bytes(table)
+
+_PLAYING_TABLE = _symbol_table(False)
+_LOST_TABLE = _symbol_table(True)
+# The moves that can be requested, by the name of their action
+_MOVES = {"reveal": REVEAL, "flag": FLAG, "chord": CHORD}
+
+def _integer(value, name):
+    """Returns VALUE, the argument called NAME, as an integer.
+
+    Raises:
+        ValueError: VALUE is not an integer; booleans, floats and strings are refused rather than
+        converted, so that 1e400 or "3" is not taken for a tile
+    """
+    if not isinstance(value, bool):
+        try:
+            return operator.index(value)
+        except TypeError:
+            pass
+    raise ValueError("%s must be an integer, not %r." % (name, value))
+
+class Session:
+    """A Session object plays one game of minesweeper at a time, without a display.
+
+    board -- the Board of the current game, or None until the first game is started
+    mode -- the difficulty of the current game; "Easy", "Medium", "Hard" or CUSTOM
+    no_guess -- whether or not the board is generated so that it can be solved without guessing
+    """
+    def __init__(self, board = None, mode = None):
+        """Create a Session that plays on BOARD in MODE, such as a board whose bombs have already
+        been placed. Without a board, a game must be started with self.new_game before any move
+        is made.
+
+        board -- A Board; the board of the first game, or None
+        mode -- A string; the difficulty of BOARD
+        """
+        self.board = board
+        self.mode = mode
+        self.no_guess = False
+
+    def new_game(self, mode = "Medium", width = None, height = None, bombs = None, seed = None,
+                 no_guess = False):
+        """Starts a new game in MODE. Custom games take the size of their board and their number of
+        bombs from WIDTH, HEIGHT and BOMBS, which are ignored in the other modes.
+
+        Args:
+            mode -- A string; "Easy", "Medium", "Hard" or CUSTOM
+            width -- An integer; number of tiles wide of a custom board
+            height -- An integer; number of tiles high of a custom board
+            bombs -- An integer; number of bombs on a custom board
+            seed -- An integer; the seed to place the bombs with, or None to choose one at random
+            no_guess -- A boolean; whether or not the board can be solved without guessing
+
+        Returns:
+            A dict describing the new game; see self.state
+
+        Raises:
+            ValueError: the mode does not exist, the size, bombs or seed is not an integer, or the
+            custom board is too small or too large, or has too many bombs
+        """
+        if mode in MODES:
+            width, height, tile_size, bombs = MODES[mode]
+        elif mode == CUSTOM:
+            if width is None or height is None or bombs is None:
+                raise ValueError("A custom game needs a width, a height and a number of bombs.")
+            # There is no view to fit the tiles to, so this only checks the board
+            width, height, tile_size, bombs = custom_mode(_integer(width, "width"),
+                                                          _integer(height, "height"),
+                                                          _integer(bombs, "bombs"), 0, 0)
+        else:
+            raise ValueError("Unknown mode %r." % (mode,))
+        self.board = Board(width, height, bombs, None if seed is None else _integer(seed, "seed"))
+        self.mode = mode
+        self.no_guess = bool(no_guess)
+        return self.state()
+
+    def reveal(self, x, y):
+        """Exposes the tile at (X, Y), as a left click does. See self.move."""
+        return self.move(REVEAL, x, y)
+
+    def flag(self, x, y):
+        """Flags the tile at (X, Y), or unflags it if it is flagged, as a right click does. See
+        self.move."""
+        return self.move(FLAG, x, y)
+
+    def chord(self, x, y):
+        """Exposes the unflagged neighbors of the number at (X, Y), as a middle click does. See
+        self.move."""
+        return self.move(CHORD, x, y)
+
+    def move(self, action, x, y):
+        """Makes the move of type ACTION at (X, Y). The bombs are placed by the first tile exposed,
+        in the same way as on a Canvas, so the first move is always safe.
+
+        Args:
+            action -- REVEAL, FLAG or CHORD. FLAG unflags a tile that is already flagged.
+            x -- the x-coordinate of the tile measured from the left
+            y -- the y-cooridnate of the tile measured from the top
+
+        Returns:
+            A dict with the "changed" tiles, a list of [x, y, symbol] lists, and the "status"
+            and "flags" of the game
+
+        Raises:
+            ValueError: no game has been started, or (X, Y) is not a tile on the board
+        """
+        board = self.board
+        if board is None:
+            raise ValueError("No game has been started.")
+        x, y = _integer(x, "x"), _integer(y, "y")
+        if not (0 <= x < board.width and 0 <= y < board.height):
+            raise ValueError("(%d, %d) is not on the %dx%d board." % (x, y, board.width, board.height))
+        changed = []
+        if not board.game_over:
+            if action == FLAG and board.is_flagged(x, y):
+                action = UNFLAG
+            if action == REVEAL and not board.generated and not board.is_flagged(x, y):
+                self._randomize_around_start(x, y)
+            changed = apply_move(board, action, x, y)
+        table = self._table()
+        width = board.width
+        response = self._summary()
+        response["changed"] = [[index % width, index // width, chr(table[board.cells[index]])]
+                               for index in changed]
+        # Losing shows every bomb, so the whole board is sent as well
+        if board.game_over and not board.game_won and changed:
+            response["board"] = self._rows()
+        return response
+
+    def state(self):
+        """Returns a dict describing the current game: the size of the board, its number of bombs
+        and seed, the "status" and "flags" of the game, and the "board" as a list of strings, one
+        per row, of the SYMBOLS of its tiles.
+
+        Raises:
+            ValueError: no game has been started
+        """
+        board = self.board
+        if board is None:
+            raise ValueError("No game has been started.")
+        response = {"mode": self.mode, "width": board.width, "height": board.height,
+                    "bombs": board.num_bombs, "seed": board.seed, "no_guess": self.no_guess}
+        response.update(self._summary())
+        response["board"] = self._rows()
+        return response
+
+    def handle(self, request):
+        """Carries out REQUEST, a dict with an "action" and its arguments, as described at the top
+        of this module.
+
+        Returns:
+            A dict; the response, with "ok" set to whether or not the request succeeded
+        """
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "A request must be a JSON object."}
+        try:
+            action = request.get("action")
+            if action == "new-game":
+                response = self.new_game(request.get("mode", "Medium"), request.get("width"),
+                                         request.get("height"), request.get("bombs"),
+                                         request.get("seed"), request.get("no_guess", False))
+            elif action in _MOVES:
+                response = self.move(_MOVES[action], request["x"], request["y"])
+            elif action == "state":
+                response = self.state()
+            else:
+                raise ValueError("Unknown action %r." % (action,))
+        except KeyError as e:
+            response = {"ok": False, "error": "Missing argument %s." % e}
+        except (ValueError, TypeError, OverflowError) as e:
+            response = {"ok": False, "error": str(e)}
+        else:
+            response["ok"] = True
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def handle_line(self, line):
+        """Carries out the request encoded as a JSON object in LINE, and returns the response
+        encoded as a JSON line."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"ok": False, "error": "Invalid JSON: %s" % e}
+        else:
+            response = self.handle(request)
+        return json.dumps(response, separators = (",", ":")) + "\n"
+
+    def _randomize_around_start(self, x, y):
+        """Places the bombs on the board so that the first move, made at (X, Y), is not a bomb,
+        and the board can be solved from there without guessing if self.no_guess is True. See
+        Canvas._randomize_around_start."""
+        if self.no_guess and self.board.width * self.board.height <= MAX_NO_GUESS_TILES:
+            generate_no_guess(self.board, x, y)
+        else:
+            self.board._randomize_around_start(x, y)
+
+    def _table(self):
+        """Returns the translation table from tiles to their SYMBOLS in the current game."""
+        if self.board.game_over and not self.board.game_won:
+            return _LOST_TABLE
+        return _PLAYING_TABLE
+
+    def _summary(self):
+        """Returns a dict with the "status" of the game, which is "new" before the first move,
+        then "playing", "won" or "lost", and the number of "flags" placed."""
+        board = self.board
+        if board.game_won:
+            status = "won"
+        elif board.game_over:
+            status = "lost"
+        elif board.first_move_made:
+            status = "playing"
+        else:
+            status = "new"
+        return {"status": status, "flags": board.num_flagged}
+
+    def _rows(self):
+        """Returns a list of strings, one per row of the board, of the SYMBOLS of its tiles."""
+        symbols = self.board.cells.translate(self._table()).decode("ascii")
+        width = self.board.width
+        return [symbols[i:i + width] for i in range(0, len(symbols), width)]
+
+def serve_stream(infile, outfile):
+    """Plays one Session with the requests read from INFILE, one per line, writing each response
+    to OUTFILE as soon as it is ready. Returns once INFILE is exhausted.
+
+    Args:
+        infile -- A text file-like object to read the requests from
+        outfile -- A text file-like object to write the responses to
+    """
+    session = Session()
+    for line in infile:
+        if line.strip():
+            outfile.write(session.handle_line(line))
+            outfile.flush()
+
+def _is_quick(session, line):
+    """Returns a boolean; whether or not the request in LINE can be handled by SESSION without
+    holding up the other connections. New games, and any request on a board of THREAD_TILES
+    tiles or more, are not quick."""
+    board = session.board
+    if board is None or len(board.cells) >= THREAD_TILES:
+        return False
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return True
+    return not isinstance(request, dict) or request.get("action") != "new-game"
+
+async def _serve_connection(reader, writer):
+    """Plays one Session with the requests sent over a connection, until it is closed.
+
+    Args:
+        reader -- An asyncio.StreamReader; the requests sent by the client
+        writer -- An asyncio.StreamWriter; the responses sent to the client
+    """
+    session = Session()
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            line = await _read_line(reader)
+            if line is None:
+                error = "Requests must be at most %d bytes long." % MAX_REQUEST_BYTES
+                response = json.dumps({"ok": False, "error": error}, separators = (",", ":")) + "\n"
+                writer.write(response.encode())
+                await writer.drain()
+                continue
+            if not line:
+                break
+            if not line.strip():
+                continue
+            if _is_quick(session, line):
+                response = session.handle_line(line)
+            else:
+                # Each connection waits for its own response, so its Session is never used by
+                # two threads at once
+                response = await loop.run_in_executor(None, session.handle_line, line)
+            writer.write(response.encode())
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def _read_line(reader):
+    """Reads the next line sent to READER, as reader.readline() does, but skips the rest of a line
+    that is longer than the limit of READER rather than failing.
+
+    Args:
+        reader -- An asyncio.StreamReader; the requests sent by the client
+
+    Returns:
+        A bytes object; the line, which is empty once the connection is closed. None if the line
+        was too long, and has been skipped.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        # The connection was closed, after a last line with no newline if e.partial is not empty
+        return e.partial
+    except asyncio.LimitOverrunError as e:
+        consumed = e.consumed
+    # The part of the line that has arrived is dropped, until its newline turns up
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+
+async def serve_socket(port = None, path = None):
+    """Accepts connections on PORT of HOST, or on the Unix socket at PATH, and plays a separate
+    Session over each of them. Every session is served by the same event loop, and runs until
+    the server is stopped.
+
+    Args:
+        port -- An integer; the port to listen on, or None to listen on PATH
+        path -- A string; the filepath of the Unix socket to listen on
+    """
+    if port is None:
+        server = await asyncio.start_unix_server(_serve_connection, path, limit = MAX_REQUEST_BYTES)
+    else:
+        server = await asyncio.start_server(_serve_connection, HOST, port, limit = MAX_REQUEST_BYTES)
+    for sock in server.sockets:
+        print("Listening on %s" % (sock.getsockname(),), file = sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+def main(argv = None):
+    """Serves games over standard input and output, or over the socket named in the command line
+    arguments ARGV."""
+    parser = argparse.ArgumentParser(description = "Play minesweeper with JSON lines.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--port", type = int, help = "listen for connections on this port of %s" % HOST)
+    group.add_argument("--unix", help = "listen for connections on the Unix socket at this filepath")
+    args = parser.parse_args(argv)
+
+    if args.port is None and args.unix is None:
+        serve_stream(sys.stdin, sys.stdout)
+        return
+    try:
+        asyncio.run(serve_socket(args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
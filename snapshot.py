@@ -0,0 +1,99 @@
+"""This module saves a game in progress to a compact snapshot, so that it can be resumed the next
+time the game is started.
+
+A snapshot file starts with FILE_HEADER, followed by a SNAPSHOT_RECORD, the name of the mode, and
+three bitsets packed with pack_bits: the bombs, the exposed tiles and the flagged tiles. The
+numbers of surrounding bombs are not saved, since they are recomputed from the bombs when the
+snapshot is loaded, so a snapshot takes three bits per tile. The file is replaced atomically.
+"""
+
+import os
+import struct
+from board import Board, NO_SEED, pack_bits, unpack_bits
+
+"""Global Variables:
+
+FILE_HEADER: The first bytes of a snapshot file
+SNAPSHOT_RECORD: The layout of the start of a snapshot; the width, height, number of bombs and seed
+of the board (NO_SEED if the seed did not place its bombs), the time in milliseconds the game has been played for, whether or not the board was
+generated without guessing, and the length in bytes of the name of the mode
+"""
+
+FILE_HEADER = b"MSSNAP01\n"
+SNAPSHOT_RECORD = struct.Struct("<HHIQQ?B")
+
+class Snapshot:
+    """A Snapshot object stores a game in progress.
+
+    mode -- the difficulty the game was played on; "Easy", "Medium", "Hard" or CUSTOM
+    no_guess -- whether or not the board was generated so that it can be solved without guessing
+    elapsed_ms -- the time in milliseconds the game has been played for
+    board -- the Board the game is played on. Its bombs must have been placed.
+    """
+    __slots__ = ("mode", "no_guess", "elapsed_ms", "board")
+
+    def __init__(self, mode, no_guess, elapsed_ms, board):
+        """Create a Snapshot of the game played on BOARD in MODE for ELAPSED_MS milliseconds.
+        NO_GUESS is True if the board was generated so that it can be solved without guessing."""
+        self.mode = mode
+        self.no_guess = no_guess
+        self.elapsed_ms = elapsed_ms
+        self.board = board
+
+def save_snapshot(snapshot, path):
+    """Writes SNAPSHOT to PATH. The file is written to a temporary file first, which then replaces
+    PATH, so that a crash never leaves it half written.
+
+    Args:
+        snapshot -- A Snapshot; the game to save
+        path -- A string; the filepath to save the game to
+    """
+    board = snapshot.board
+    name = snapshot.mode.encode()
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(FILE_HEADER)
+        f.write(SNAPSHOT_RECORD.pack(board.width, board.height, board.num_bombs,
+                                     NO_SEED if board.seed is None else board.seed,
+                                     snapshot.elapsed_ms, snapshot.no_guess, len(name)))
+        f.write(name)
+        f.write(pack_bits(board.mine_layout()))
+        f.write(pack_bits(board.exposed_layout()))
+        f.write(pack_bits(board.flag_layout()))
+    os.replace(temporary, path)
+
+def load_snapshot(path):
+    """Reads the snapshot saved at PATH, and rebuilds its board.
+
+    Args:
+        path -- A string; the filepath the game was saved to
+
+    Returns:
+        A Snapshot, or None if there is no snapshot at PATH or it cannot be read
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    offset = len(FILE_HEADER) + SNAPSHOT_RECORD.size
+    if not data.startswith(FILE_HEADER) or len(data) < offset:
+        return None
+    width, height, num_bombs, seed, elapsed_ms, no_guess, length = \
+        SNAPSHOT_RECORD.unpack_from(data, len(FILE_HEADER))
+    size = width * height
+    packed = (size + 7) // 8
+    if len(data) != offset + length + 3 * packed:
+        return None
+    mode = data[offset:offset + length].decode(errors = "replace")
+    offset += length
+    mines, exposed, flagged = (unpack_bits(data[offset + i * packed:offset + (i + 1) * packed], size)
+                               for i in range(3))
+    if seed == NO_SEED:
+        board = Board(width, height, num_bombs)
+        board.seed = None
+    else:
+        board = Board(width, height, num_bombs, seed)
+    board.set_mine_layout(mines)
+    board.restore_state(exposed, flagged)
+    return Snapshot(mode, no_guess, elapsed_ms, board)
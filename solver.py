@@ -0,0 +1,358 @@
+"""This module contains a deterministic minesweeper solver, and a generator that uses it to
+create boards that can be solved from the first move without ever guessing.
+
+The solver plays a Board the way a player would: it only looks at the number of bombs
+surrounding the tiles it has exposed. It combines the single point rules (a tile whose
+remaining bombs are zero, or equal to its number of unknown neighbors) with a subset rule
+over pairs of overlapping constraints on the frontier, and the global bomb count.
+
+The solver is incremental. Each exposed tile keeps a running count of its unknown neighbors
+and its remaining bombs, and only the constraints that changed since they were last checked
+are re-examined, rather than rescanning the whole frontier after every deduction.
+"""
+
+from board import DX, DY, COUNT_SHIFT, COUNT_ONE
+from board import MINE as BOMB
+
+"""Global Variables:
+
+UNKNOWN: The solver has not deduced anything about the tile
+SAFE: The solver has deduced that the tile is safe, and has exposed it
+MINE: The solver has deduced that the tile is a bomb
+MAX_ATTEMPTS: The number of random layouts generate_no_guess tries before giving up
+MAX_REPAIRS: The number of bombs generate_no_guess moves in a layout before trying
+a new one
+"""
+
+UNKNOWN = 0
+SAFE = 1
+MINE = 2
+MAX_ATTEMPTS = 50
+MAX_REPAIRS = 60
+
+# Neighbor tables are shared between every solver for boards of the same size
+_neighbor_tables = {}
+
+def neighbor_table(width, height):
+    """Returns a list that stores, for each tile index of a WIDTH by HEIGHT board, a tuple of
+    the indices of the tiles surrounding it. Tables are cached, since generating a board
+    solves many layouts of the same size.
+
+    Args:
+        width -- An integer; number of tiles wide
+        height -- An integer; number of tiles high
+
+    Returns:
+        A list of tuples of integers
+    """
+    key = (width, height)
+    if key not in _neighbor_tables:
+        table = []
+        for y in range(height):
+            for x in range(width):
+                table.append(tuple((y + DY[i]) * width + x + DX[i] for i in range(len(DY))
+                                   if 0 <= x + DX[i] < width and 0 <= y + DY[i] < height))
+        _neighbor_tables[key] = table
+    return _neighbor_tables[key]
+
+class Solver:
+    """A Solver object that attempts to solve a Board without guessing.
+
+    board -- the Board being solved. Its bombs must have been placed already.
+    neighbors -- the neighbor table of the board
+    known -- a bytearray with one entry per tile; UNKNOWN, SAFE or MINE
+    mines_left -- a list with one entry per tile; for exposed tiles, the number of
+    surrounding bombs that have not been deduced yet
+    unknown_left -- a list with one entry per tile; for exposed tiles, the number of
+    surrounding tiles that are still UNKNOWN
+    num_safe -- the number of tiles the solver has exposed
+    num_mines -- the number of bombs the solver has deduced
+    safe_queue -- the tiles that have been deduced to be safe, but not exposed yet
+    mine_queue -- the tiles that have been deduced to be bombs, but not marked yet
+    dirty -- the exposed tiles whose constraint changed since the single point rules were
+    last applied to them
+    pair_dirty -- the exposed tiles whose constraint changed since the subset rule was last
+    applied to them
+    """
+    def __init__(self, board):
+        """Create a Solver for BOARD, which has not had any tiles exposed yet.
+
+        board -- A Board; the board to solve
+        """
+        self.board = board
+        size = board.width * board.height
+        self.neighbors = neighbor_table(board.width, board.height)
+        self.known = bytearray(size)
+        self.mines_left = [0] * size
+        self.unknown_left = [0] * size
+        self.num_safe = 0
+        self.num_mines = 0
+        self.safe_queue = []
+        self.mine_queue = []
+        self.dirty = set()
+        self.pair_dirty = set()
+
+    def is_solved(self):
+        """Returns a boolean that represents whether or not every safe tile has been exposed"""
+        return self.num_safe == len(self.known) - self.board.num_bombs
+
+    def solve(self, start = None):
+        """Exposes the tile at index START, if given, and then makes every deduction possible.
+
+        Args:
+            start -- An integer; the index of the first move, or None to continue solving
+
+        Returns:
+            A boolean; whether or not the board was solved without guessing
+        """
+        if start is not None:
+            self.safe_queue.append(start)
+        while True:
+            self._propagate()
+            if self.is_solved():
+                return True
+            if self._apply_subset_rule() or self._apply_global_rule():
+                continue
+            return False
+
+    def frontier(self):
+        """Returns a list of the indices of the UNKNOWN tiles that border an exposed tile"""
+        known, neighbors = self.known, self.neighbors
+        return [i for i in range(len(known)) if known[i] == UNKNOWN
+                and any(known[n] == SAFE for n in neighbors[i])]
+
+    def guess(self):
+        """Chooses the UNKNOWN tile that is least likely to be a bomb, for when the solver is stuck.
+        The chance that a tile on the frontier is a bomb is estimated by the most constrained
+        exposed tile around it, and the chance for every other tile by the density of the bombs
+        that have not been found yet. Ties are broken with board.rng.
+
+        Returns:
+            An integer; the index of the tile to guess
+        """
+        known, neighbors = self.known, self.neighbors
+        mines_left, unknown_left = self.mines_left, self.unknown_left
+        unknown = len(known) - self.num_safe - self.num_mines
+        best, best_chance = [], 2.0
+        frontier = self.frontier()
+        for i in frontier:
+            chance = max(mines_left[n] / unknown_left[n] for n in neighbors[i] if known[n] == SAFE)
+            if chance < best_chance:
+                best, best_chance = [i], chance
+            elif chance == best_chance:
+                best.append(i)
+        if unknown > len(frontier):
+            # Every tile off the frontier is equally likely to be a bomb
+            density = (self.board.num_bombs - self.num_mines) / unknown
+            if density < best_chance:
+                on_frontier = set(frontier)
+                best = [i for i in range(len(known)) if known[i] == UNKNOWN and i not in on_frontier]
+        return self.board.rng.choice(best)
+
+    def refresh(self, indices):
+        """Recomputes the constraints of the exposed tiles among INDICES. To be used after the
+        number of bombs surrounding those tiles has changed."""
+        known, cells = self.known, self.board.cells
+        for i in indices:
+            if known[i] != SAFE:
+                continue
+            self.mines_left[i] = (cells[i] >> COUNT_SHIFT) - sum(known[n] == MINE for n in self.neighbors[i])
+            self.dirty.add(i)
+            self.pair_dirty.add(i)
+
+    def _expose(self, index):
+        """Exposes the tile at INDEX, which has been deduced to be safe."""
+        assert not self.board.cells[index] & BOMB, "Solver exposed a bomb."
+        known, neighbors, unknown_left = self.known, self.neighbors, self.unknown_left
+        known[index] = SAFE
+        self.num_safe += 1
+        unknown = 0
+        mines = 0
+        for n in neighbors[index]:
+            state = known[n]
+            if state == UNKNOWN:
+                unknown += 1
+            elif state == MINE:
+                mines += 1
+            else:
+                # This tile is no longer unknown to the exposed tiles around it
+                unknown_left[n] -= 1
+                self.dirty.add(n)
+        unknown_left[index] = unknown
+        self.mines_left[index] = (self.board.cells[index] >> COUNT_SHIFT) - mines
+        if unknown:
+            self.dirty.add(index)
+
+    def _mark_mine(self, index):
+        """Marks the tile at INDEX, which has been deduced to be a bomb."""
+        known, unknown_left, mines_left = self.known, self.unknown_left, self.mines_left
+        known[index] = MINE
+        self.num_mines += 1
+        for n in self.neighbors[index]:
+            if known[n] == SAFE:
+                unknown_left[n] -= 1
+                mines_left[n] -= 1
+                self.dirty.add(n)
+
+    def _propagate(self):
+        """Applies the single point rules until no more deductions can be made."""
+        known, neighbors = self.known, self.neighbors
+        safe_queue, mine_queue, dirty = self.safe_queue, self.mine_queue, self.dirty
+        while safe_queue or mine_queue or dirty:
+            while safe_queue:
+                index = safe_queue.pop()
+                if known[index] == UNKNOWN:
+                    self._expose(index)
+            while mine_queue:
+                index = mine_queue.pop()
+                if known[index] == UNKNOWN:
+                    self._mark_mine(index)
+            if dirty:
+                index = dirty.pop()
+                unknown = self.unknown_left[index]
+                if unknown == 0:
+                    continue
+                self.pair_dirty.add(index)
+                mines = self.mines_left[index]
+                # Either every unknown neighbor is safe, or every unknown neighbor is a bomb
+                if mines == 0:
+                    safe_queue.extend(n for n in neighbors[index] if known[n] == UNKNOWN)
+                elif mines == unknown:
+                    mine_queue.extend(n for n in neighbors[index] if known[n] == UNKNOWN)
+
+    def _apply_subset_rule(self):
+        """Compares each changed constraint against every constraint that shares an unknown tile
+        with it. If constraint A has exactly as many more bombs than constraint B as it has
+        tiles that B does not, then those tiles are bombs and the tiles only in B are safe.
+        This covers both the case where one constraint is a subset of the other and the
+        common overlapping patterns.
+
+        Returns:
+            A boolean; whether or not any deductions were made
+        """
+        known, neighbors = self.known, self.neighbors
+        mines_left, unknown_left = self.mines_left, self.unknown_left
+        candidates = self.pair_dirty
+        self.pair_dirty = set()
+        progress = False
+        for a in candidates:
+            if unknown_left[a] == 0:
+                continue
+            unknown_a = {n for n in neighbors[a] if known[n] == UNKNOWN}
+            others = set()
+            for u in unknown_a:
+                for b in neighbors[u]:
+                    if b != a and known[b] == SAFE and unknown_left[b]:
+                        others.add(b)
+            for b in others:
+                unknown_b = {n for n in neighbors[b] if known[n] == UNKNOWN}
+                only_a = unknown_a - unknown_b
+                only_b = unknown_b - unknown_a
+                difference = mines_left[a] - mines_left[b]
+                if difference == len(only_a) and (only_a or only_b):
+                    self.mine_queue.extend(only_a)
+                    self.safe_queue.extend(only_b)
+                    progress = True
+                elif -difference == len(only_b) and (only_a or only_b):
+                    self.mine_queue.extend(only_b)
+                    self.safe_queue.extend(only_a)
+                    progress = True
+        return progress
+
+    def _apply_global_rule(self):
+        """Uses the total number of bombs: if every bomb has been found, the remaining tiles
+        are safe, and if there are as many bombs left as unknown tiles, they are all bombs.
+
+        Returns:
+            A boolean; whether or not any deductions were made
+        """
+        unknown = len(self.known) - self.num_safe - self.num_mines
+        mines = self.board.num_bombs - self.num_mines
+        if unknown == 0 or (mines != 0 and mines != unknown):
+            return False
+        queue = self.safe_queue if mines == 0 else self.mine_queue
+        queue.extend(i for i in range(len(self.known)) if self.known[i] == UNKNOWN)
+        return True
+
+def _move_bomb(board, neighbors, source, destination):
+    """Moves the bomb at index SOURCE of BOARD to the safe tile at index DESTINATION, and updates
+    the number of bombs surrounding the tiles around both."""
+    cells = board.cells
+    cells[source] &= ~BOMB
+    cells[destination] |= BOMB
+    for n in neighbors[source]:
+        cells[n] -= COUNT_ONE
+    for n in neighbors[destination]:
+        cells[n] += COUNT_ONE
+
+def _repair(board, solver):
+    """Changes the layout of BOARD where SOLVER got stuck, by moving a bomb between the frontier
+    and the unknown tiles that do not border any exposed tile. Every deduction the solver has
+    made is still true afterwards, since only UNKNOWN tiles are changed.
+
+    Returns:
+        A boolean; whether or not a bomb could be moved
+    """
+    known, neighbors = solver.known, solver.neighbors
+    mines = board.mine_layout()
+    frontier = solver.frontier()
+    on_frontier = set(frontier)
+    interior = [i for i in range(len(known)) if known[i] == UNKNOWN and i not in on_frontier]
+    frontier_bombs = [i for i in frontier if mines[i]]
+    interior_safe = [i for i in interior if not mines[i]]
+    if frontier_bombs and interior_safe:
+        source, destination = board.rng.choice(frontier_bombs), board.rng.choice(interior_safe)
+    else:
+        interior_bombs = [i for i in interior if mines[i]]
+        frontier_safe = [i for i in frontier if not mines[i]]
+        if not interior_bombs or not frontier_safe:
+            return False
+        source, destination = board.rng.choice(interior_bombs), board.rng.choice(frontier_safe)
+    _move_bomb(board, neighbors, source, destination)
+    solver.refresh(neighbors[source] + neighbors[destination])
+    return True
+
+def generate_no_guess(board, x, y, max_attempts = MAX_ATTEMPTS, max_repairs = MAX_REPAIRS):
+    """Places the bombs on BOARD so that it can be solved without guessing, starting with the
+    tile at (X, Y). Each attempt starts from a random layout that is safe around (X, Y). Whenever
+    the solver gets stuck, a bomb is moved out of (or into) the part of the frontier it is stuck
+    on and solving continues. Since moving a bomb changes numbers that earlier deductions may
+    have relied on, a repaired layout is solved again from scratch before it is accepted.
+
+    If no such layout is found, BOARD is left with a regular random layout around (X, Y). All of
+    the randomness comes from board.rng, so the same seed always generates the same board.
+
+    Args:
+        board -- A Board; a board whose bombs have not been placed yet
+        x -- the x-coordinate of the first move measured from the left
+        y -- the y-cooridnate of the first move measured from the top
+        max_attempts -- An integer; the number of random layouts to try
+        max_repairs -- An integer; the number of bombs to move in each layout
+
+    Returns:
+        A boolean; whether or not a layout that can be solved without guessing was found
+    """
+    start = board.index(x, y)
+    for attempt in range(max_attempts):
+        board._randomize_around_start(x, y)
+        solver = Solver(board)
+        solved = solver.solve(start)
+        repaired = False
+        for repair in range(max_repairs):
+            if solved:
+                if not repaired:
+                    return True
+                # Check that the repaired layout can be solved by a player who never saw
+                # the original one
+                solver = Solver(board)
+                if solver.solve(start):
+                    return True
+                repaired = False
+            if not _repair(board, solver):
+                break
+            repaired = True
+            solved = solver.solve()
+        if solved and not repaired:
+            return True
+    board._randomize_around_start(x, y)
+    return False
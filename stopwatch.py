@@ -1,34 +1,52 @@
+import time
 from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QLabel, QWidget, QHBoxLayout
 from PyQt6.QtGui import QFont, QPixmap
 
+"""Global Variables:
+
+REFRESH_INTERVAL: The default time in milliseconds between two refreshes of the displayed time
+"""
+
+REFRESH_INTERVAL = 200
+
 class Watch(QLabel):
     """A Watch object that provides the text for the StopWatch object. 
-    The text displayed is updated every second to display the current time.
+    The time is measured with time.perf_counter_ns from the moment the watch is started, so it
+    does not drift when the event loop is busy, and the display is only refreshed by a separate
+    QTimer every refresh_interval milliseconds. The display timer is paused while the watch is
+    hidden, since nothing needs to be redrawn then.
 
     Attributes:
-        current_time -- the current time to display
-        timeout -- the time up to which the stopwatch goes
-        timer -- a QTimer object used to update self.current_time each second
+        current_time -- the current time to display, in whole seconds
+        timeout -- the time in seconds up to which the stopwatch goes
+        refresh_interval -- the time in milliseconds between two refreshes of the display
+        timer -- a QTimer object used to refresh the display
         format -- the format to use when displaying the time
     """
-    def __init__(self, timeout, text_size, parent = None):
+    def __init__(self, timeout, text_size, parent = None, refresh_interval = REFRESH_INTERVAL):
         """Create a Watch that stops at TIMEOUT and displays the time using font size equal to 
         TEXT_SIZE. Text is formatted to use up as many digits as TIMEOUT. For example, if
         TIMEOUT is 567, the object will display three digits (i.e. if the current time is 7 seconds, 
-        '007' will be displayed)
+        '007' will be displayed). The display is refreshed every REFRESH_INTERVAL milliseconds.
 
         timeout -- An integer; the value at which the Watch will stop
         text_size -- An integer; the size at which to display the text
+        refresh_interval -- An integer; the time in milliseconds between refreshes of the display
         """
         super().__init__(parent)
         self.current_time = 0
         self.timeout = timeout
-        # If self.timeout has N digits, the code below sets the format to {:0Nd}
+        self.refresh_interval = refresh_interval
+        # If self.timeout has N digits, the code below sets the format to {:0N}
         self.format = '{:0' + str(len(str(self.timeout))) + 'd}' 
+        # The time measured before the watch was last started, in nanoseconds
+        self._elapsed_ns = 0
+        # The time.perf_counter_ns() at which the watch was last started, or None if it is stopped
+        self._start_ns = None
         
         self.timer = QTimer(self)
-        self.timer.setInterval(1000)
+        self.timer.setInterval(refresh_interval)
         self.timer.timeout.connect(self._update_time)
 
         font = QFont()
@@ -37,35 +55,74 @@ class Watch(QLabel):
         self.setText(self.format.format(self.current_time))
     
     def _start_time(self):
-        """Starts time by starting the QTimer"""
-        self.timer.start()
+        """Starts time, and starts refreshing the display"""
+        if self._start_ns is None:
+            self._start_ns = time.perf_counter_ns()
+        if self.isVisible():
+            self.timer.start()
     
     def _stop_time(self):
-        """Stops time by freezing the display"""
+        """Stops time and freezes the display"""
+        if self._start_ns is not None:
+            self._elapsed_ns += time.perf_counter_ns() - self._start_ns
+            self._start_ns = None
         self.timer.stop()
+        self._update_time()
     
     def _reset_time(self):
         """Resets the watch, updates the displayed text and stops time."""
-        # Necessary to set self.current_time to -1, since 1 is added to 
-        # self.current_time before updating display in self._update_time()
-        self.current_time = -1
-        self._update_time()
+        self._elapsed_ns = 0
+        self._start_ns = None
         self.timer.stop()
+        self._update_time()
     
     def _get_time(self):
-        """Returns the current time displayed."""
-        return self.current_time
+        """Returns the current time, in whole seconds."""
+        return self._get_time_ms() // 1000
+
+    def _get_time_ms(self):
+        """Returns the current time in milliseconds, up to the timeout."""
+        elapsed = self._elapsed_ns
+        if self._start_ns is not None:
+            elapsed += time.perf_counter_ns() - self._start_ns
+        return min(elapsed // 1000000, self.timeout * 1000)
+
+    def _set_time_ms(self, milliseconds):
+        """Sets the current time to MILLISECONDS and updates the display, without starting time."""
+        self._elapsed_ns = milliseconds * 1000000
+        if self._start_ns is not None:
+            self._start_ns = time.perf_counter_ns()
+        self._update_time()
     
     def _update_time(self):
-        """Adds 1 second to the current time and updates the display"""
-        # Stop the watch once it reaches the timeout
-        if self.current_time == self.timeout:
-            self.timer.stop() 
-            return
+        """Updates the display to the current time"""
+        seconds = self._get_time()
+        # Stop refreshing the display once the watch reaches the timeout
+        if seconds >= self.timeout:
+            self.timer.stop()
+        if seconds != self.current_time or self.text() == "":
+            self.current_time = seconds
+            self.setText(self.format.format(self.current_time))
 
-        self.current_time += 1
-        self.setText(self.format.format(self.current_time))
-        self.update() 
+    def showEvent(self, event):
+        """Starts refreshing the display again when the watch is shown, if time is running.
+
+        Args:
+            event -- A QShowEvent to handle
+        """
+        if self._start_ns is not None:
+            self._update_time()
+            self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Stops refreshing the display while the watch is hidden. Time keeps running.
+
+        Args:
+            event -- A QHideEvent to handle
+        """
+        self.timer.stop()
+        super().hideEvent(event)
 
 class StopWatch(QWidget):
     """A StopWatch object that displays the text provided in the Watch object 
@@ -74,17 +131,19 @@ class StopWatch(QWidget):
     Attributes:
         watch -- A watch object to display
     """
-    def __init__(self, timeout, icon, icon_size = 30, text_size = 15):
+    def __init__(self, timeout, icon, icon_size = 30, text_size = 15, refresh_interval = REFRESH_INTERVAL):
         """Create a StopWatch that stops at TIMEOUT and displays the time using font size equal to 
-        TEXT_SIZE next to the provided ICON after rescaling to ICON_SIZE
+        TEXT_SIZE next to the provided ICON after rescaling to ICON_SIZE. The displayed time is
+        refreshed every REFRESH_INTERVAL milliseconds.
 
         timeout -- An integer; the value at which the watch will stop
         text_size -- An integer; the size at which to display the text
         icon -- A string; the filepath to the icon represented as a string
         icon_size -- An integer; the size at which to display ICON
+        refresh_interval -- An integer; the time in milliseconds between refreshes of the display
         """
         super().__init__()
-        self.watch = Watch(timeout, text_size)
+        self.watch = Watch(timeout, text_size, refresh_interval = refresh_interval)
 
         icon_widget = QLabel()
         icon_widget.setPixmap(QPixmap(icon).scaled(icon_size, icon_size))
@@ -108,5 +167,13 @@ class StopWatch(QWidget):
         self.watch._reset_time()
     
     def get_time(self):
-        """Return current time"""
+        """Return current time, in whole seconds"""
         return self.watch._get_time()
+
+    def get_time_ms(self):
+        """Return current time, in milliseconds"""
+        return self.watch._get_time_ms()
+
+    def set_time_ms(self, milliseconds):
+        """Sets the current time to MILLISECONDS, such as when resuming a saved game"""
+        self.watch._set_time_ms(milliseconds)
@@ -0,0 +1,28 @@
+"""Shared helpers for the tests. The game's modules live at the top of the repository rather than
+in a package, so that directory is put on the import path here."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board
+
+# A small board with a region of zeros on the left, and numbers on the right that it does not reach
+ROWS = [".....",
+        "...*.",
+        ".....",
+        "....*",
+        "*...."]
+
+def make_board(rows):
+    """Returns a Board with the bombs of ROWS already placed.
+
+    Args:
+        rows -- A list of strings of equal length, one per row of the board, with "*" for a bomb
+        and "." for a safe tile
+    """
+    mines = bytes(1 if symbol == "*" else 0 for row in rows for symbol in row)
+    board = Board(len(rows[0]), len(rows), mines.count(1), 0)
+    board.set_mine_layout(mines)
+    return board
@@ -0,0 +1,171 @@
+"""Tests for the rules of the game in "board.py": exposing, floodfilling, flagging and chording
+tiles, winning and losing, the 3BV of a board, and the bitsets used to save boards."""
+
+import random
+import pytest
+import board as board_module
+from board import Board, MINE, EXPOSED, FLAGGED, COUNT_SHIFT, pack_bits, unpack_bits
+from conftest import ROWS, make_board
+
+def flood_reference(board, x, y):
+    """Returns the set of the indices of the tiles that exposing (X, Y) should expose, found by
+    visiting the neighbors of every zero one at a time."""
+    seen = {(x, y)}
+    stack = [(x, y)]
+    while stack:
+        x, y = stack.pop()
+        if board.get_num_bombs(x, y) == 0:
+            for neighbor in board.neighbors(x, y):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+    return {board.index(x, y) for x, y in seen}
+
+def three_bv_reference(board):
+    """Returns the 3BV of BOARD by floodfilling every region of zeros on a copy of it, and counting
+    one more click for every safe tile left over."""
+    copy = Board(board.width, board.height, board.num_bombs)
+    copy.set_mine_layout(board.mine_layout())
+    clicks = 0
+    for index in range(len(copy.cells)):
+        cell = copy.cells[index]
+        if not cell & (MINE | EXPOSED) and cell >> COUNT_SHIFT == 0:
+            copy.reveal(*copy.coordinates(index))
+            clicks += 1
+    return clicks + copy.safe_remaining
+
+def random_boards(count, max_size = 30):
+    """Yields COUNT boards of random sizes with randomly placed bombs."""
+    rng = random.Random(count)
+    for i in range(count):
+        width, height = rng.randint(1, max_size), rng.randint(1, max_size)
+        bombs = set(rng.sample(range(width * height), rng.randint(0, width * height - 1)))
+        yield make_board(["".join("*" if y * width + x in bombs else "." for x in range(width))
+                          for y in range(height)])
+
+def test_counts():
+    board = make_board(ROWS)
+    assert [board.get_num_bombs(x, 2) for x in range(5)] == [0, 0, 1, 2, 2]
+    assert board.get_num_bombs(0, 3) == 1
+
+def test_reveal_number():
+    board = make_board(ROWS)
+    assert board.reveal(2, 2) == [board.index(2, 2)]
+    assert board.is_exposed(2, 2) and board.first_move_made and not board.game_over
+    # Exposing a tile twice does nothing
+    assert board.reveal(2, 2) == []
+
+def test_reveal_floodfill():
+    board = make_board(ROWS)
+    revealed = board.reveal(0, 0)
+    assert len(revealed) == len(set(revealed))
+    assert set(revealed) == flood_reference(board, 0, 0)
+    assert all(board.is_exposed(*board.coordinates(i)) for i in revealed)
+
+def test_floodfill_matches_reference():
+    for board in random_boards(200):
+        zeros = [i for i, cell in enumerate(board.cells) if not cell & MINE and cell >> COUNT_SHIFT == 0]
+        if not zeros:
+            continue
+        x, y = board.coordinates(zeros[len(zeros) // 2])
+        revealed = board.reveal(x, y)
+        assert len(revealed) == len(set(revealed))
+        assert set(revealed) == flood_reference(board, x, y)
+
+def test_floodfill_removes_flags():
+    board = make_board(ROWS)
+    board.toggle_flag(0, 2)
+    assert board.num_flagged == 1
+    board.reveal(0, 0)
+    assert not board.is_flagged(0, 2) and board.num_flagged == 0
+
+def test_flagged_tile_cannot_be_exposed():
+    board = make_board(ROWS)
+    assert board.toggle_flag(3, 1)
+    assert board.reveal(3, 1) == []
+    assert not board.game_over
+
+def test_chord():
+    board = make_board(ROWS)
+    board.reveal(4, 2)
+    # Too few flags: nothing happens
+    assert board.chord(4, 2) == []
+    board.toggle_flag(3, 1)
+    board.toggle_flag(4, 3)
+    revealed = board.chord(4, 2)
+    assert set(revealed) == {board.index(4, 1), board.index(3, 2), board.index(3, 3)}
+    assert not board.game_over
+
+def test_chord_with_wrong_flag_loses():
+    board = make_board(ROWS)
+    board.reveal(4, 2)
+    board.toggle_flag(3, 1)
+    board.toggle_flag(3, 3)
+    board.chord(4, 2)
+    assert board.game_over and not board.game_won
+
+def test_loss():
+    board = make_board(ROWS)
+    assert board.reveal(3, 1) == [board.index(3, 1)]
+    assert board.game_over and not board.game_won
+    # No moves are made once the game is over
+    assert board.reveal(0, 0) == []
+    assert not board.toggle_flag(0, 0)
+
+def test_first_move_is_safe():
+    rng = random.Random(5)
+    for i in range(100):
+        width, height = rng.randint(1, 30), rng.randint(1, 30)
+        board = Board(width, height, rng.randint(0, width * height - 1))
+        x, y = rng.randrange(width), rng.randrange(height)
+        board.reveal(x, y)
+        assert board.is_safe(x, y) and board.is_exposed(x, y)
+        assert sum(1 for cell in board.cells if cell & MINE) == board.num_bombs
+
+def test_win():
+    board = make_board(ROWS)
+    board.reveal(0, 0)
+    assert not board.game_over
+    assert board.safe_remaining == 25 - 3 - len(flood_reference(board, 0, 0))
+    for index, cell in enumerate(board.cells):
+        if not cell & MINE:
+            board.reveal(*board.coordinates(index))
+    assert board.game_over and board.game_won and board.safe_remaining == 0
+
+def test_three_bv():
+    board = make_board(ROWS)
+    assert board.three_bv() == three_bv_reference(board)
+    for board in random_boards(300):
+        assert board.three_bv() == three_bv_reference(board)
+
+def test_same_layout_with_and_without_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    layouts = []
+    for use_numpy in (False, True):
+        monkeypatch.setattr(board_module, "USE_NUMPY", use_numpy)
+        monkeypatch.setattr(board_module, "NUMPY_MIN_TILES", 0)
+        board = Board(60, 50, 500, 1234)
+        board._randomize_around_start(30, 25)
+        layouts.append(bytes(board.cells))
+    assert layouts[0] == layouts[1]
+
+def test_pack_bits():
+    rng = random.Random(1)
+    for size in list(range(20)) + [63, 64, 65, 1000]:
+        values = bytes(rng.randrange(2) for i in range(size))
+        packed = pack_bits(values)
+        assert len(packed) == (size + 7) // 8
+        assert unpack_bits(packed, size) == values
+    # The first entry is stored in the least significant bit
+    assert pack_bits(b"\x01\x00\x00\x00\x00\x00\x00\x00\x01") == b"\x01\x01"
+
+def test_restore_state():
+    board = make_board(ROWS)
+    board.reveal(0, 0)
+    board.toggle_flag(3, 1)
+    restored = make_board(ROWS)
+    restored.restore_state(board.exposed_layout(), board.flag_layout())
+    assert restored.cells == board.cells
+    assert (restored.num_flagged, restored.safe_remaining) == (board.num_flagged, board.safe_remaining)
+    assert restored.first_move_made
+    assert restored.cells[restored.index(3, 1)] & FLAGGED
@@ -0,0 +1,82 @@
+"""Tests for the chances worked out by the HintEngine in "hints.py", which are checked against
+every layout of the bombs that fits the numbers on small boards."""
+
+import itertools
+import math
+import random
+from board import Board, EXPOSED, COUNT_SHIFT
+from hints import HintEngine
+from modes import MAX_HINT_TILES
+
+def brute_force(board):
+    """Returns a dict mapping the index of each unexposed tile of BOARD to its chance of being a
+    bomb, found by trying every layout of the bombs on the unexposed tiles."""
+    cells = board.cells
+    numbers = [(i, [board.index(x, y) for x, y in board.neighbors(*board.coordinates(i))])
+               for i in range(len(cells)) if cells[i] & EXPOSED]
+    unknown = [i for i in range(len(cells)) if not cells[i] & EXPOSED]
+    totals = dict.fromkeys(unknown, 0)
+    layouts = 0
+    for bombs in itertools.combinations(unknown, board.num_bombs):
+        bombs = set(bombs)
+        if all(sum(n in bombs for n in neighbors) == cells[i] >> COUNT_SHIFT for i, neighbors in numbers):
+            layouts += 1
+            for i in bombs:
+                totals[i] += 1
+    return {i: total / layouts for i, total in totals.items()}
+
+def test_exact_chances_match_brute_force():
+    rng = random.Random(7)
+    checked = 0
+    for seed in range(150):
+        width, height = rng.randint(3, 6), rng.randint(3, 6)
+        board = Board(width, height, rng.randint(1, width * height // 3), seed)
+        engine = HintEngine(board, seed)
+        engine.update(board.reveal(rng.randrange(width), rng.randrange(height)))
+        while not board.game_over and len(board.cells) - engine.num_exposed <= 14:
+            expected = brute_force(board)
+            chances, interior_chance = engine.probabilities()
+            assert all(component.exact for component in engine._components.values())
+            for index, chance in expected.items():
+                assert abs(chances.get(index, interior_chance) - chance) < 1e-9
+            index, chance = engine.hint()
+            assert abs(chance - min(expected.values())) < 1e-9
+            checked += 1
+            if not board.is_safe(*board.coordinates(index)):
+                break
+            engine.update(board.reveal(*board.coordinates(index)))
+    assert checked > 50
+
+def test_hints_leave_the_board_alone():
+    board = Board(30, 16, 99, 3)
+    engine = HintEngine(board, 1)
+    engine.update(board.reveal(15, 8))
+    state = board.rng.getstate()
+    engine.hint()
+    assert board.rng.getstate() == state
+
+def test_chances_on_a_large_board():
+    # The numbers of layouts on a board this size are far too large to fit in a float
+    board = Board(100, 100, 1600, 3)
+    engine = HintEngine(board, 1)
+    engine.update(board.reveal(50, 50))
+    chances, interior_chance = engine.probabilities()
+    assert 0 < interior_chance < 1
+    assert all(0 <= chance <= 1 for chance in chances.values())
+    index, chance = engine.hint()
+    assert chance < 1
+    if chance == 0:
+        assert board.is_safe(*board.coordinates(index))
+
+def test_hints_on_the_largest_board():
+    # The largest board that gets hints, with about as many bombs as make the counts of layouts largest
+    size = math.isqrt(MAX_HINT_TILES)
+    board = Board(size, size, MAX_HINT_TILES * 2 // 5, 5)
+    engine = HintEngine(board, 1)
+    engine.update(board.reveal(size // 2, size // 2))
+    for i in range(2):
+        index, chance = engine.hint()
+        assert 0 <= chance < 1
+        if not board.is_safe(*board.coordinates(index)):
+            break
+        engine.update(board.reveal(*board.coordinates(index)))
@@ -0,0 +1,111 @@
+"""Tests for saving games: the move log in "replay.py" and the snapshots in "snapshot.py"."""
+
+import io
+from board import Board, NO_SEED
+from replay import MoveLog, FILE_HEADER, REVEAL, FLAG, UNFLAG, CHORD, read_games, replay, apply_move
+from snapshot import Snapshot, save_snapshot, load_snapshot
+from conftest import ROWS, make_board
+
+def play(log, board, moves):
+    """Records a game on BOARD, and makes each (action, x, y) move of MOVES on it."""
+    log.new_game(board)
+    for action, x, y in moves:
+        log.move(action, x, y)
+        apply_move(board, action, x, y)
+
+def test_move_log_round_trip():
+    stream = io.BytesIO()
+    log = MoveLog(stream)
+    won = make_board(ROWS)
+    play(log, won, [(FLAG, 3, 1), (UNFLAG, 3, 1), (REVEAL, 0, 0), (REVEAL, 4, 2), (FLAG, 3, 1),
+                    (FLAG, 4, 3), (CHORD, 4, 2), (REVEAL, 3, 0), (REVEAL, 4, 0), (REVEAL, 4, 4)])
+    lost = make_board(ROWS)
+    play(log, lost, [(REVEAL, 2, 2), (REVEAL, 0, 4)])
+    stream.seek(0)
+    games = list(read_games(stream))
+    assert len(games) == 2
+    assert [move[:3] for move in games[1].moves] == [(REVEAL, 2, 2), (REVEAL, 0, 4)]
+    for game, board in zip(games, (won, lost)):
+        assert (game.width, game.height, game.num_bombs, game.seed) == \
+            (board.width, board.height, board.num_bombs, board.seed)
+        replayed = replay(game)
+        assert replayed.cells == board.cells
+        assert (replayed.game_over, replayed.game_won) == (board.game_over, board.game_won)
+    assert won.game_won and lost.game_over and not lost.game_won
+
+def test_move_log_unplaced_bombs():
+    # A game whose first move is a flag is recorded before its bombs are placed
+    stream = io.BytesIO()
+    log = MoveLog(stream)
+    board = Board(9, 9, 10, 42)
+    log.new_game(board)
+    log.move(FLAG, 0, 0)
+    board.toggle_flag(0, 0)
+    board.reveal(4, 4)
+    log.layout(board)
+    log.move(REVEAL, 4, 4)
+    stream.seek(0)
+    game, = read_games(stream)
+    assert replay(game).cells == board.cells
+
+def test_move_log_resumed_game():
+    board = make_board(ROWS)
+    board.reveal(0, 0)
+    board.toggle_flag(3, 1)
+    stream = io.BytesIO()
+    play(MoveLog(stream), board, [(REVEAL, 4, 2)])
+    stream.seek(0)
+    game, = read_games(stream)
+    assert game.exposed is not None
+    assert replay(game).cells == board.cells
+
+def test_move_log_without_seed():
+    board = make_board(ROWS)
+    board.seed = None
+    stream = io.BytesIO()
+    play(MoveLog(stream), board, [(REVEAL, 0, 0)])
+    assert NO_SEED.to_bytes(8, "little") in stream.getvalue()
+    stream.seek(0)
+    game, = read_games(stream)
+    assert game.seed is None
+    assert replay(game).cells == board.cells
+
+def test_move_log_cut_off():
+    stream = io.BytesIO()
+    play(MoveLog(stream), make_board(ROWS), [(REVEAL, 0, 0), (REVEAL, 4, 2)])
+    data = stream.getvalue()
+    # The last move was cut off by a crash, so only the first one is read
+    game, = read_games(io.BytesIO(data[:-2]))
+    assert [move[:3] for move in game.moves] == [(REVEAL, 0, 0)]
+    assert list(read_games(io.BytesIO(b"not a log"))) == []
+    assert data.startswith(FILE_HEADER)
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    board = make_board(ROWS)
+    board.reveal(0, 0)
+    board.toggle_flag(3, 1)
+    save_snapshot(Snapshot("Custom", True, 12345, board), path)
+    snapshot = load_snapshot(path)
+    assert (snapshot.mode, snapshot.no_guess, snapshot.elapsed_ms) == ("Custom", True, 12345)
+    loaded = snapshot.board
+    assert loaded.cells == board.cells
+    assert (loaded.seed, loaded.num_flagged, loaded.safe_remaining) == (board.seed, board.num_flagged, board.safe_remaining)
+
+def test_snapshot_without_seed(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    board = make_board(ROWS)
+    board.seed = None
+    board.reveal(0, 0)
+    save_snapshot(Snapshot("Easy", False, 0, board), path)
+    loaded = load_snapshot(path).board
+    assert loaded.seed is None and loaded.cells == board.cells
+
+def test_snapshot_missing_or_corrupt(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    assert load_snapshot(str(path)) is None
+    board = make_board(ROWS)
+    board.reveal(0, 0)
+    save_snapshot(Snapshot("Easy", False, 0, board), str(path))
+    path.write_bytes(path.read_bytes()[:-1])
+    assert load_snapshot(str(path)) is None
@@ -1,7 +1,8 @@
-import random
-from PyQt6.QtWidgets import *
-from PyQt6.QtGui import QBrush, QColor, QPainter, QPen, QPixmap
-from PyQt6.QtCore import *
+import re
+from PyQt6.QtWidgets import QGraphicsItem
+from PyQt6.QtGui import QBrush, QColor, QImage, QPainter, QPen, QPixmap
+from PyQt6.QtCore import Qt, QPoint, QRectF
+from board import MINE, EXPOSED, FLAGGED, CROSSED, COUNT_SHIFT
 
 """Global Variables:
 
@@ -16,6 +17,15 @@ FLAG_FILE_PATH: The image file to use when the user wants to flag a tile.
 
 ERROR: The color to use when crossing out the incorrectly flagged tiles, after the 
 player has lost the game.
+
+HINT: The color of the outline drawn around the tile suggested by a hint.
+
+MIN_DETAIL_SIZE: The smallest size in pixels, on screen, at which tiles are drawn in full. Smaller
+tiles are drawn as a single solid color each, without numbers or images.
+
+FLAG_COLOR: The solid color of a flagged tile drawn without detail.
+
+CROSSOUT_COLOR: The solid color of a crossed out tile drawn without detail.
 """
 
 BOMB_COLORS = [
@@ -37,69 +47,225 @@ NUMBER_COLORS = [
 ]
 FLAG_FILE_PATH = "images/flag.png"
 ERROR = Qt.GlobalColor.red
+HINT = QColor("#2E86AB")
+MIN_DETAIL_SIZE = 8
+FLAG_COLOR = QColor("#C0392B")
+CROSSOUT_COLOR = QColor("#1B1B1B")
+
+# The color table entries of the tiles drawn without detail. An unexposed or exposed tile uses
+# the entry for its column plus row being even, plus one if it is odd.
+_UNEXPOSED = 0
+_EXPOSED = 2
+_FLAG = 4
+_CROSSOUT = 5
+_BOMB = 6
+
+def _detail_table(parity):
+    """Returns a translate table mapping the byte of a tile to its color table entry, for tiles
+    whose column plus row has PARITY (0 if even, 1 if odd). Mirrors the order of paint_tile."""
+    table = bytearray(256)
+    for cell in range(256):
+        if cell & EXPOSED and cell & MINE:
+            table[cell] = _BOMB
+        elif cell & CROSSED:
+            table[cell] = _CROSSOUT
+        elif cell & FLAGGED:
+            table[cell] = _FLAG
+        elif cell & EXPOSED:
+            table[cell] = _EXPOSED + parity
+        else:
+            table[cell] = _UNEXPOSED + parity
+    return bytes(table)
+
+_EVEN_TABLE = _detail_table(0)
+_ODD_TABLE = _detail_table(1)
+# Matches a tile that shows more than its solid color: a flag, a cross, a number or a bomb
+_GLYPH = re.compile(b"[" + b"".join(re.escape(bytes([cell])) for cell in range(256)
+                                     if cell & (FLAGGED | CROSSED)
+                                     or cell & EXPOSED and (cell & MINE or cell >> COUNT_SHIFT)) + b"]")
+
+# Glyph caches are shared between every tile of the same size. See glyph_cache.
+_glyph_caches = {}
+
+class GlyphCache:
+    """A GlyphCache object holds every image drawn on top of a tile, pre-rendered once for a
+    single tile size, so that painting a tile only needs to copy pixmaps rather than decode the
+    flag image or lay out text.
+
+    Attributes:
+        size -- the size of the tiles the glyphs are drawn for
+        flag -- a QPixmap of the flag
+        digits -- a list of QPixmaps; digits[i] is the number i + 1 colored with NUMBER_COLORS[i]
+        crossout -- a QPixmap of the X drawn over incorrectly flagged tiles
+        bombs -- a list of QPixmaps; bombs[i] is an exploded bomb colored with BOMB_COLORS[i]
+    """
+    def __init__(self, size, ratio = 1.0):
+        """Create a GlyphCache for tiles of size SIZE, drawn on a device with RATIO device pixels
+        per pixel.
+
+        size -- An integer; the size in pixels of a tile
+        ratio -- A float; the device pixel ratio of the screen the tiles are drawn on
+        """
+        self.size = size
+        self._ratio = ratio
+        self.flag = self._new_pixmap()
+        painter = QPainter(self.flag)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawPixmap(0, 0, size, size, QPixmap(FLAG_FILE_PATH))
+        painter.end()
+
+        self.digits = []
+        for i in range(len(NUMBER_COLORS)):
+            pixmap = self._new_pixmap()
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            font = painter.font()
+            font.setPixelSize(size)
+            painter.setFont(font)
+            painter.setPen(QPen(NUMBER_COLORS[i]))
+            painter.drawText(0, 0, size, size, Qt.AlignmentFlag.AlignCenter, str(i + 1))
+            painter.end()
+            self.digits.append(pixmap)
+
+        self.crossout = self._new_pixmap()
+        painter = QPainter(self.crossout)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        pen = QPen(ERROR)
+        pen.setWidth(2)
+        painter.setPen(pen)
+        painter.drawLine(0, 0, size, size)
+        painter.drawLine(0, size, size, 0)
+        painter.end()
+
+        self.bombs = []
+        for color in BOMB_COLORS:
+            pixmap = self._new_pixmap()
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.fillRect(0, 0, size, size, QBrush(color))
+            painter.setBrush(QBrush(color.darker()))
+            painter.setPen(QPen(color.darker()))
+            painter.drawEllipse(QPoint(size // 2, size // 2), size // 3, size // 3)
+            painter.end()
+            self.bombs.append(pixmap)
+
+    def _new_pixmap(self):
+        """Returns a transparent QPixmap the size of a tile"""
+        pixmap = QPixmap(round(self.size * self._ratio), round(self.size * self._ratio))
+        pixmap.setDevicePixelRatio(self._ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        return pixmap
+
+def glyph_cache(size, ratio = 1.0):
+    """Returns the GlyphCache for tiles of size SIZE drawn with device pixel ratio RATIO, rendering
+    it the first time it is needed.
+
+    Args:
+        size -- An integer; the size in pixels of a tile
+        ratio -- A float; the device pixel ratio of the device being painted on
+
+    Returns:
+        A GlyphCache
+    """
+    key = (size, ratio)
+    if key not in _glyph_caches:
+        _glyph_caches[key] = GlyphCache(size, ratio)
+    return _glyph_caches[key]
+
+def paint_tile(painter, board, index, left, top, size, colors, is_hovering, bomb_colors, glyphs,
+               is_hint = False):
+    """Paints the tile stored at INDEX of BOARD as a square of side SIZE whose top left corner is
+    at (LEFT, TOP). Exposed bombs are "exploded", exposed safe tiles show the number of surrounding
+    bombs, and incorrectly flagged tiles are crossed out at the end of the game. This is shared by
+    the Tile and BoardItem objects.
+
+    Args:
+        painter -- A QPainter; the painter to draw the tile
+        board -- A Board; the state of the game
+        index -- An integer; the index of the tile on the board
+        left -- An integer; the x-coordinate to draw the tile at
+        top -- An integer; the y-coordinate to draw the tile at
+        size -- An integer; the size in pixels of the tile
+        colors -- A tuple of three QColors; the colors to display the tile with before it has
+        been interacted with, while it is hovered over, and after it has been exposed
+        is_hovering -- A boolean; whether or not the user is hovering over the tile
+        bomb_colors -- A dict mapping the index of each exposed bomb to the index in BOMB_COLORS
+        of the color to draw it with. The colors are chosen by the Canvas; bombs missing from the
+        dict fall back to a color picked by their index.
+        glyphs -- A GlyphCache; the pre-rendered images for tiles of size SIZE
+        is_hint -- A boolean; whether or not the tile is suggested by a hint, and should be outlined
+    """
+    normal_color, hover_color, exposed_color = colors
+    # Every piece of state of the tile is read from a single byte
+    cell = board.cells[index]
+    exposed = cell & EXPOSED
+    # Code to "explode" the tile after the user presses on it
+    if exposed and cell & MINE:
+        color = bomb_colors.get(index, index % len(BOMB_COLORS))
+        painter.drawPixmap(left, top, glyphs.bombs[color])
+        return
+
+    if is_hovering:
+        painter.fillRect(left, top, size, size, QBrush(hover_color))
+    else: 
+        painter.fillRect(left, top, size, size, QBrush(normal_color))
+    
+    if cell & FLAGGED:
+        painter.drawPixmap(left, top, glyphs.flag)
+
+    # If the tile has been crossed out, then draw an X over it
+    if cell & CROSSED:
+        painter.drawPixmap(left, top, glyphs.crossout)
+    # If the tile has been pressed, then it has been exposed, and we should reveal how many bombs
+    # neighbor this tile.
+    elif exposed:
+        painter.fillRect(left, top, size, size, QBrush(exposed_color))
+        num_bombs = cell >> COUNT_SHIFT
+        # If the number of bombs is zero, don't display any text
+        if num_bombs != 0:
+            painter.drawPixmap(left, top, glyphs.digits[num_bombs - 1])
+
+    if is_hint:
+        width = max(size // 10, 2)
+        painter.setPen(QPen(HINT, width))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(QRectF(left + width / 2, top + width / 2, size - width, size - width))
 
 class Tile(QGraphicsItem):
-    """A Tile object represents a single tile in the game of minesweeper.
+    """A Tile object draws a single tile in the game of minesweeper. The state of the
+    tile (whether it is a bomb, exposed, flagged, etc.) is stored in a Board object,
+    and the Tile only reads from it when painting. Tiles are created before the bombs
+    are placed, so the same class is used for bombs and safe tiles.
+
+    A Tile only stores the Canvas it belongs to and its index on the board. Everything shared
+    between the tiles, such as their size, colors and which tile is hovered over, is read from
+    the Canvas. Large boards are drawn by a single BoardItem instead of a Tile per tile.
 
-    Class Attributes:
-        Tile.num_flagged_cells -- the number of flagged cells on the board
-        Tile.first_move_made -- a boolean that represents whether or not the player
-        has made the first move on the board already
     Instance Attributes:
-        normal_color -- the color to use when the user is not hovering over the tile,
-        and the tile has not been exposed yet. That is, the color with which to display
-        the tile at the start of the game, until it has been interacted with. 
-        hover_color -- the color to use when the user has not interacted with the tile,
-        but is hovering over it. 
-        size -- the size of the tile in pixels
-        is_hovering -- a boolean representing when the user is hovering over the tile
-        is_bomb -- a boolean representing whether the current tile is a bomb or not
-        is_flagged -- a boolean representing whether or not the tile has been flagged
-        is_pressed -- a boolean representing whether the tile has been pressed or not. In
-        the case that it has been pressed, it should be exposed. 
+        canvas -- the Canvas object the tile belongs to
+        index -- the index of the tile on the board
     """
-    num_flagged_cells = 0
-    first_move_made = False
 
-    def __init__(self, normal_color, hover_color, size, is_bomb = False):
-        """Create a Tile with normal color NORMAL_COLOR, hover color HOVER_COLOR, of size SIZE,
-        and a boolean IS_BOMB dictating whether or not the current tile is a bomb. 
+    def __init__(self, canvas, index):
+        """Create a Tile which displays the tile at INDEX of the board of CANVAS.
 
-        normal_color -- A QColor; the color with which to display the tile, before it has been
-        interacted with. 
-        hover_color -- A QColor; the color with which to display the tile, after a mouse hover 
-        event.
-        size -- An integer; the size in pixels of the tile
-        is_bomb -- A boolean; represents whether or not the current tile is a bomb 
+        canvas -- A Canvas; the scene the tile belongs to
+        index -- An integer; the index of the tile on the board
         """
         super().__init__()
-        self.normal_color = normal_color
-        self.hover_color = hover_color
-        self.size = size
-        self.is_hovering = False
-        self.is_bomb = is_bomb
-        self.is_flagged = False 
-        self.is_pressed = False
+        self.canvas = canvas
+        self.index = index
         self.setAcceptHoverEvents(True)
-    
-    def force_expose(self):
-        """Exposes tile by setting self.is_pressed to True, and calling a repaint."""
-        self.is_pressed = True
-        # If the tile is flagged, then it will be unflagged, and the number of 
-        # flagged cells, which is kept track of by the class attribute will be
-        # reduced by 1. 
-        if self.flagged():
-            self.is_flagged = False
-            Tile.num_flagged_cells -= 1
-        self.update()
-    
+
     def is_safe(self):
-        """Method to check if this tile is safe or a bomb tile.
+        """Method to check if this tile is safe or a bomb tile. Note that every tile is safe
+        until the bombs have been placed.
 
         Returns:
             A boolean that represents whether or not the current tile is safe.
         """
-        return not self.is_bomb
+        board = self.canvas.board
+        return board.is_safe(*board.coordinates(self.index))
         
     def is_exposed(self):
         """Method to check if this tile has been pressed.
@@ -107,32 +273,46 @@ class Tile(QGraphicsItem):
         Returns:
             A boolean that represents whether or not the current tile has been pressed.
         """
-        return self.is_pressed
+        board = self.canvas.board
+        return board.is_exposed(*board.coordinates(self.index))
     
     def flagged(self):
-        """Method to check if this tile is safe.
+        """Method to check if this tile has been flagged.
 
         Returns:
-            A boolean that represents whether or not the current tile has been pressed.
+            A boolean that represents whether or not the current tile has been flagged.
         """
-        return self.is_flagged
+        board = self.canvas.board
+        return board.is_flagged(*board.coordinates(self.index))
+
+    def get_num_bombs(self):
+        """Gives the number of bombs surrounding this tile
+        
+        Returns:
+            An integer; the number of bombs surrounding this tile
+        """
+        board = self.canvas.board
+        return board.get_num_bombs(*board.coordinates(self.index))
     
     def hoverEnterEvent(self, event):
-        """Overrides super().hoverEnterEvent by setting self.is_hovering to True and calling repaint.
+        """Overrides super().hoverEnterEvent by making this the hovered tile of the canvas and
+        calling repaint.
         
         Args:
             event -- A QGraphicsSceneMouseEvent to handle
         """
-        self.is_hovering = True 
+        self.canvas.hover_index = self.index
         self.update()
     
     def hoverLeaveEvent(self, event):
-        """Overrides super().hoverLeaveEvent by setting self.is_hovering to False and calling repaint.
+        """Overrides super().hoverLeaveEvent by clearing the hovered tile of the canvas and
+        calling repaint.
         
         Args:
             event -- A QGraphicsSceneMouseEvent to handle
         """
-        self.is_hovering = False
+        if self.canvas.hover_index == self.index:
+            self.canvas.hover_index = None
         self.update()
 
     def boundingRect(self):
@@ -141,10 +321,11 @@ class Tile(QGraphicsItem):
         Returns:
             A QRectF object that bounds the graphic scene to be painted.
         """
-        return QRectF(0, 0, self.size, self.size)
+        size = self.canvas.tile_size
+        return QRectF(0, 0, size, size)
 
     def paint(self, painter, option, widget = None):
-        """Implements the virtual function paint needed to implement QGraphicsItem
+        """Implements the virtual function paint needed to implement QGraphicsItem.
         
         Args:
             painter: A QPainter; the painter to draw the tile
@@ -155,176 +336,172 @@ class Tile(QGraphicsItem):
         """
         # Vectorizes graphics
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        if self.is_hovering:
-            painter.fillRect(0, 0, self.size, self.size, QBrush(self.hover_color))
-        else: 
-            painter.fillRect(0, 0, self.size, self.size, QBrush(self.normal_color))
-        
-        if self.is_flagged:
-            painter.drawPixmap(0, 0, self.size, self.size, QPixmap(FLAG_FILE_PATH))        
-    
-    def mousePressEvent(self, event):
-        """Handler for mouse press events. Calls repaint after processing events.
+        canvas, index = self.canvas, self.index
+        column, row = canvas.board.coordinates(index)
+        paint_tile(painter, canvas.board, index, 0, 0, canvas.tile_size,
+                   canvas.palette[(column + row) % 2], canvas.hover_index == index,
+                   canvas.bomb_colors, glyph_cache(canvas.tile_size, painter.device().devicePixelRatioF()),
+                   canvas.hint_index == index)
 
-        Args:
-            event -- A QGraphicsSceneMouseEvent to handle
-        """
-        # Right click to flag a tile
-        if event.button() == Qt.MouseButton.RightButton and not self.is_exposed():
-            self.is_flagged = not self.is_flagged
-            # Fancy value manipulation to basically subtract 1 if it is flagged, and add 1 if it is unflagged
-            Tile.num_flagged_cells += 2 * self.is_flagged - 1
-            self.update()
-        elif event.button() == Qt.MouseButton.LeftButton and self.is_flagged:
-            # Don't do anything if the user left clicks a flagged tile
-            return 
-
-class BombTile(Tile):
-    """A BombTile object representing a bomb tile in a game of minesweeper.
+class BoardItem(QGraphicsItem):
+    """A BoardItem object draws every tile of a game of minesweeper as a single QGraphicsItem,
+    rather than having one Tile per position. Only the tiles inside the area that needs to be
+    repainted are drawn, so updating a few tiles or scrolling across a very large board stays
+    cheap, and zoomed out boards are drawn with less detail.
 
-    Attributes:
-    bomb_color -- A randomly selected color to use for the bomb, when the tile is 
-    left clicked. 
+    Instance Attributes:
+        board -- the Board object storing the state of the game
+        size -- the size of each tile in pixels
+        colors -- a tuple of two tuples of three QColors; the colors of the tiles with an
+        even and an odd column plus row, respectively. See the colors argument of paint_tile.
+        bomb_colors -- a dict mapping the index of each exposed bomb to the index in BOMB_COLORS
+        of the color it is drawn with
+        hover_index -- the index of the tile the user is hovering over, or None
+        hint_index -- the index of the tile suggested by a hint, or None
+        color_table -- the colors of the tiles drawn without detail, as a list of QRgb values.
+        See _detail_table.
     """
-    def __init__(self, normal_color, highlight_color, size):
-        """Create a BombTile with normal color NORMAL_COLOR, hover color HIGHLIGHT_COLOR of size SIZE.
+    def __init__(self, board, size, even_colors, odd_colors, bomb_colors):
+        """Create a BoardItem which displays BOARD using tiles of size SIZE. Tiles are colored in
+        a chess-board like pattern using EVEN_COLORS and ODD_COLORS.
 
-        normal_color -- A QColor; the color with which to display the tile, before it has been
-        interacted with. 
-        highlight_color -- A QColor; the color with which to display the tile, after a mouse hover 
-        event.
-        size -- An integer; the size in pixels of the tile
+        board -- A Board; the state of the game
+        size -- An integer; the size in pixels of each tile
+        even_colors -- A tuple of three QColors; the normal, hover and exposed colors of the
+        tiles whose column plus row is even
+        odd_colors -- A tuple of three QColors; the normal, hover and exposed colors of the
+        tiles whose column plus row is odd
+        bomb_colors -- A dict; the colors of the exposed bombs
         """
-        super().__init__(normal_color, highlight_color, size, True)
-        self.bomb_color = random.choice(BOMB_COLORS)
-    
-    def mousePressEvent(self, event):
-        """Handler for mouse press events. Overrides super().mousePressEvent.
+        super().__init__()
+        self.board = board
+        self.size = size
+        self.colors = (even_colors, odd_colors)
+        self.bomb_colors = bomb_colors
+        self.hover_index = None
+        self.hint_index = None
+        self.color_table = [even_colors[0].rgb(), odd_colors[0].rgb(), even_colors[2].rgb(),
+                            odd_colors[2].rgb(), FLAG_COLOR.rgb(), CROSSOUT_COLOR.rgb(),
+                            BOMB_COLORS[-1].rgb()]
+        self.setAcceptHoverEvents(True)
+        # Lets self.paint know which part of the board actually needs to be redrawn
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+    def tile_rect(self, index):
+        """Returns a QRectF of the area covered by the tile at INDEX"""
+        column, row = self.board.coordinates(index)
+        return QRectF(column * self.size, row * self.size, self.size, self.size)
+
+    def _set_hover_index(self, index):
+        """Moves the hover highlight to the tile at INDEX (or removes it if INDEX is None),
+        repainting only the tiles that changed."""
+        if index == self.hover_index:
+            return
+        if self.hover_index is not None:
+            self.update(self.tile_rect(self.hover_index))
+        self.hover_index = index
+        if index is not None:
+            self.update(self.tile_rect(index))
+
+    def hoverMoveEvent(self, event):
+        """Overrides super().hoverMoveEvent by highlighting the tile under the mouse.
 
         Args:
-            event -- A QGraphicsSceneMouseEvent to handle
-        """
-        super().mousePressEvent(event)
-        if event.button() == Qt.MouseButton.LeftButton and not self.is_flagged and not self.is_pressed:
-            # The moment the user left clicks a box, the first move has been made
-            Tile.first_move_made = True
-            # If the user has not flagged this tile, and left clicked it, then it has been pressed
-            # and so we must set is_pressed to True and call a repaint.
-            self.is_pressed = True
-            self.update()
-    
-    def paint(self, painter, option, widget = None):
-        """Overrides super().paint in order to "explode" the tile after the user left clicks the tile. 
-        
-        Args:
-            painter: A QPainter; the painter to draw the tile
-            option: A QStyleOptionGraphicsItem; controls the style of the painter, including 
-            the level of detail.
-            widget: A QWidget; the widget to draw the tile on. Since the tile will be painted
-            on QGraphicsScene, the default argument will be None. 
+            event -- A QGraphicsSceneHoverEvent to handle
         """
-        # Code to "explode" the tile after the user presses on it
-        if self.is_pressed:
-            painter.fillRect(0, 0, self.size, self.size, QBrush(self.bomb_color))
-            painter.setBrush(QBrush(self.bomb_color.darker()))
-            painter.setPen(QPen(self.bomb_color.darker()))
-            painter.drawEllipse(QPoint(self.size // 2, self.size // 2), self.size // 3, self.size // 3)
-        # If the tile is not pressed, then the super().paint method handles everything correctly
+        column = int(event.pos().x() // self.size)
+        row = int(event.pos().y() // self.size)
+        if 0 <= column < self.board.width and 0 <= row < self.board.height:
+            self._set_hover_index(self.board.index(column, row))
         else:
-            super().paint(painter, option, widget)
+            self._set_hover_index(None)
 
-class SafeTile(Tile):
-    """A SafeTile object representing a non-bomb tile in a game of minesweeper.
+    def hoverLeaveEvent(self, event):
+        """Overrides super().hoverLeaveEvent by removing the hover highlight.
 
-    Attributes:
-    num_bombs -- the number of bombs surrounding this tile in the game
-    exposed_color -- the color to use for the background when exposing the tile
-    draw_x -- a boolean that tells the paint function when to cross out the tile.
-    To be used at the end of the game, where incorrectly flagged cells are crossed out. 
-    """
-    def __init__(self, normal_color, highlight_color, exposed_color, size):
-        """Create a SafeTile with normal color NORMAL_COLOR, hover color HIGHLIGHT_COLOR, exposed color
-        EXPOSED_COLOR of size SIZE.
-
-        normal_color -- A QColor; the color with which to display the tile, before it has been
-        interacted with. 
-        highlight_color -- A QColor; the color with which to display the tile, after a mouse hover 
-        event.
-        exposed_color -- A QColor; the color with which to display the tile, after it has been 
-        pressed (i.e. exposed)
-        size -- An integer; the size in pixels of the tile
-        """
-        super().__init__(normal_color, highlight_color, size)
-        self.num_bombs = 0 # number of neighboring bombs
-        self.exposed_color = exposed_color
-        self.draw_x = False
-    
-    def get_num_bombs(self):
-        """Gives the number of bombs surrounding this tile
-        
-        Returns:
-            An integer; the number of bombs surrounding this tile
-        """
-        return self.num_bombs
-    
-    def set_num_bombs(self, num_bombs):
-        """Sets the number of bombs to num_bombs
-        
         Args:
-            num_bombs -- the number of bombs to set self.num_bombs to
+            event -- A QGraphicsSceneHoverEvent to handle
         """
-        self.num_bombs = num_bombs
-        
-    def crossout(self):
-        """Sets self.draw_x to True and calls a repaint so that this cell will be crossed out."""
-        self.draw_x = True
-        self.is_flagged = False
-        self.update()
-    
-    def mousePressEvent(self, event):
-        """Handler for mouse press events. Overrides super().mousePressEvent.
+        self._set_hover_index(None)
 
-        Args:
-            event -- A QGraphicsSceneMouseEvent to handle
+    def boundingRect(self):
+        """Implements the virtual function boundingRect needed to implement QGraphicsItem.
+
+        Returns:
+            A QRectF object that bounds the graphic scene to be painted.
         """
-        super().mousePressEvent(event)
-        # If you left click this tile, and it is not flagged, has not been pressed before, and is not
-        # crossed out, then call a repaint after updating some attributes
-        if event.button() == Qt.MouseButton.LeftButton and not self.is_flagged \
-            and not self.is_pressed and not self.draw_x:
-            # The moment the user left clicks a tile, the game has begun 
-            Tile.first_move_made = True
-            self.is_pressed = True
-            self.update()
-            
+        return QRectF(0, 0, self.board.width * self.size, self.board.height * self.size)
+
     def paint(self, painter, option, widget = None):
-        """Overrides super().paint in order to expose a tile, or cross it out according to the instance
-        variables.
+        """Implements the virtual function paint needed to implement QGraphicsItem. Only the tiles
+        that intersect option.exposedRect are painted. The solid colors of the tiles are drawn
+        first, as a single image, and then only the tiles that show a flag, a cross, a number or
+        a bomb are painted one at a time. When the board is zoomed out so far that a tile is
+        smaller than MIN_DETAIL_SIZE on screen, the solid colors are all that is drawn.
         
         Args:
-            painter: A QPainter; the painter to draw the tile
+            painter: A QPainter; the painter to draw the board
             option: A QStyleOptionGraphicsItem; controls the style of the painter, including 
-            the level of detail.
-            widget: A QWidget; the widget to draw the tile on. Since the tile will be painted
+            the level of detail and the area to repaint.
+            widget: A QWidget; the widget to draw the board on. Since the board will be painted
             on QGraphicsScene, the default argument will be None. 
         """
-        super().paint(painter, option, widget)
-        # If the self.draw_x flag is true, then cross out the tile
-        if self.draw_x:
-            pen = QPen(ERROR)
-            pen.setWidth(2)
-            painter.setPen(pen)
-            painter.drawLine(0, 0, self.size, self.size)
-            painter.drawLine(0, self.size, self.size, 0)
-        # If the tile has been pressed, then it has been exposed, and we should reveal how many bombs
-        # neighbor this tile.
-        elif self.is_pressed:
-            painter.fillRect(0, 0, self.size, self.size, QBrush(self.exposed_color))
-            # If the number of bombs is zero, don't display any text
-            if self.num_bombs != 0:
-                font = painter.font()
-                font.setPixelSize(self.size)
-                painter.setFont(font)
-                # Used to color code the numbers
-                painter.setPen(QPen(NUMBER_COLORS[self.num_bombs - 1]))
-                painter.drawText(0, 0, self.size, self.size, Qt.AlignmentFlag.AlignCenter, str(self.num_bombs))
+        # Vectorizes graphics
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        board, size = self.board, self.size
+        exposed = option.exposedRect
+        first_column = max(int(exposed.left() // size), 0)
+        last_column = min(int(exposed.right() // size), board.width - 1)
+        first_row = max(int(exposed.top() // size), 0)
+        last_row = min(int(exposed.bottom() // size), board.height - 1)
+        if first_column > last_column or first_row > last_row:
+            return
+        self._paint_colors(painter, first_column, last_column, first_row, last_row)
+        if option.levelOfDetailFromTransform(painter.worldTransform()) * size < MIN_DETAIL_SIZE:
+            # The hint is still outlined, so that it can be found when zoomed out
+            if self.hint_index is not None:
+                painter.setPen(QPen(HINT, 0))
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                painter.drawRect(self.tile_rect(self.hint_index))
+            return
+        glyphs = glyph_cache(size, painter.device().devicePixelRatioF())
+        cells, width = board.cells, board.width
+        for row in range(first_row, last_row + 1):
+            start = row * width
+            for match in _GLYPH.finditer(cells, start + first_column, start + last_column + 1):
+                index = match.start()
+                column = index - start
+                paint_tile(painter, board, index, column * size, row * size, size,
+                           self.colors[(column + row) % 2], False, self.bomb_colors, glyphs)
+        # The hovered and hinted tiles are drawn last, on top of their solid colors
+        for index in (self.hover_index, self.hint_index):
+            if index is not None:
+                column, row = board.coordinates(index)
+                if first_column <= column <= last_column and first_row <= row <= last_row:
+                    paint_tile(painter, board, index, column * size, row * size, size,
+                               self.colors[(column + row) % 2], index == self.hover_index,
+                               self.bomb_colors, glyphs, index == self.hint_index)
+
+    def _paint_colors(self, painter, first_column, last_column, first_row, last_row):
+        """Paints the tiles from FIRST_COLUMN to LAST_COLUMN and FIRST_ROW to LAST_ROW, inclusive,
+        as one solid color each. Every row of tiles is turned into a row of pixels with a pair of
+        translate tables, and the pixels are drawn as a single image scaled up to the size of the
+        tiles, so the cost barely depends on how many tiles are on screen."""
+        board, size = self.board, self.size
+        cells = board.cells
+        width = last_column - first_column + 1
+        height = last_row - first_row + 1
+        # The rows of an 8-bit image start on multiples of 4 bytes
+        stride = (width + 3) & ~3
+        pixels = bytearray(stride * height)
+        for row in range(first_row, last_row + 1):
+            start = row * board.width + first_column
+            line = cells[start:start + width]
+            offset = (row - first_row) * stride
+            # The position in the line of the first tile whose column plus row is even
+            even = (first_column + row) % 2
+            pixels[offset + even:offset + width:2] = line[even::2].translate(_EVEN_TABLE)
+            pixels[offset + 1 - even:offset + width:2] = line[1 - even::2].translate(_ODD_TABLE)
+        image = QImage(bytes(pixels), width, height, stride, QImage.Format.Format_Indexed8)
+        image.setColorTable(self.color_table)
+        painter.drawImage(QRectF(first_column * size, first_row * size, width * size, height * size), image)
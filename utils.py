@@ -1,8 +1,12 @@
 """This module is used to read and write to the "cache/high_scores.txt"
 file, which records the user's highest score in each of the three difficulty
-modes "Easy", "Medium" and "Hard". 
+modes "Easy", "Medium" and "Hard", and in each custom board that has been
+played (see score_key in "modes.py"). The times are written in seconds, with
+up to three decimal places, and are read as milliseconds. 
 """
 
+import os
+
 """Global Variables:
 
 WORST_TIME: The worst time possible. Note that it is not actually possible
@@ -18,43 +22,52 @@ DIFFICULTIES = ["Easy", "Medium", "Hard"]
 def read_high_scores(file):
     """Fetches rows from a file. Retrieves the rows of the file and formats 
     it into a dictionary. Assumes that the file is formatted as a set of 
-    comma seperated values, and that each line has exactly two values
+    comma seperated values, and that each line has exactly two values, the
+    second of which is a time in seconds
 
     Args:
         file -- A string; the filepath to the file to be read
 
     Returns:
-        A dict mapping the first entry of each line to the second entry of each line 
+        A dict mapping the first entry of each line to the time on each line,
+        in milliseconds
 
     Raises:
         FileNotFoundError: No such file or directory
         IndexError: list index out of range
     """
-    f = open(file)
     scores = {}
-    lines = f.readlines()
-    for line in lines:
-        info = line.rstrip('\n').split(', ')
-        scores[info[0]] = int(info[1])
-    f.close()
+    with open(file) as f:
+        for line in f:
+            info = line.rstrip('\n').split(', ')
+            scores[info[0]] = round(float(info[1]) * 1000)
     return scores 
         
 def write_high_scores(scores, file):
     """Writes the scores to the file, following the format described for the 
-    input in the read_high_scores method. 
+    input in the read_high_scores method. The scores are written to a temporary
+    file first, which then replaces FILE, so that a crash never leaves it half
+    written. 
 
     Args:
         scores -- A dictionary; a map between the difficulty and the user's best
-        score in each category. 
+        score in each category, in milliseconds. 
         file -- A string; the filepath to the file to be written to
 
     Raises:
         FileNotFoundError: No such file or directory
         IndexError: list index out of range
     """
-    f = open(file, "w")
-    for key, value in scores.items():
-        f.write(key + ", " + str(value) + "\n")
+    temporary = file + ".tmp"
+    with open(temporary, "w") as f:
+        for key, value in scores.items():
+            # Whole seconds are written without decimals, as they were before times had
+            # millisecond precision
+            seconds = str(value // 1000) if value % 1000 == 0 else "%.3f" % (value / 1000)
+            f.write(key + ", " + seconds + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, file)
     
 def reset_high_scores(file):
     """Sets the best score in each category equal to WORST_TIME, and writes
@@ -67,6 +80,4 @@ def reset_high_scores(file):
     Raises:
         FileNotFoundError: No such file or directory
     """
-    f = open(file, "w")
-    for difficulty in DIFFICULTIES:
-        f.write(difficulty + ", " + str(WORST_TIME) + "\n")
\ No newline at end of file
+    write_high_scores({difficulty: WORST_TIME * 1000 for difficulty in DIFFICULTIES}, file)
@@ -0,0 +1,92 @@
+"""This module contains the BoardView class, which shows a Canvas in the main window. Boards of
+the three MODES are scaled to fit the window, while custom boards, which can be far larger than
+the window, are shown at their own tile size and can be zoomed and scrolled.
+"""
+
+from PyQt6.QtWidgets import QGraphicsView
+from PyQt6.QtGui import QPainter
+from PyQt6.QtCore import Qt
+
+"""Global Variables:
+
+MIN_ZOOM: The smallest scale a board can be zoomed out to
+MAX_ZOOM: The largest scale a board can be zoomed in to
+ZOOM_STEP: How much one step of the mouse wheel zooms in or out by
+"""
+
+MIN_ZOOM = 0.1
+MAX_ZOOM = 8.0
+ZOOM_STEP = 1.25
+
+class BoardView(QGraphicsView):
+    """A BoardView object renders a Canvas. When a custom board is shown, holding Ctrl while
+    turning the mouse wheel zooms in and out around the mouse, and the scroll bars appear
+    whenever the board does not fit.
+
+    fit -- a boolean that is True if the board is scaled to fit the view, and False if it is
+    shown at its own size and can be zoomed
+    zoom -- the current scale of the board, when self.fit is False
+    """
+    def __init__(self, scene):
+        """Create a BoardView that renders SCENE, scaled to fit the view.
+
+        scene -- A Canvas; the board to show
+        """
+        super().__init__(scene)
+        self.fit = True
+        self.zoom = 1.0
+        # Vectorizes graphics
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self._set_scroll_bars(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        # Zoom around the mouse, rather than the center of the view
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+
+    def show_scene(self, scene, fit):
+        """Shows SCENE. If FIT is True, the board is scaled to fit the view, and otherwise it is
+        shown at its own size.
+
+        Args:
+            scene -- A Canvas; the board to show
+            fit -- A boolean; whether or not to scale the board to fit the view
+        """
+        self.setScene(scene)
+        self.fit = fit
+        self.zoom = 1.0
+        self.resetTransform()
+        if fit:
+            self._set_scroll_bars(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            self.fitInView(scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        else:
+            self._set_scroll_bars(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+
+    def _set_scroll_bars(self, policy):
+        """Sets the policy of both scroll bars to POLICY, a Qt.ScrollBarPolicy."""
+        self.setHorizontalScrollBarPolicy(policy)
+        self.setVerticalScrollBarPolicy(policy)
+
+    def set_zoom(self, zoom):
+        """Scales the board by ZOOM, clamped between MIN_ZOOM and MAX_ZOOM, keeping the point
+        under the mouse in place.
+
+        Args:
+            zoom -- A float; the new scale of the board
+        """
+        zoom = max(MIN_ZOOM, min(zoom, MAX_ZOOM))
+        if zoom != self.zoom:
+            self.scale(zoom / self.zoom, zoom / self.zoom)
+            self.zoom = zoom
+
+    def wheelEvent(self, event):
+        """Handler for mouse wheel events. Zooms when Ctrl is held and the board is not scaled
+        to fit, and scrolls otherwise.
+
+        Args:
+            event -- A QWheelEvent to handle
+        """
+        if self.fit or not event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            super().wheelEvent(event)
+            return
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.set_zoom(self.zoom * ZOOM_STEP ** steps)
+        event.accept()